@@ -0,0 +1,123 @@
+"""POST /api/v1/generations throughput with each correlation middleware.
+
+Drives the ingestion app in process over ASGI (no sockets) with the
+database-backed repository replaced by an in-memory one, so the numbers
+isolate the HTTP stack: routing, validation, JWT auth, serialization and
+middleware. The BaseHTTPMiddleware implementation the pure ASGI
+middleware replaced is kept below for the comparison.
+
+    DATABASE_URL=postgresql+asyncpg://u:p@localhost/db \\
+    PYTHONPATH=shared:services/ingestion python benchmarks/http_generations.py [requests]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+import httpx
+import structlog
+from jose import jwt
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from shared.middleware.correlation import CORRELATION_ID_HEADER, CorrelationIDMiddleware
+from shared.utils.datetime import utcnow
+
+from ingestion.config import settings
+from ingestion.dependencies import get_generation_service
+from ingestion.main import app
+from ingestion.services.generation_service import GenerationService
+
+N_DEFAULT = 5_000
+CONCURRENCY = 32
+logger = structlog.get_logger("bench")
+
+
+class BaseHTTPCorrelationIDMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, on BaseHTTPMiddleware."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        correlation_id = request.headers.get(CORRELATION_ID_HEADER, str(uuid.uuid4()))
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
+        logger.info("request_started", method=request.method, path=str(request.url.path))
+        response = await call_next(request)
+        response.headers[CORRELATION_ID_HEADER] = correlation_id
+        logger.info(
+            "request_completed",
+            method=request.method,
+            path=str(request.url.path),
+            status_code=response.status_code,
+        )
+        return response
+
+
+class InMemoryGenerationRepository:
+    async def create(self, request):
+        now = utcnow()
+        request.id = uuid.uuid4()
+        request.created_at = request.updated_at = now
+        return request
+
+    async def add_outbox_events(self, messages) -> None:
+        pass
+
+
+def use_correlation_middleware(middleware: Middleware) -> None:
+    app.user_middleware = [
+        middleware if m.cls in (CorrelationIDMiddleware, BaseHTTPCorrelationIDMiddleware) else m
+        for m in app.user_middleware
+    ]
+    app.middleware_stack = None
+
+
+async def run(label: str, n: int) -> None:
+    token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "org_id": str(uuid.uuid4())},
+        settings.jwt_secret,
+        algorithm=settings.jwt_algorithm,
+    )
+    body = {"template_id": str(uuid.uuid4()), "parameters": {"topic": "benchmarks"}}
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.post("/api/v1/generations", json=body, headers=headers)
+                assert response.status_code == 201, response.text
+
+        await worker(200)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(n // CONCURRENCY) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+    total = n // CONCURRENCY * CONCURRENCY
+    print(
+        f"{label:<44} {total / elapsed:8.0f} req/s {elapsed / total * 1e6:8.1f} us/request",
+        file=sys.__stderr__,
+    )
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_DEFAULT
+    sys.stdout = open(os.devnull, "w")
+    logging.disable(logging.CRITICAL)
+    app.dependency_overrides[get_generation_service] = lambda: GenerationService(
+        InMemoryGenerationRepository()
+    )
+    print(f"{n} requests, concurrency {CONCURRENCY}", file=sys.__stderr__)
+    use_correlation_middleware(Middleware(BaseHTTPCorrelationIDMiddleware))
+    await run("BaseHTTPMiddleware, 2 access lines", n)
+    use_correlation_middleware(Middleware(CorrelationIDMiddleware))
+    await run("pure ASGI, 1 access line", n)
+    use_correlation_middleware(Middleware(CorrelationIDMiddleware, access_log_sample_rate=0.01))
+    await run("pure ASGI, 1% access log sampling", n)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Per-message logging cost of a consumer under each logging configuration.
+
+Simulates the INFO lines a pipeline consumer emits for one message and
+reports the time spent on the calling thread (the event loop in a
+service) per message. Output goes to /dev/null so terminal speed does not
+skew the numbers. In the queued modes, rendering still happens on the
+caller but the write moves to the sink's thread.
+
+    PYTHONPATH=shared python benchmarks/logging_overhead.py [messages]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+import structlog
+
+from shared.logging import setup_logging
+
+N_DEFAULT = 50_000
+
+
+def configure_previous_production() -> None:
+    """The production configuration before the queued mode: synchronous stdlib JSON prints."""
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=json.dumps),
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+        logger_factory=structlog.PrintLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def log_one_message(logger, i: int) -> None:
+    logger.info("kafka_message_received", topic="content.validation.complete", partition=0, offset=i)
+    logger.info("received_validation_complete_event", event_id=f"evt-{i}")
+    logger.debug("kafka_message_sent", topic="content.generation.complete", key=f"req-{i}")
+    logger.info("generation_result_stored", request_id=f"req-{i}", status="success")
+
+
+def run(label: str, configure, n: int) -> None:
+    configure()
+    logger = structlog.get_logger("bench")
+    structlog.contextvars.bind_contextvars(correlation_id="5f0c6a0e-0000-4000-8000-000000000000")
+    for i in range(1000):
+        log_one_message(logger, i)
+    start = time.perf_counter()
+    for i in range(n):
+        log_one_message(logger, i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed / n * 1e6:8.2f} us/message", file=sys.__stderr__)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_DEFAULT
+    sys.stdout = open(os.devnull, "w")
+    logging.disable(logging.CRITICAL)
+    print(f"{n} messages, 4 log calls each (one DEBUG)", file=sys.__stderr__)
+    run("previous production (sync, stdlib json)", configure_previous_production, n)
+    run("development (console, sync)", lambda: setup_logging("bench", "INFO", "development"), n)
+    run("production (orjson, queued)", lambda: setup_logging("bench", "INFO", "production"), n)
+    run(
+        "production, 1% per-message sampling",
+        lambda: setup_logging("bench", "INFO", "production", message_sample_rate=0.01),
+        n,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,244 @@
 """Generation request API endpoints."""
 
+import json
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import ValidationError as PydanticValidationError
 
-from shared.schemas.responses import DataResponse, PaginatedResponse
+from shared.admission import AdmissionController
+from shared.exceptions import ValidationError
+from shared.models.generation import RequestMode
+from shared.schemas.responses import CursorPaginatedResponse, CursorPaginationMeta, DataResponse
 
-from ingestion.dependencies import auth, get_generation_service
+from ingestion.config import settings
+from ingestion.dependencies import (
+    auth,
+    get_admission_controller,
+    get_generation_service,
+    record_write,
+)
 from ingestion.schemas.generation_schemas import (
+    GenerationBatchResponse,
+    GenerationBatchStatusResponse,
     GenerationCreate,
     GenerationDetailResponse,
     GenerationResponse,
+    GenerationStatusResponse,
 )
-from ingestion.services.generation_service import GenerationService
+from ingestion.services.generation_service import TERMINAL_STATUSES, GenerationService
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPES = frozenset({"application/x-ndjson", "application/jsonl", "application/x-jsonlines"})
+MAX_REPORTED_ITEM_ERRORS = 50
+
+
+class _BatchReader:
+    """Collects batch items, recording per-item validation errors by index."""
+
+    def __init__(self, max_items: int) -> None:
+        self.max_items = max_items
+        self.items: list[GenerationCreate] = []
+        self.errors: list[dict] = []
+        self._count = 0
+
+    def add(self, raw: bytes | object) -> None:
+        index = self._count
+        self._count += 1
+        if self._count > self.max_items:
+            raise ValidationError(message=f"Batch exceeds the limit of {self.max_items} items")
+        try:
+            if isinstance(raw, bytes):
+                self.items.append(GenerationCreate.model_validate_json(raw))
+            else:
+                self.items.append(GenerationCreate.model_validate(raw))
+        except PydanticValidationError as e:
+            if len(self.errors) < MAX_REPORTED_ITEM_ERRORS:
+                self.errors.append({"index": index, "errors": e.errors(include_url=False)})
+
+    def result(self) -> list[GenerationCreate]:
+        if self.errors:
+            raise ValidationError(message="Invalid batch items", details=self.errors)
+        if not self.items:
+            raise ValidationError(message="Batch contains no items")
+        return self.items
+
+
+async def read_batch_items(request: Request, max_items: int) -> list[GenerationCreate]:
+    """Parse a batch body given either as a JSON array or as NDJSON (one item per line).
+
+    NDJSON bodies are parsed while they stream in, so oversized batches are
+    rejected without buffering the whole request.
+    """
+    reader = _BatchReader(max_items)
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        pending = b""
+        async for chunk in request.stream():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    reader.add(line)
+        if pending.strip():
+            reader.add(pending)
+        return reader.result()
+
+    try:
+        body = json.loads(await request.body())
+    except ValueError as e:
+        raise ValidationError(message="Batch body must be a JSON array or NDJSON") from e
+    if not isinstance(body, list):
+        raise ValidationError(message="Batch body must be a JSON array or NDJSON")
+    for raw in body:
+        reader.add(raw)
+    return reader.result()
+
 
-@router.post("/generations", response_model=DataResponse[GenerationResponse], status_code=201)
+@router.post(
+    "/generations",
+    response_model=DataResponse[GenerationDetailResponse | GenerationResponse],
+    status_code=201,
+    dependencies=[Depends(record_write)],
+)
 async def create_generation(
     body: GenerationCreate,
+    response: Response,
     token_payload: dict = Depends(auth),
+    admission: AdmissionController | None = Depends(get_admission_controller),
     service: GenerationService = Depends(get_generation_service),
-) -> DataResponse[GenerationResponse]:
+) -> DataResponse[GenerationDetailResponse | GenerationResponse]:
+    """Create a generation request.
+
+    Sync-mode requests hold the connection until the result is stored, up to
+    ``sync_timeout_seconds``; on timeout the current state is returned with
+    202 and the client continues with ``GET /generations/{id}?wait=``.
+    """
+    if admission is not None:
+        admission.check(body.priority)
     user_id = uuid.UUID(token_payload["sub"])
     org_id = uuid.UUID(token_payload["org_id"])
     result = await service.create(body, user_id=user_id, organization_id=org_id)
-    return DataResponse(data=GenerationResponse.model_validate(result))
+    if body.mode != RequestMode.SYNC.value:
+        return DataResponse(data=GenerationResponse.model_validate(result))
+
+    request, finished = await service.wait_until_finished(
+        result.id, org_id, settings.sync_timeout_seconds
+    )
+    if not finished:
+        response.status_code = 202
+    detail = GenerationDetailResponse.model_validate(request)
+    detail.result = await service.get_result(request)
+    return DataResponse(data=detail)
+
+
+@router.post(
+    "/generations:batch",
+    response_model=DataResponse[GenerationBatchResponse],
+    status_code=201,
+    dependencies=[Depends(record_write)],
+)
+async def create_generation_batch(
+    request: Request,
+    token_payload: dict = Depends(auth),
+    admission: AdmissionController | None = Depends(get_admission_controller),
+    service: GenerationService = Depends(get_generation_service),
+) -> DataResponse[GenerationBatchResponse]:
+    user_id = uuid.UUID(token_payload["sub"])
+    org_id = uuid.UUID(token_payload["org_id"])
+    items = await read_batch_items(request, settings.batch_max_items)
+    if admission is not None:
+        for priority in {item.priority for item in items}:
+            admission.check(priority)
+    batch, request_ids = await service.create_batch(items, user_id=user_id, organization_id=org_id)
+    return DataResponse(
+        data=GenerationBatchResponse(
+            id=batch.id,
+            item_count=batch.item_count,
+            request_ids=request_ids,
+            created_at=batch.created_at,
+        )
+    )
+
+
+@router.get(
+    "/generations:batch/{batch_id}", response_model=DataResponse[GenerationBatchStatusResponse]
+)
+async def get_generation_batch(
+    batch_id: uuid.UUID,
+    token_payload: dict = Depends(auth),
+    service: GenerationService = Depends(get_generation_service),
+) -> DataResponse[GenerationBatchStatusResponse]:
+    org_id = uuid.UUID(token_payload["org_id"])
+    batch, counts = await service.get_batch_status(batch_id, org_id)
+    finished = sum(count for status, count in counts.items() if status in TERMINAL_STATUSES)
+    return DataResponse(
+        data=GenerationBatchStatusResponse(
+            id=batch.id,
+            item_count=batch.item_count,
+            status_counts={status.value: count for status, count in counts.items()},
+            finished=finished == batch.item_count,
+            created_at=batch.created_at,
+        )
+    )
 
 
 @router.get("/generations/{generation_id}", response_model=DataResponse[GenerationDetailResponse])
 async def get_generation(
     generation_id: uuid.UUID,
+    wait: float = Query(0, ge=0, le=settings.wait_max_seconds),
     token_payload: dict = Depends(auth),
     service: GenerationService = Depends(get_generation_service),
 ) -> DataResponse[GenerationDetailResponse]:
-    result = await service.get_by_id(generation_id)
-    return DataResponse(data=GenerationDetailResponse.model_validate(result))
+    """Return a generation request; ``wait`` long-polls up to that many seconds for it to finish.
+
+    Requests of other organizations are reported as not found.
+    """
+    org_id = uuid.UUID(token_payload["org_id"])
+    if wait > 0:
+        request, _ = await service.wait_until_finished(generation_id, org_id, wait)
+    else:
+        request = await service.get_by_id(generation_id, org_id)
+    detail = GenerationDetailResponse.model_validate(request)
+    detail.result = await service.get_result(request)
+    return DataResponse(data=detail)
+
+
+@router.get(
+    "/generations/{generation_id}/status", response_model=DataResponse[GenerationStatusResponse]
+)
+async def get_generation_status(
+    generation_id: uuid.UUID,
+    token_payload: dict = Depends(auth),
+    service: GenerationService = Depends(get_generation_service),
+) -> DataResponse[GenerationStatusResponse]:
+    """Lightweight status read for polling clients, served from the status cache."""
+    org_id = uuid.UUID(token_payload["org_id"])
+    status, updated_at = await service.get_status(generation_id, org_id)
+    return DataResponse(
+        data=GenerationStatusResponse(id=generation_id, status=status, updated_at=updated_at)
+    )
 
 
-@router.get("/generations", response_model=PaginatedResponse[GenerationResponse])
+@router.get("/generations", response_model=CursorPaginatedResponse[GenerationResponse])
 async def list_generations(
-    page: int = 1,
-    page_size: int = 20,
+    cursor: str | None = None,
+    page_size: int = Query(20, ge=1, le=settings.list_max_page_size),
+    include_total: bool = False,
     token_payload: dict = Depends(auth),
     service: GenerationService = Depends(get_generation_service),
-) -> PaginatedResponse[GenerationResponse]:
+) -> CursorPaginatedResponse[GenerationResponse]:
     org_id = uuid.UUID(token_payload["org_id"])
-    items, total = await service.list_by_org(org_id, page=page, page_size=page_size)
-    from shared.schemas.responses import PaginationMeta
-    return PaginatedResponse(
+    items, next_cursor, total = await service.list_by_org(
+        org_id, page_size=page_size, cursor=cursor, include_total=include_total
+    )
+    return CursorPaginatedResponse(
         data=[GenerationResponse.model_validate(i) for i in items],
-        meta=PaginationMeta(
-            page=page,
+        meta=CursorPaginationMeta(
             page_size=page_size,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
             total_items=total,
-            total_pages=(total + page_size - 1) // page_size,
         ),
     )
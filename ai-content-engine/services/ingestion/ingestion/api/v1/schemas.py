@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends
 
 from shared.schemas.responses import DataResponse
 
-from ingestion.dependencies import auth, get_schema_service
+from ingestion.dependencies import auth, get_schema_service, record_write
 from ingestion.schemas.schema_schemas import (
     OutputSchemaCreate,
     OutputSchemaDetailResponse,
@@ -18,7 +18,12 @@ from ingestion.services.schema_service import SchemaService
 router = APIRouter()
 
 
-@router.post("/schemas", response_model=DataResponse[OutputSchemaResponse], status_code=201)
+@router.post(
+    "/schemas",
+    response_model=DataResponse[OutputSchemaResponse],
+    status_code=201,
+    dependencies=[Depends(record_write)],
+)
 async def create_schema(
     body: OutputSchemaCreate,
     token_payload: dict = Depends(auth),
@@ -38,7 +43,11 @@ async def get_schema(
     return DataResponse(data=OutputSchemaDetailResponse.model_validate(result))
 
 
-@router.patch("/schemas/{schema_id}", response_model=DataResponse[OutputSchemaResponse])
+@router.patch(
+    "/schemas/{schema_id}",
+    response_model=DataResponse[OutputSchemaResponse],
+    dependencies=[Depends(record_write)],
+)
 async def update_schema(
     schema_id: uuid.UUID,
     body: OutputSchemaUpdate,
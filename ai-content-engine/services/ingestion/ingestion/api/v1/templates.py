@@ -2,11 +2,12 @@
 
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from shared.schemas.responses import DataResponse, PaginatedResponse
+from shared.schemas.responses import CursorPaginatedResponse, CursorPaginationMeta, DataResponse
 
-from ingestion.dependencies import auth, get_template_service
+from ingestion.config import settings
+from ingestion.dependencies import auth, get_template_service, record_write
 from ingestion.schemas.template_schemas import (
     TemplateCreate,
     TemplateDetailResponse,
@@ -18,7 +19,12 @@ from ingestion.services.template_service import TemplateService
 router = APIRouter()
 
 
-@router.post("/templates", response_model=DataResponse[TemplateResponse], status_code=201)
+@router.post(
+    "/templates",
+    response_model=DataResponse[TemplateResponse],
+    status_code=201,
+    dependencies=[Depends(record_write)],
+)
 async def create_template(
     body: TemplateCreate,
     token_payload: dict = Depends(auth),
@@ -39,7 +45,11 @@ async def get_template(
     return DataResponse(data=TemplateDetailResponse.model_validate(result))
 
 
-@router.patch("/templates/{template_id}", response_model=DataResponse[TemplateResponse])
+@router.patch(
+    "/templates/{template_id}",
+    response_model=DataResponse[TemplateResponse],
+    dependencies=[Depends(record_write)],
+)
 async def update_template(
     template_id: uuid.UUID,
     body: TemplateUpdate,
@@ -50,19 +60,23 @@ async def update_template(
     return DataResponse(data=TemplateResponse.model_validate(result))
 
 
-@router.get("/templates", response_model=PaginatedResponse[TemplateResponse])
+@router.get("/templates", response_model=CursorPaginatedResponse[TemplateResponse])
 async def list_templates(
-    page: int = 1,
-    page_size: int = 20,
+    cursor: str | None = None,
+    page_size: int = Query(20, ge=1, le=settings.list_max_page_size),
+    include_total: bool = False,
     token_payload: dict = Depends(auth),
     service: TemplateService = Depends(get_template_service),
-) -> PaginatedResponse[TemplateResponse]:
-    items, total = await service.list_all(page=page, page_size=page_size)
-    from shared.schemas.responses import PaginationMeta
-    return PaginatedResponse(
+) -> CursorPaginatedResponse[TemplateResponse]:
+    items, next_cursor, total = await service.list_all(
+        page_size=page_size, cursor=cursor, include_total=include_total
+    )
+    return CursorPaginatedResponse(
         data=[TemplateResponse.model_validate(i) for i in items],
-        meta=PaginationMeta(
-            page=page, page_size=page_size, total_items=total,
-            total_pages=(total + page_size - 1) // page_size,
+        meta=CursorPaginationMeta(
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            total_items=total,
         ),
     )
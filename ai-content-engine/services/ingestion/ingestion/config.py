@@ -8,6 +8,29 @@ class IngestionSettings(BaseServiceSettings):
     kafka_consumer_group: str = "ingestion-group"
     host: str = "0.0.0.0"
     port: int = 8001
+    list_max_page_size: int = 100
+    list_total_cache_seconds: float = 60.0
+    batch_max_items: int = 10_000
+    outbox_relay_enabled: bool = True
+    outbox_batch_size: int = 500
+    outbox_poll_interval_ms: int = 50
+    completion_notifications_enabled: bool = True
+    sync_timeout_seconds: float = 30.0
+    wait_max_seconds: float = 30.0
+    status_cache_enabled: bool = True
+    status_cache_ttl_seconds: int = 86400
+    status_cache_local_ttl_seconds: float = 1.0
+    # Pending/processing statuses read from the database are only cached briefly
+    status_cache_pending_ttl_seconds: int = 5
+    quota_enforcement_enabled: bool = True
+    quota_limits_cache_seconds: float = 60.0
+    admission_control_enabled: bool = True
+    # Pipeline backlog (messages) above which new requests of each priority are shed
+    admission_shed_thresholds: dict[str, int] = {"low": 1_000, "normal": 5_000, "high": 20_000}
+    admission_refresh_interval_seconds: float = 1.0
+    admission_retry_after_seconds: int = 5
+    # After a client writes, its reads skip the replicas for this long
+    read_your_writes_seconds: float = 5.0
 
 
 settings = IngestionSettings()
@@ -1,50 +1,132 @@
 """Dependency injection for the Ingestion Service."""
 
+from collections.abc import AsyncGenerator
+
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shared.database import get_session
-from shared.kafka import AsyncKafkaProducer
-from shared.middleware.auth import JWTAuthMiddleware
+from shared.admission import AdmissionController
+from shared.archive import LocalArchiveStore
+from shared.database import WriteStickiness, get_read_session as open_read_session, get_session
+from shared.middleware.auth import JWKSKeyStore, JWTAuthMiddleware
+from shared.notifications import CompletionWaiter
+from shared.quotas import QuotaEnforcer, QuotaLimit
+from shared.status_cache import StatusCache
+from shared.utils.cache import TTLCache
 
 from ingestion.config import settings
 from ingestion.repositories.generation_repo import GenerationRepository
+from ingestion.repositories.quota_repo import QuotaRepository
 from ingestion.repositories.template_repo import TemplateRepository
 from ingestion.repositories.schema_repo import SchemaRepository
 from ingestion.services.generation_service import GenerationService
+from ingestion.services.quota_service import QuotaService
 from ingestion.services.template_service import TemplateService
 from ingestion.services.schema_service import SchemaService
 
-auth = JWTAuthMiddleware(secret=settings.jwt_secret, algorithm=settings.jwt_algorithm)
+auth = JWTAuthMiddleware(
+    secret=settings.jwt_secret,
+    algorithm=settings.jwt_algorithm,
+    jwks=JWKSKeyStore(settings.jwt_jwks_path) if settings.jwt_jwks_path else None,
+    cache_ttl_seconds=settings.jwt_claims_cache_seconds,
+    cache_max_size=settings.jwt_claims_cache_size,
+)
+archive_store = LocalArchiveStore(settings.archive_root)
+list_total_cache: TTLCache[int] = TTLCache(
+    ttl_seconds=settings.list_total_cache_seconds, name="list_total"
+)
+quota_limits_cache: TTLCache[tuple[QuotaLimit, ...]] = TTLCache(
+    ttl_seconds=settings.quota_limits_cache_seconds, max_size=10_000, name="quota_limits"
+)
+
+
+def get_admission_controller(request: Request) -> AdmissionController | None:
+    return getattr(request.app.state, "admission_controller", None)
+
+
+def get_completion_waiter(request: Request) -> CompletionWaiter | None:
+    return getattr(request.app.state, "completion_waiter", None)
+
+
+def get_status_cache(request: Request) -> StatusCache | None:
+    return getattr(request.app.state, "status_cache", None)
+
+
+def get_write_stickiness(request: Request) -> WriteStickiness | None:
+    return getattr(request.app.state, "write_stickiness", None)
+
+
+async def get_read_session(
+    session: AsyncSession = Depends(get_session),
+    token_payload: dict = Depends(auth),
+    stickiness: WriteStickiness | None = Depends(get_write_stickiness),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only repository methods.
+
+    A replica session unless replicas are off or the caller wrote recently,
+    in which case it is the request's primary session.
+    """
+    if stickiness is None or await stickiness.is_sticky(token_payload["sub"]):
+        yield session
+        return
+    async for read_session in open_read_session():
+        yield read_session
+
+
+async def record_write(
+    token_payload: dict = Depends(auth),
+    stickiness: WriteStickiness | None = Depends(get_write_stickiness),
+) -> None:
+    """Route dependency for writes: the caller's reads stay on the primary for a while."""
+    if stickiness is not None:
+        await stickiness.mark(token_payload["sub"])
 
 
-def get_kafka_producer(request: Request) -> AsyncKafkaProducer:
-    return request.app.state.kafka_producer
+def get_quota_service(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> QuotaService | None:
+    enforcer: QuotaEnforcer | None = getattr(request.app.state, "quota_enforcer", None)
+    if enforcer is None:
+        return None
+    return QuotaService(QuotaRepository(session), enforcer, quota_limits_cache)
 
 
-def get_generation_repo(session: AsyncSession = Depends(get_session)) -> GenerationRepository:
-    return GenerationRepository(session)
+def get_generation_repo(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> GenerationRepository:
+    return GenerationRepository(session, read_session)
 
 
-def get_template_repo(session: AsyncSession = Depends(get_session)) -> TemplateRepository:
-    return TemplateRepository(session)
+def get_template_repo(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> TemplateRepository:
+    return TemplateRepository(session, read_session)
 
 
-def get_schema_repo(session: AsyncSession = Depends(get_session)) -> SchemaRepository:
-    return SchemaRepository(session)
+def get_schema_repo(
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
+) -> SchemaRepository:
+    return SchemaRepository(session, read_session)
 
 
 def get_generation_service(
     repo: GenerationRepository = Depends(get_generation_repo),
-    producer: AsyncKafkaProducer = Depends(get_kafka_producer),
+    completion_waiter: CompletionWaiter | None = Depends(get_completion_waiter),
+    status_cache: StatusCache | None = Depends(get_status_cache),
+    quota_service: QuotaService | None = Depends(get_quota_service),
 ) -> GenerationService:
-    return GenerationService(repo, producer)
+    return GenerationService(
+        repo, archive_store, list_total_cache, completion_waiter, status_cache, quota_service
+    )
 
 
 def get_template_service(
     repo: TemplateRepository = Depends(get_template_repo),
 ) -> TemplateService:
-    return TemplateService(repo)
+    return TemplateService(repo, list_total_cache)
 
 
 def get_schema_service(
@@ -1,31 +1,135 @@
 """FastAPI application factory for the Ingestion Service."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
+from redis.asyncio import Redis
 
-from shared.database import init_database
+from shared.admission import AdmissionController
+from shared.database import (
+    WriteStickiness,
+    get_replica_router,
+    get_session_factory,
+    init_database,
+)
 from shared.kafka import AsyncKafkaProducer
 from shared.logging import setup_logging
+from shared.metrics import MetricsMiddleware, metrics_router
 from shared.middleware.correlation import CorrelationIDMiddleware
 from shared.middleware.error_handler import register_error_handlers
+from shared.notifications import CompletionWaiter
+from shared.outbox import OutboxRelay
+from shared.quotas import QuotaEnforcer
+from shared.status_cache import StatusCache
+from shared.tracing import setup_tracing, shutdown_tracing
 
 from ingestion.config import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    setup_logging(settings.service_name, settings.log_level, settings.environment)
-    init_database(settings.database_url, settings.database_pool_size, settings.database_max_overflow)
+    setup_logging(
+        settings.service_name,
+        settings.log_level,
+        settings.environment,
+        message_sample_rate=settings.log_message_sample_rate,
+        queue_size=settings.log_queue_size,
+    )
+    setup_tracing(
+        settings.service_name,
+        settings.otel_exporter_otlp_endpoint,
+        settings.otel_trace_sample_ratio,
+    )
+    init_database(
+        settings.database_url,
+        replica_urls=settings.database_replica_urls,
+        replica_max_lag_seconds=settings.database_replica_max_lag_seconds,
+        replica_check_interval_seconds=settings.database_replica_check_interval_seconds,
+        **settings.database_engine_options(),
+    )
+    replica_router = get_replica_router()
+    replica_task = (
+        asyncio.create_task(replica_router.run_forever()) if replica_router is not None else None
+    )
 
     producer = AsyncKafkaProducer(settings.kafka_bootstrap_servers)
     await producer.start()
     app.state.kafka_producer = producer
 
+    relay_task = None
+    if settings.outbox_relay_enabled:
+        relay = OutboxRelay(
+            get_session_factory(),
+            producer,
+            batch_size=settings.outbox_batch_size,
+            poll_interval_ms=settings.outbox_poll_interval_ms,
+        )
+        relay_task = asyncio.create_task(relay.run_forever())
+
+    redis = Redis.from_url(settings.redis_url)
+    completion_waiter = None
+    if settings.completion_notifications_enabled:
+        completion_waiter = CompletionWaiter(redis)
+        await completion_waiter.start()
+    app.state.completion_waiter = completion_waiter
+    app.state.status_cache = (
+        StatusCache(
+            redis,
+            ttl_seconds=settings.status_cache_ttl_seconds,
+            local_ttl_seconds=settings.status_cache_local_ttl_seconds,
+            pending_ttl_seconds=settings.status_cache_pending_ttl_seconds,
+        )
+        if settings.status_cache_enabled
+        else None
+    )
+    app.state.quota_enforcer = QuotaEnforcer(redis) if settings.quota_enforcement_enabled else None
+    # Only needed while reads can go to a replica
+    app.state.write_stickiness = (
+        WriteStickiness(settings.read_your_writes_seconds, redis)
+        if replica_router is not None
+        else None
+    )
+
+    admission_task = None
+    app.state.admission_controller = None
+    if settings.admission_control_enabled:
+        admission = AdmissionController(
+            redis,
+            thresholds=settings.admission_shed_thresholds,
+            refresh_interval_seconds=settings.admission_refresh_interval_seconds,
+            retry_after_seconds=settings.admission_retry_after_seconds,
+        )
+        admission_task = asyncio.create_task(admission.run_forever())
+        app.state.admission_controller = admission
+
     yield
 
+    if admission_task is not None:
+        admission_task.cancel()
+        try:
+            await admission_task
+        except asyncio.CancelledError:
+            pass
+    if completion_waiter is not None:
+        await completion_waiter.stop()
+    await redis.aclose()
+    if relay_task is not None:
+        relay_task.cancel()
+        try:
+            await relay_task
+        except asyncio.CancelledError:
+            pass
     await producer.stop()
+    if replica_task is not None:
+        replica_task.cancel()
+        try:
+            await replica_task
+        except asyncio.CancelledError:
+            pass
+        await replica_router.dispose()
+    shutdown_tracing()
 
 
 app = FastAPI(
@@ -34,11 +138,15 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-app.add_middleware(CorrelationIDMiddleware)
+app.add_middleware(
+    CorrelationIDMiddleware, access_log_sample_rate=settings.access_log_sample_rate
+)
+app.add_middleware(MetricsMiddleware)
 register_error_handlers(app)
 
 from ingestion.api.v1 import generations, templates, schemas, health  # noqa: E402
 
+app.include_router(metrics_router)
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(generations.router, prefix="/api/v1", tags=["generations"])
 app.include_router(templates.router, prefix="/api/v1", tags=["templates"])
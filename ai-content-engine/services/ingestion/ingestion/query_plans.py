@@ -0,0 +1,299 @@
+"""Query-plan regression check for the ingestion repositories.
+
+Runs every repository query against a migrated local Postgres, captures the
+SQL it emits and asserts via ``EXPLAIN`` that no statement falls back to a
+sequential scan. Sequential scans are disabled for the check so the planner
+picks an index whenever a usable one exists, independent of table size; a
+``Seq Scan`` in the plan therefore means an index is missing.
+
+All seed rows are written inside a transaction that is rolled back, so the
+check can run against a development database::
+
+    make migrate && make check-plans
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from shared.database import create_engine
+from shared.models.generation import GenerationBatch
+from shared.partitions import ensure_partitions, month_start
+from shared.utils.datetime import utcnow
+
+from ingestion.config import settings
+from ingestion.repositories.generation_repo import GenerationRepository
+from ingestion.repositories.quota_repo import QuotaRepository
+from ingestion.repositories.schema_repo import SchemaRepository
+from ingestion.repositories.template_repo import TemplateRepository
+
+EXPLAINED_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+@dataclass
+class Seed:
+    organization_id: uuid.UUID
+    user_id: uuid.UUID
+    template_id: uuid.UUID
+    schema_id: uuid.UUID
+    request_id: uuid.UUID
+    batch: GenerationBatch
+    request_cursor: tuple[datetime, uuid.UUID]
+    template_cursor: tuple[datetime, uuid.UUID]
+
+
+@dataclass
+class PlanCase:
+    name: str
+    run: Callable[[AsyncSession, Seed], Awaitable[Any]]
+
+
+@dataclass
+class PlanResult:
+    case: str
+    statement: str
+    scans: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+
+
+CASES = [
+    PlanCase("generations.get_by_id", lambda s, seed: GenerationRepository(s).get_by_id(seed.request_id)),
+    PlanCase(
+        "generations.get_by_id[org]",
+        lambda s, seed: GenerationRepository(s).get_by_id(seed.request_id, seed.organization_id),
+    ),
+    PlanCase(
+        "generations.get_status",
+        lambda s, seed: GenerationRepository(s).get_status(seed.request_id, seed.organization_id),
+    ),
+    PlanCase("generations.list_by_org", lambda s, seed: GenerationRepository(s).list_by_org(seed.organization_id, limit=21)),
+    PlanCase(
+        "generations.list_by_org[after]",
+        lambda s, seed: GenerationRepository(s).list_by_org(
+            seed.organization_id, limit=21, after=seed.request_cursor
+        ),
+    ),
+    PlanCase("generations.count_by_org", lambda s, seed: GenerationRepository(s).count_by_org(seed.organization_id)),
+    PlanCase(
+        "generations.get_batch",
+        lambda s, seed: GenerationRepository(s).get_batch(seed.batch.id, seed.organization_id),
+    ),
+    PlanCase("generations.count_batch_statuses", lambda s, seed: GenerationRepository(s).count_batch_statuses(seed.batch)),
+    PlanCase("templates.get_by_id", lambda s, seed: TemplateRepository(s).get_by_id(seed.template_id)),
+    PlanCase("templates.list_all", lambda s, seed: TemplateRepository(s).list_all(limit=21)),
+    PlanCase(
+        "templates.list_all[after]",
+        lambda s, seed: TemplateRepository(s).list_all(limit=21, after=seed.template_cursor),
+    ),
+    PlanCase("templates.count_all", lambda s, seed: TemplateRepository(s).count_all()),
+    PlanCase("schemas.get_by_id", lambda s, seed: SchemaRepository(s).get_by_id(seed.schema_id)),
+    PlanCase("quotas.list_for_org", lambda s, seed: QuotaRepository(s).list_for_org(seed.organization_id)),
+]
+
+
+class StatementRecorder:
+    """``before_cursor_execute`` listener collecting statements while active."""
+
+    def __init__(self) -> None:
+        self.active = False
+        self.statements: list[tuple[str, Any]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.active and statement.lstrip().upper().startswith(EXPLAINED_PREFIXES):
+            self.statements.append((statement, parameters))
+
+
+async def seed(conn: AsyncConnection, rows: int) -> Seed:
+    org_id, user_id = uuid.uuid4(), uuid.uuid4()
+    now = utcnow()
+    await ensure_partitions(conn, month_start(now - timedelta(seconds=rows)), month_start(now))
+    await conn.execute(
+        text("INSERT INTO organizations (id, name, slug) VALUES (:id, 'plan-check', :slug)"),
+        {"id": org_id, "slug": f"plan-check-{org_id.hex}"},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO users (id, email, name, organization_id) "
+            "VALUES (:id, :email, 'plan-check', :org)"
+        ),
+        {"id": user_id, "email": f"{user_id.hex}@plan-check.invalid", "org": org_id},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO prompt_templates "
+            "(id, name, system_prompt, user_prompt, content_hash, created_by, created_at) "
+            "SELECT gen_random_uuid(), 'plan-check-' || g, 's', 'u', md5(g::text), :user, "
+            "now() - g * interval '1 minute' FROM generate_series(1, :rows) g"
+        ),
+        {"user": user_id, "rows": rows},
+    )
+    template = (
+        await conn.execute(
+            text("SELECT id, created_at FROM prompt_templates WHERE created_by = :user "
+                 "ORDER BY created_at DESC, id DESC OFFSET :mid LIMIT 1"),
+            {"user": user_id, "mid": rows // 2},
+        )
+    ).one()
+    await conn.execute(
+        text(
+            "INSERT INTO generation_requests "
+            "(id, correlation_id, user_id, organization_id, template_id, created_at) "
+            "SELECT gen_random_uuid(), gen_random_uuid(), :user, :org, :template, "
+            "now() - g * interval '1 second' FROM generate_series(1, :rows) g"
+        ),
+        {"user": user_id, "org": org_id, "template": template.id, "rows": rows},
+    )
+    request = (
+        await conn.execute(
+            text("SELECT id, created_at FROM generation_requests WHERE organization_id = :org "
+                 "ORDER BY created_at DESC, id DESC OFFSET :mid LIMIT 1"),
+            {"org": org_id, "mid": rows // 2},
+        )
+    ).one()
+    batch = GenerationBatch(
+        id=uuid.uuid4(), user_id=user_id, organization_id=org_id, item_count=100, created_at=now
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO generation_batches (id, user_id, organization_id, item_count, created_at) "
+            "VALUES (:id, :user, :org, :count, :created_at)"
+        ),
+        {"id": batch.id, "user": user_id, "org": org_id, "count": batch.item_count, "created_at": now},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO generation_requests "
+            "(id, correlation_id, user_id, organization_id, template_id, batch_id, created_at) "
+            "SELECT gen_random_uuid(), gen_random_uuid(), :user, :org, :template, :batch, :created_at "
+            "FROM generate_series(1, :count)"
+        ),
+        {
+            "user": user_id,
+            "org": org_id,
+            "template": template.id,
+            "batch": batch.id,
+            "created_at": now,
+            "count": batch.item_count,
+        },
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO generation_results "
+            "(id, request_id, request_created_at, model_provider, model_id, raw_response) "
+            "SELECT gen_random_uuid(), id, created_at, 'plan-check', 'plan-check', '{}' "
+            "FROM generation_requests WHERE organization_id = :org"
+        ),
+        {"org": org_id},
+    )
+    schema_id = uuid.uuid4()
+    await conn.execute(
+        text("INSERT INTO output_schemas (id, name, json_schema) VALUES (:id, 'plan-check', '{}')"),
+        {"id": schema_id},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO quotas (id, organization_id, quota_type, max_value, period) "
+            "SELECT gen_random_uuid(), :org, t, 1000, p "
+            "FROM unnest(ARRAY['requests', 'tokens']) t, unnest(ARRAY['minute', 'day']) p"
+        ),
+        {"org": org_id},
+    )
+    await conn.execute(
+        text("ANALYZE organizations, users, prompt_templates, generation_batches, "
+             "generation_requests, generation_results, output_schemas, quotas")
+    )
+    return Seed(
+        organization_id=org_id,
+        user_id=user_id,
+        template_id=template.id,
+        schema_id=schema_id,
+        request_id=request.id,
+        batch=batch,
+        request_cursor=(request.created_at, request.id),
+        template_cursor=(template.created_at, template.id),
+    )
+
+
+def _walk(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+async def explain(conn: AsyncConnection, case: str, statement: str, parameters: Any) -> PlanResult:
+    raw = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar_one()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    result = PlanResult(case=case, statement=" ".join(statement.split()))
+    for node in _walk(plan):
+        relation = node.get("Relation Name")
+        if relation is None:
+            continue
+        scan = f"{node['Node Type']} on {relation}"
+        if node.get("Index Name"):
+            scan += f" using {node['Index Name']}"
+        result.scans.append(scan)
+        if node["Node Type"] == "Seq Scan":
+            result.seq_scans.append(relation)
+    return result
+
+
+async def check_plans(database_url: str, rows: int) -> list[PlanResult]:
+    engine = create_engine(database_url, pool_size=1, max_overflow=0, name="query_plans")
+    recorder = StatementRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+    results: list[PlanResult] = []
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                data = await seed(conn, rows)
+                await conn.execute(text("SET LOCAL enable_seqscan = off"))
+                for case in CASES:
+                    recorder.statements.clear()
+                    recorder.active = True
+                    async with AsyncSession(
+                        bind=conn, join_transaction_mode="create_savepoint"
+                    ) as session:
+                        await case.run(session, data)
+                    recorder.active = False
+                    for statement, parameters in list(recorder.statements):
+                        results.append(await explain(conn, case.name, statement, parameters))
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
+    return results
+
+
+def report(results: list[PlanResult]) -> bool:
+    ok = True
+    for result in results:
+        status = "FAIL" if result.seq_scans else "ok"
+        ok = ok and not result.seq_scans
+        print(f"[{status}] {result.case}: {'; '.join(result.scans) or 'no table access'}")
+        if result.seq_scans:
+            print(f"       sequential scan on {', '.join(result.seq_scans)}")
+            print(f"       {result.statement}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--rows", type=int, default=5000, help="seed rows per table")
+    args = parser.parse_args()
+    results = asyncio.run(check_plans(args.database_url, args.rows))
+    return 0 if report(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
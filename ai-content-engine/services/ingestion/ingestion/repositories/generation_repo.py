@@ -1,47 +1,143 @@
 """Generation request repository."""
 
 import uuid
+from datetime import datetime
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from shared.exceptions import NotFoundError
-from shared.models.generation import GenerationRequest
+from shared.models.generation import GenerationBatch, GenerationRequest, GenerationStatus
+from shared.outbox import OutboxMessage, enqueue
 
 
 class GenerationRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    """Writes go through ``session``; read-only lookups and listings through
+    ``read_session`` (a replica session, defaulting to ``session``).
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None) -> None:
         self._session = session
+        self._reader = read_session or session
 
     async def create(self, request: GenerationRequest) -> GenerationRequest:
         self._session.add(request)
         await self._session.flush()
         return request
 
-    async def get_by_id(self, request_id: uuid.UUID) -> GenerationRequest:
-        result = await self._session.get(GenerationRequest, request_id)
-        if result is None:
-            raise NotFoundError(
-                message=f"Generation request {request_id} not found",
-                code="GENERATION_NOT_FOUND",
+    async def create_batch(
+        self, batch: GenerationBatch, rows: list[dict[str, Any]]
+    ) -> GenerationBatch:
+        """Insert a batch and its requests; ``rows`` are GenerationRequest column values.
+
+        Requests go through a single bulk INSERT (batched into multi-row
+        statements by the driver) rather than one ORM flush per object.
+        """
+        self._session.add(batch)
+        await self._session.flush()
+        if rows:
+            await self._session.execute(insert(GenerationRequest), rows)
+        return batch
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+    async def add_outbox_events(self, messages: list[OutboxMessage]) -> None:
+        await enqueue(self._session, messages)
+
+    async def get_batch(self, batch_id: uuid.UUID, organization_id: uuid.UUID) -> GenerationBatch:
+        batch = await self._session.get(GenerationBatch, batch_id)
+        if batch is None or batch.organization_id != organization_id:
+            raise NotFoundError("Generation batch", str(batch_id))
+        return batch
+
+    async def count_batch_statuses(self, batch: GenerationBatch) -> dict[GenerationStatus, int]:
+        result = await self._session.execute(
+            select(GenerationRequest.status, func.count())
+            .where(
+                GenerationRequest.batch_id == batch.id,
+                # All items share the batch's created_at: prunes to one partition
+                GenerationRequest.created_at == batch.created_at,
             )
+            .group_by(GenerationRequest.status)
+        )
+        return {status: count for status, count in result.all()}
+
+    async def get_by_id(
+        self,
+        request_id: uuid.UUID,
+        organization_id: uuid.UUID | None = None,
+        populate_existing: bool = False,
+        use_primary: bool = False,
+    ) -> GenerationRequest:
+        """Load a request with its result; ``use_primary`` when it must reflect the latest write.
+
+        With ``organization_id``, a request of another organization is
+        reported as not found.
+        """
+        options = {
+            "options": [selectinload(GenerationRequest.result)],
+            "populate_existing": populate_existing,
+        }
+        result = None
+        if not use_primary:
+            result = await self._reader.get(GenerationRequest, request_id, **options)
+        # A miss on a replica may be a request that has not replicated yet
+        if result is None and (use_primary or self._reader is not self._session):
+            result = await self._session.get(GenerationRequest, request_id, **options)
+        if result is None or (
+            organization_id is not None and result.organization_id != organization_id
+        ):
+            raise NotFoundError("Generation request", str(request_id))
         return result
 
+    async def get_status(
+        self, request_id: uuid.UUID, organization_id: uuid.UUID
+    ) -> tuple[GenerationStatus, datetime]:
+        """Return only ``(status, updated_at)``, skipping the JSONB columns."""
+        result = await self._reader.execute(
+            select(GenerationRequest.status, GenerationRequest.updated_at).where(
+                GenerationRequest.id == request_id,
+                GenerationRequest.organization_id == organization_id,
+            )
+        )
+        row = result.first()
+        if row is None:
+            raise NotFoundError("Generation request", str(request_id))
+        return row.status, row.updated_at
+
     async def list_by_org(
-        self, organization_id: uuid.UUID, page: int = 1, page_size: int = 20
-    ) -> tuple[list[GenerationRequest], int]:
-        base = select(GenerationRequest).where(
+        self,
+        organization_id: uuid.UUID,
+        limit: int = 20,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[GenerationRequest]:
+        """Keyset page ordered by ``(created_at, id)`` descending, starting after ``after``."""
+        stmt = select(GenerationRequest).where(
             GenerationRequest.organization_id == organization_id,
             GenerationRequest.deleted_at.is_(None),
         )
-        count_result = await self._session.execute(
-            select(func.count()).select_from(base.subquery())
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(GenerationRequest.created_at, GenerationRequest.id) < tuple_(*after),
+                # Plain bound on the partition key so later partitions are pruned
+                GenerationRequest.created_at <= after[0],
+            )
+        result = await self._reader.execute(
+            stmt.order_by(GenerationRequest.created_at.desc(), GenerationRequest.id.desc())
+            .limit(limit)
         )
-        total = count_result.scalar_one()
+        return list(result.scalars().all())
 
-        result = await self._session.execute(
-            base.order_by(GenerationRequest.created_at.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
+    async def count_by_org(self, organization_id: uuid.UUID) -> int:
+        result = await self._reader.execute(
+            select(func.count())
+            .select_from(GenerationRequest)
+            .where(
+                GenerationRequest.organization_id == organization_id,
+                GenerationRequest.deleted_at.is_(None),
+            )
         )
-        return list(result.scalars().all()), total
+        return result.scalar_one()
@@ -0,0 +1,19 @@
+"""Quota repository."""
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models.quota import Quota
+
+
+class QuotaRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_for_org(self, organization_id: uuid.UUID) -> list[Quota]:
+        result = await self._session.execute(
+            select(Quota).where(Quota.organization_id == organization_id)
+        )
+        return list(result.scalars().all())
@@ -9,16 +9,22 @@ from shared.models.schema import OutputSchema
 
 
 class SchemaRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None) -> None:
         self._session = session
+        self._reader = read_session or session
 
     async def create(self, schema: OutputSchema) -> OutputSchema:
         self._session.add(schema)
         await self._session.flush()
         return schema
 
-    async def get_by_id(self, schema_id: uuid.UUID) -> OutputSchema:
-        result = await self._session.get(OutputSchema, schema_id)
+    async def get_by_id(self, schema_id: uuid.UUID, use_primary: bool = False) -> OutputSchema:
+        """``use_primary`` when the row is loaded to be modified."""
+        result = None
+        if not use_primary:
+            result = await self._reader.get(OutputSchema, schema_id)
+        if result is None and (use_primary or self._reader is not self._session):
+            result = await self._session.get(OutputSchema, schema_id)
         if result is None:
             raise NotFoundError(
                 message=f"Schema {schema_id} not found",
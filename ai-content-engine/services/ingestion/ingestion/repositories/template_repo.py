@@ -1,8 +1,9 @@
 """Prompt template repository."""
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.exceptions import NotFoundError
@@ -10,16 +11,22 @@ from shared.models.template import PromptTemplate
 
 
 class TemplateRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None) -> None:
         self._session = session
+        self._reader = read_session or session
 
     async def create(self, template: PromptTemplate) -> PromptTemplate:
         self._session.add(template)
         await self._session.flush()
         return template
 
-    async def get_by_id(self, template_id: uuid.UUID) -> PromptTemplate:
-        result = await self._session.get(PromptTemplate, template_id)
+    async def get_by_id(self, template_id: uuid.UUID, use_primary: bool = False) -> PromptTemplate:
+        """``use_primary`` when the row is loaded to be modified."""
+        result = None
+        if not use_primary:
+            result = await self._reader.get(PromptTemplate, template_id)
+        if result is None and (use_primary or self._reader is not self._session):
+            result = await self._session.get(PromptTemplate, template_id)
         if result is None:
             raise NotFoundError(
                 message=f"Template {template_id} not found",
@@ -32,17 +39,21 @@ class TemplateRepository:
         return template
 
     async def list_all(
-        self, page: int = 1, page_size: int = 20
-    ) -> tuple[list[PromptTemplate], int]:
-        base = select(PromptTemplate).where(PromptTemplate.deleted_at.is_(None))
-        count_result = await self._session.execute(
-            select(func.count()).select_from(base.subquery())
+        self, limit: int = 20, after: tuple[datetime, uuid.UUID] | None = None
+    ) -> list[PromptTemplate]:
+        """Keyset page ordered by ``(created_at, id)`` descending, starting after ``after``."""
+        stmt = select(PromptTemplate).where(PromptTemplate.deleted_at.is_(None))
+        if after is not None:
+            stmt = stmt.where(tuple_(PromptTemplate.created_at, PromptTemplate.id) < tuple_(*after))
+        result = await self._reader.execute(
+            stmt.order_by(PromptTemplate.created_at.desc(), PromptTemplate.id.desc()).limit(limit)
         )
-        total = count_result.scalar_one()
+        return list(result.scalars().all())
 
-        result = await self._session.execute(
-            base.order_by(PromptTemplate.created_at.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
+    async def count_all(self) -> int:
+        result = await self._reader.execute(
+            select(func.count())
+            .select_from(PromptTemplate)
+            .where(PromptTemplate.deleted_at.is_(None))
         )
-        return list(result.scalars().all()), total
+        return result.scalar_one()
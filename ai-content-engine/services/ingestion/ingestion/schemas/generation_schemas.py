@@ -2,6 +2,7 @@
 
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel, Field
 
@@ -29,9 +30,48 @@ class GenerationResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class GenerationStatusResponse(BaseModel):
+    id: uuid.UUID
+    status: str
+    updated_at: datetime
+
+
+class GenerationResultResponse(BaseModel):
+    id: uuid.UUID
+    model_provider: str
+    model_id: str
+    model_version: str | None = None
+    raw_response: str
+    parsed_output: dict | list | None = None
+    validation_results: dict | None = None
+    token_usage: dict = Field(default_factory=dict)
+    cost_usd: Decimal = Decimal("0")
+    latency_ms: dict = Field(default_factory=dict)
+    storage_tier: str
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 class GenerationDetailResponse(GenerationResponse):
     parameters: dict = Field(default_factory=dict)
     options: dict = Field(default_factory=dict)
     user_id: uuid.UUID
     organization_id: uuid.UUID
     project_id: uuid.UUID | None = None
+    result: GenerationResultResponse | None = None
+
+
+class GenerationBatchResponse(BaseModel):
+    id: uuid.UUID
+    item_count: int
+    request_ids: list[uuid.UUID]
+    created_at: datetime
+
+
+class GenerationBatchStatusResponse(BaseModel):
+    id: uuid.UUID
+    item_count: int
+    status_counts: dict[str, int]
+    finished: bool
+    created_at: datetime
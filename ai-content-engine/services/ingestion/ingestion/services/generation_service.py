@@ -2,26 +2,87 @@
 
 import hashlib
 import uuid
+from datetime import datetime
 
 import structlog
 
+from shared.archive import ArchiveStore, load_archived_record
+from shared.events import timing
 from shared.events.envelope import EventEnvelope
+from shared.exceptions import NotFoundError, ValidationError
+from shared.kafka.lanes import lane_topic
 from shared.events.input_events import InputReceivedEvent
-from shared.kafka import AsyncKafkaProducer
-from shared.models.generation import GenerationRequest, GenerationStatus, RequestMode, RequestPriority
+from shared.models.generation import (
+    GenerationBatch,
+    GenerationRequest,
+    GenerationStatus,
+    RequestMode,
+    RequestPriority,
+    StorageTier,
+)
+from shared.notifications import CompletionWaiter
+from shared.status_cache import StatusCache
+from shared.utils.cache import TTLCache
+from shared.utils.datetime import utcnow
+from shared.utils.pagination import decode_cursor, next_page
 
 from ingestion.repositories.generation_repo import GenerationRepository
-from ingestion.schemas.generation_schemas import GenerationCreate
+from ingestion.services.quota_service import QuotaService
+from ingestion.schemas.generation_schemas import GenerationCreate, GenerationResultResponse
 
 logger = structlog.get_logger(__name__)
 
 INPUT_RECEIVED_TOPIC = "content.input.received"
 
+# Statuses after which a request no longer changes
+TERMINAL_STATUSES = frozenset(
+    {GenerationStatus.COMPLETED, GenerationStatus.FAILED, GenerationStatus.CANCELLED}
+)
+
+
+def _input_received_envelope(
+    request_id: uuid.UUID,
+    correlation_id: uuid.UUID,
+    user_id: uuid.UUID,
+    organization_id: uuid.UUID,
+    data: GenerationCreate,
+) -> EventEnvelope:
+    event = InputReceivedEvent(
+        request_id=request_id,
+        correlation_id=correlation_id,
+        user_id=user_id,
+        organization_id=organization_id,
+        template_id=data.template_id,
+        template_version=data.template_version,
+        parameters=data.parameters,
+        options=data.options,
+        priority=data.priority,
+    )
+    return EventEnvelope(
+        event_type="input.received",
+        correlation_id=correlation_id,
+        source_service="ingestion",
+        payload=event.model_dump(mode="json"),
+        timings=timing.stamp({}, timing.ACCEPTED),
+    )
+
 
 class GenerationService:
-    def __init__(self, repo: GenerationRepository, producer: AsyncKafkaProducer) -> None:
+    def __init__(
+        self,
+        repo: GenerationRepository,
+        archive_store: ArchiveStore | None = None,
+        total_cache: TTLCache[int] | None = None,
+        completion_waiter: CompletionWaiter | None = None,
+        status_cache: StatusCache | None = None,
+        quota_service: QuotaService | None = None,
+    ) -> None:
         self._repo = repo
-        self._producer = producer
+        self._archive_store = archive_store
+        self._total_cache = total_cache
+        self._completion_waiter = completion_waiter
+        self._status_cache = status_cache
+        self._quota_service = quota_service
 
     async def create(
         self,
@@ -29,6 +90,8 @@ class GenerationService:
         user_id: uuid.UUID,
         organization_id: uuid.UUID,
     ) -> GenerationRequest:
+        if self._quota_service is not None:
+            await self._quota_service.admit(organization_id)
         correlation_id = uuid.uuid4()
         request = GenerationRequest(
             correlation_id=correlation_id,
@@ -44,34 +107,193 @@ class GenerationService:
         )
         request = await self._repo.create(request)
 
-        event = InputReceivedEvent(
-            request_id=request.id,
-            correlation_id=correlation_id,
-            user_id=user_id,
-            organization_id=organization_id,
-            template_id=data.template_id,
-            template_version=data.template_version,
-            parameters=data.parameters,
-            options=data.options,
+        envelope = _input_received_envelope(
+            request.id, correlation_id, user_id, organization_id, data
         )
-        envelope = EventEnvelope(
-            event_type="input.received",
-            correlation_id=correlation_id,
-            source_service="ingestion",
-            payload=event.model_dump(mode="json"),
-        )
-        await self._producer.send(
-            INPUT_RECEIVED_TOPIC,
-            value=envelope.to_kafka_value(),
-            key=envelope.kafka_key,
+        # Published by the outbox relay once this transaction commits
+        await self._repo.add_outbox_events(
+            [
+                (
+                    lane_topic(INPUT_RECEIVED_TOPIC, data.priority),
+                    envelope.to_kafka_value(),
+                    envelope.kafka_key,
+                )
+            ]
         )
         logger.info("generation_request_created", request_id=str(request.id), correlation_id=str(correlation_id))
         return request
 
-    async def get_by_id(self, request_id: uuid.UUID) -> GenerationRequest:
-        return await self._repo.get_by_id(request_id)
+    async def create_batch(
+        self,
+        items: list[GenerationCreate],
+        user_id: uuid.UUID,
+        organization_id: uuid.UUID,
+    ) -> tuple[GenerationBatch, list[uuid.UUID]]:
+        """Accept many generation requests with one bulk insert of requests and outbox events.
+
+        Every item is validated before anything is written, so a bad item
+        rejects the whole batch. Returns the batch and the request ids in
+        item order.
+        """
+        batch = GenerationBatch(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            organization_id=organization_id,
+            item_count=len(items),
+            created_at=utcnow(),
+        )
+        rows = []
+        messages = []
+        for index, data in enumerate(items):
+            try:
+                mode = RequestMode(data.mode)
+                priority = RequestPriority(data.priority)
+            except ValueError as e:
+                raise ValidationError(
+                    message=f"Invalid batch item at index {index}",
+                    details=[{"index": index, "message": str(e)}],
+                ) from e
+            request_id, correlation_id = uuid.uuid4(), uuid.uuid4()
+            rows.append(
+                {
+                    "id": request_id,
+                    "correlation_id": correlation_id,
+                    "batch_id": batch.id,
+                    "created_at": batch.created_at,
+                    "user_id": user_id,
+                    "organization_id": organization_id,
+                    "template_id": data.template_id,
+                    "template_version": data.template_version,
+                    "parameters": data.parameters,
+                    "options": data.options,
+                    "status": GenerationStatus.PENDING,
+                    "mode": mode,
+                    "priority": priority,
+                }
+            )
+            envelope = _input_received_envelope(
+                request_id, correlation_id, user_id, organization_id, data
+            )
+            messages.append(
+                (
+                    lane_topic(INPUT_RECEIVED_TOPIC, priority.value),
+                    envelope.to_kafka_value(),
+                    envelope.kafka_key,
+                )
+            )
+
+        if self._quota_service is not None:
+            await self._quota_service.admit(organization_id, requests=len(rows))
+        await self._repo.create_batch(batch, rows)
+        await self._repo.add_outbox_events(messages)
+        logger.info("generation_batch_created", batch_id=str(batch.id), items=len(rows))
+        return batch, [row["id"] for row in rows]
+
+    async def get_batch_status(
+        self, batch_id: uuid.UUID, organization_id: uuid.UUID
+    ) -> tuple[GenerationBatch, dict[GenerationStatus, int]]:
+        batch = await self._repo.get_batch(batch_id, organization_id)
+        return batch, await self._repo.count_batch_statuses(batch)
+
+    async def get_by_id(
+        self, request_id: uuid.UUID, organization_id: uuid.UUID
+    ) -> GenerationRequest:
+        return await self._repo.get_by_id(request_id, organization_id)
+
+    async def get_status(
+        self, request_id: uuid.UUID, organization_id: uuid.UUID
+    ) -> tuple[str, datetime]:
+        """Return ``(status, updated_at)`` from the status cache, reading the database on a miss.
+
+        Requests of other organizations are not found. Cached entries that
+        do not record an organization are checked against the database.
+        """
+        if self._status_cache is not None:
+            entry = await self._status_cache.get(request_id)
+            cached_org = entry.get("organization_id") if entry is not None else None
+            if cached_org is not None:
+                if cached_org != str(organization_id):
+                    raise NotFoundError("Generation request", str(request_id))
+                return entry["status"], datetime.fromisoformat(entry["updated_at"])
+        status, updated_at = await self._repo.get_status(request_id, organization_id)
+        if self._status_cache is not None:
+            await self._status_cache.fill(request_id, status.value, updated_at, organization_id)
+        return status.value, updated_at
+
+    async def wait_until_finished(
+        self, request_id: uuid.UUID, organization_id: uuid.UUID, timeout: float
+    ) -> tuple[GenerationRequest, bool]:
+        """Return the request once it reaches a terminal status or ``timeout`` elapses.
+
+        A request of another organization is not found before any waiting.
+        Pending writes are committed first (so sync-mode requests become
+        visible to the pipeline) and no connection is held while waiting on
+        the completion notification. Returns the request and whether it
+        finished.
+        """
+        if self._completion_waiter is None or timeout <= 0:
+            request = await self._repo.get_by_id(request_id, organization_id, use_primary=True)
+            return request, request.status in TERMINAL_STATUSES
+
+        with self._completion_waiter.expect(request_id) as completed:
+            await self._repo.commit()
+            request = await self._repo.get_by_id(
+                request_id, organization_id, populate_existing=True, use_primary=True
+            )
+            if request.status in TERMINAL_STATUSES:
+                return request, True
+            # Ends the read transaction so the pooled connection is returned
+            await self._repo.commit()
+            status = await self._completion_waiter.wait(completed, timeout)
+        request = await self._repo.get_by_id(
+            request_id, organization_id, populate_existing=True, use_primary=True
+        )
+        if status is None:
+            logger.debug("generation_wait_timed_out", request_id=str(request_id), timeout=timeout)
+        return request, request.status in TERMINAL_STATUSES
+
+    async def get_result(self, request: GenerationRequest) -> GenerationResultResponse | None:
+        """Return the request's result, rehydrating archived fields from cold storage."""
+        result = request.result
+        if result is None:
+            return None
+        response = GenerationResultResponse.model_validate(result)
+        if result.storage_tier == StorageTier.HOT or not result.archive_uri:
+            return response
+        if self._archive_store is None:
+            logger.warning("archive_store_unavailable", result_id=str(result.id))
+            return response
+        record = await load_archived_record(self._archive_store, result.archive_uri, result.id)
+        if record is None:
+            logger.error("archived_result_missing", result_id=str(result.id), uri=result.archive_uri)
+            return response
+        return response.model_copy(update=record)
 
     async def list_by_org(
-        self, organization_id: uuid.UUID, page: int = 1, page_size: int = 20
-    ) -> tuple[list[GenerationRequest], int]:
-        return await self._repo.list_by_org(organization_id, page=page, page_size=page_size)
+        self,
+        organization_id: uuid.UUID,
+        page_size: int = 20,
+        cursor: str | None = None,
+        include_total: bool = False,
+    ) -> tuple[list[GenerationRequest], str | None, int | None]:
+        """Return one keyset page, the cursor for the next one, and optionally a total.
+
+        The total is an exact count cached for a short TTL per organization, so
+        it may lag recent inserts; it is only computed when asked for.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = await self._repo.list_by_org(organization_id, limit=page_size + 1, after=after)
+        items, next_cursor = next_page(rows, page_size)
+        total = await self._count_by_org(organization_id) if include_total else None
+        return items, next_cursor, total
+
+    async def _count_by_org(self, organization_id: uuid.UUID) -> int:
+        key = ("generations", organization_id)
+        if self._total_cache is not None:
+            cached = self._total_cache.get(key)
+            if cached is not None:
+                return cached
+        total = await self._repo.count_by_org(organization_id)
+        if self._total_cache is not None:
+            self._total_cache.set(key, total)
+        return total
@@ -0,0 +1,42 @@
+"""Quota admission for new generation requests."""
+
+import uuid
+
+from shared.quotas import QuotaEnforcer, QuotaLimit
+from shared.utils.cache import TTLCache
+
+from ingestion.repositories.quota_repo import QuotaRepository
+
+
+class QuotaService:
+    """Admits requests against an organization's quotas.
+
+    Quota definitions are cached per organization, so steady-state admission
+    is a single Redis script call with no database read.
+    """
+
+    def __init__(
+        self,
+        repo: QuotaRepository,
+        enforcer: QuotaEnforcer,
+        limits_cache: TTLCache[tuple[QuotaLimit, ...]],
+    ) -> None:
+        self._repo = repo
+        self._enforcer = enforcer
+        self._limits_cache = limits_cache
+
+    async def admit(self, organization_id: uuid.UUID, requests: int = 1) -> None:
+        """Consume ``requests`` from the organization's quotas or raise RateLimitError."""
+        limits = await self._limits(organization_id)
+        if limits:
+            await self._enforcer.admit(organization_id, limits, requests=requests)
+
+    async def _limits(self, organization_id: uuid.UUID) -> tuple[QuotaLimit, ...]:
+        limits = self._limits_cache.get(organization_id)
+        if limits is None:
+            limits = tuple(
+                QuotaLimit(quota.quota_type, quota.period, quota.max_value)
+                for quota in await self._repo.list_for_org(organization_id)
+            )
+            self._limits_cache.set(organization_id, limits)
+        return limits
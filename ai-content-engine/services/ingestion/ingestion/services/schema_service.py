@@ -25,7 +25,7 @@ class SchemaService:
         return await self._repo.get_by_id(schema_id)
 
     async def update(self, schema_id: uuid.UUID, data: OutputSchemaUpdate) -> OutputSchema:
-        schema = await self._repo.get_by_id(schema_id)
+        schema = await self._repo.get_by_id(schema_id, use_primary=True)
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(schema, field, value)
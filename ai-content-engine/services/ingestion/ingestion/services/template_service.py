@@ -4,14 +4,17 @@ import hashlib
 import uuid
 
 from shared.models.template import PromptTemplate, TemplateStatus
+from shared.utils.cache import TTLCache
+from shared.utils.pagination import decode_cursor, next_page
 
 from ingestion.repositories.template_repo import TemplateRepository
 from ingestion.schemas.template_schemas import TemplateCreate, TemplateUpdate
 
 
 class TemplateService:
-    def __init__(self, repo: TemplateRepository) -> None:
+    def __init__(self, repo: TemplateRepository, total_cache: TTLCache[int] | None = None) -> None:
         self._repo = repo
+        self._total_cache = total_cache
 
     def _compute_hash(self, system_prompt: str, user_prompt: str) -> str:
         content = f"{system_prompt}||{user_prompt}"
@@ -36,7 +39,7 @@ class TemplateService:
         return await self._repo.get_by_id(template_id)
 
     async def update(self, template_id: uuid.UUID, data: TemplateUpdate) -> PromptTemplate:
-        template = await self._repo.get_by_id(template_id)
+        template = await self._repo.get_by_id(template_id, use_primary=True)
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             if field == "metadata":
@@ -52,6 +55,21 @@ class TemplateService:
         return await self._repo.update(template)
 
     async def list_all(
-        self, page: int = 1, page_size: int = 20
-    ) -> tuple[list[PromptTemplate], int]:
-        return await self._repo.list_all(page=page, page_size=page_size)
+        self, page_size: int = 20, cursor: str | None = None, include_total: bool = False
+    ) -> tuple[list[PromptTemplate], str | None, int | None]:
+        after = decode_cursor(cursor) if cursor else None
+        rows = await self._repo.list_all(limit=page_size + 1, after=after)
+        items, next_cursor = next_page(rows, page_size)
+        total = await self._count_all() if include_total else None
+        return items, next_cursor, total
+
+    async def _count_all(self) -> int:
+        key = ("templates",)
+        if self._total_cache is not None:
+            cached = self._total_cache.get(key)
+            if cached is not None:
+                return cached
+        total = await self._repo.count_all()
+        if self._total_cache is not None:
+            self._total_cache.set(key, total)
+        return total
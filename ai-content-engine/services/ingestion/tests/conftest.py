@@ -0,0 +1,9 @@
+"""Ingestion test setup.
+
+The service settings require a database URL at import time; the tests in
+this directory never connect, so any well-formed URL will do.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://ingestion@localhost/ingestion")
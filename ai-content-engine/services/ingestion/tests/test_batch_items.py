@@ -0,0 +1,115 @@
+import json
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from shared.exceptions import ValidationError
+from ingestion.api.v1.generations import MAX_REPORTED_ITEM_ERRORS, read_batch_items
+
+NDJSON = "application/x-ndjson"
+
+
+class Body:
+    """An ASGI receive channel delivering the body in the given chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = list(chunks)
+        self.delivered = 0
+
+    async def __call__(self) -> dict:
+        chunk = self.chunks[self.delivered] if self.chunks else b""
+        self.delivered += 1
+        more = self.delivered < len(self.chunks)
+        return {"type": "http.request", "body": chunk, "more_body": more}
+
+
+def make_request(body: Body, content_type: str) -> Request:
+    headers = [(b"content-type", content_type.encode())]
+    return Request({"type": "http", "method": "POST", "headers": headers}, body)
+
+
+def item(**fields) -> dict:
+    return {"template_id": str(uuid.uuid4()), **fields}
+
+
+def ndjson(items: list[dict]) -> bytes:
+    return b"".join(json.dumps(i).encode() + b"\n" for i in items)
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+async def test_ndjson_items_split_across_chunks(chunk_size):
+    items = [item(parameters={"n": n}) for n in range(5)]
+
+    parsed = await read_batch_items(
+        make_request(Body(split(ndjson(items), chunk_size)), NDJSON), max_items=10
+    )
+
+    assert [p.parameters for p in parsed] == [{"n": n} for n in range(5)]
+    assert [str(p.template_id) for p in parsed] == [i["template_id"] for i in items]
+
+
+async def test_ndjson_last_line_without_newline_and_blank_lines():
+    first, last = item(), item(priority="high")
+    data = json.dumps(first).encode() + b"\r\n\n  \n" + json.dumps(last).encode()
+
+    parsed = await read_batch_items(
+        make_request(Body(split(data, 5)), "application/jsonl; charset=utf-8"), max_items=10
+    )
+
+    assert [p.priority for p in parsed] == ["normal", "high"]
+
+
+async def test_ndjson_over_the_limit_is_rejected_before_the_body_is_read():
+    body = Body([ndjson([item()]) for _ in range(100)])
+
+    with pytest.raises(ValidationError, match="limit of 3 items"):
+        await read_batch_items(make_request(body, NDJSON), max_items=3)
+
+    assert body.delivered == 4
+
+
+async def test_invalid_items_are_reported_by_index():
+    data = ndjson([item(), {"template_id": "nope"}, item(), {}])
+
+    with pytest.raises(ValidationError) as excinfo:
+        await read_batch_items(make_request(Body(split(data, 16)), NDJSON), max_items=10)
+
+    assert [e["index"] for e in excinfo.value.details] == [1, 3]
+
+
+async def test_reported_item_errors_are_capped():
+    data = ndjson([{} for _ in range(MAX_REPORTED_ITEM_ERRORS + 10)])
+
+    with pytest.raises(ValidationError) as excinfo:
+        await read_batch_items(make_request(Body([data]), NDJSON), max_items=1000)
+
+    assert len(excinfo.value.details) == MAX_REPORTED_ITEM_ERRORS
+
+
+async def test_json_array_body():
+    items = [item(), item(mode="sync")]
+
+    parsed = await read_batch_items(
+        make_request(Body(split(json.dumps(items).encode(), 10)), "application/json"), max_items=10
+    )
+
+    assert [p.mode for p in parsed] == ["async", "sync"]
+
+
+@pytest.mark.parametrize(
+    ("data", "content_type", "message"),
+    [
+        (b'{"template_id": "x"}', "application/json", "JSON array or NDJSON"),
+        (b"not json", "application/json", "JSON array or NDJSON"),
+        (b"[]", "application/json", "no items"),
+        (b"\n\n", NDJSON, "no items"),
+    ],
+)
+async def test_malformed_bodies(data, content_type, message):
+    with pytest.raises(ValidationError, match=message):
+        await read_batch_items(make_request(Body([data]), content_type), max_items=10)
@@ -0,0 +1,71 @@
+import uuid
+from datetime import datetime, timezone
+
+from shared.archive import LocalArchiveStore, encode_segment
+from shared.models import GenerationRequest, GenerationResult, StorageTier
+from ingestion.services.generation_service import GenerationService
+
+CREATED = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+def request_with_result(**fields) -> GenerationRequest:
+    result = GenerationResult(
+        id=uuid.uuid4(),
+        request_id=uuid.uuid4(),
+        request_created_at=CREATED,
+        created_at=CREATED,
+        model_provider="anthropic",
+        model_id="claude-3-haiku-20240307",
+        token_usage={},
+        cost_usd=0,
+        latency_ms={},
+        **fields,
+    )
+    return GenerationRequest(result=result)
+
+
+async def archive(store: LocalArchiveStore, request: GenerationRequest, record: dict) -> str:
+    segment = encode_segment({request.result.id: record})
+    return await store.put(StorageTier.WARM.value, "2026/01/segment.json.zst", segment)
+
+
+async def test_hot_result_is_returned_as_stored(tmp_path):
+    request = request_with_result(
+        raw_response='{"a": 1}', parsed_output={"a": 1}, storage_tier=StorageTier.HOT
+    )
+    service = GenerationService(repo=None, archive_store=LocalArchiveStore(str(tmp_path)))
+
+    response = await service.get_result(request)
+
+    assert (response.raw_response, response.parsed_output) == ('{"a": 1}', {"a": 1})
+
+
+async def test_archived_fields_are_rehydrated_from_the_segment(tmp_path):
+    store = LocalArchiveStore(str(tmp_path))
+    request = request_with_result(
+        raw_response="", parsed_output=None, storage_tier=StorageTier.WARM
+    )
+    record = {"raw_response": '{"a": 1}', "parsed_output": {"a": 1}}
+    request.result.archive_uri = await archive(store, request, record)
+
+    response = await GenerationService(repo=None, archive_store=store).get_result(request)
+
+    assert (response.raw_response, response.parsed_output) == ('{"a": 1}', {"a": 1})
+    assert response.storage_tier == StorageTier.WARM.value
+
+
+async def test_result_missing_from_its_segment_is_returned_thin(tmp_path):
+    store = LocalArchiveStore(str(tmp_path))
+    request = request_with_result(
+        raw_response="", parsed_output=None, storage_tier=StorageTier.COLD
+    )
+    other = request_with_result(raw_response="", parsed_output=None, storage_tier=StorageTier.COLD)
+    request.result.archive_uri = await archive(store, other, {"raw_response": "x"})
+
+    response = await GenerationService(repo=None, archive_store=store).get_result(request)
+
+    assert (response.raw_response, response.parsed_output) == ("", None)
+
+
+async def test_request_without_result():
+    assert await GenerationService(repo=None).get_result(GenerationRequest()) is None
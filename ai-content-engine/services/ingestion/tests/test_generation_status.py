@@ -0,0 +1,107 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from shared.exceptions import NotFoundError
+from shared.models import GenerationStatus
+from ingestion.services.generation_service import GenerationService
+
+UPDATED = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+ORG, OTHER_ORG = uuid.uuid4(), uuid.uuid4()
+
+
+class FakeRepo:
+    """Requests keyed by id, each owned by ``ORG``."""
+
+    def __init__(self, statuses: dict[uuid.UUID, GenerationStatus]) -> None:
+        self.statuses = statuses
+        self.reads = 0
+
+    async def get_status(self, request_id, organization_id):
+        self.reads += 1
+        if request_id not in self.statuses or organization_id != ORG:
+            raise NotFoundError("Generation request", str(request_id))
+        return self.statuses[request_id], UPDATED
+
+
+class FakeStatusCache:
+    def __init__(self, entries: dict | None = None) -> None:
+        self.entries = entries or {}
+        self.fills: list[tuple] = []
+
+    async def get(self, request_id):
+        return self.entries.get(request_id)
+
+    async def fill(self, request_id, status, updated_at, organization_id) -> None:
+        self.fills.append((request_id, status, updated_at, organization_id))
+
+
+def entry(status: str, organization_id: uuid.UUID | None) -> dict:
+    return {
+        "status": status,
+        "updated_at": UPDATED.isoformat(),
+        "organization_id": str(organization_id) if organization_id else None,
+    }
+
+
+async def test_cached_status_of_the_callers_organization_skips_the_database():
+    request_id = uuid.uuid4()
+    repo = FakeRepo({})
+    cache = FakeStatusCache({request_id: entry("completed", ORG)})
+
+    status = await GenerationService(repo, status_cache=cache).get_status(request_id, ORG)
+
+    assert status == ("completed", UPDATED)
+    assert repo.reads == 0
+
+
+async def test_cached_status_of_another_organization_is_not_found():
+    request_id = uuid.uuid4()
+    repo = FakeRepo({request_id: GenerationStatus.COMPLETED})
+    cache = FakeStatusCache({request_id: entry("completed", ORG)})
+
+    with pytest.raises(NotFoundError):
+        await GenerationService(repo, status_cache=cache).get_status(request_id, OTHER_ORG)
+    assert repo.reads == 0
+
+
+async def test_entry_without_an_organization_is_checked_against_the_database():
+    request_id = uuid.uuid4()
+    repo = FakeRepo({request_id: GenerationStatus.FAILED})
+    cache = FakeStatusCache({request_id: entry("failed", None)})
+    service = GenerationService(repo, status_cache=cache)
+
+    with pytest.raises(NotFoundError):
+        await service.get_status(request_id, OTHER_ORG)
+    assert await service.get_status(request_id, ORG) == ("failed", UPDATED)
+    assert repo.reads == 2
+
+
+async def test_miss_reads_the_database_and_fills_with_the_organization():
+    request_id = uuid.uuid4()
+    cache = FakeStatusCache()
+    repo = FakeRepo({request_id: GenerationStatus.PROCESSING})
+    service = GenerationService(repo, status_cache=cache)
+
+    assert await service.get_status(request_id, ORG) == ("processing", UPDATED)
+    assert cache.fills == [(request_id, "processing", UPDATED, ORG)]
+
+
+async def test_requests_of_other_organizations_are_never_filled():
+    request_id = uuid.uuid4()
+    cache = FakeStatusCache()
+    repo = FakeRepo({request_id: GenerationStatus.PENDING})
+    service = GenerationService(repo, status_cache=cache)
+
+    with pytest.raises(NotFoundError):
+        await service.get_status(request_id, OTHER_ORG)
+    assert cache.fills == []
+
+
+async def test_without_a_cache_the_database_is_read():
+    request_id = uuid.uuid4()
+    repo = FakeRepo({request_id: GenerationStatus.COMPLETED})
+
+    assert await GenerationService(repo).get_status(request_id, ORG) == ("completed", UPDATED)
+    assert repo.reads == 1
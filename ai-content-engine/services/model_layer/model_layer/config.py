@@ -16,6 +16,11 @@ class ModelLayerSettings(BaseServiceSettings):
     default_model: str = "mock-model"
     circuit_breaker_threshold: int = 5
     circuit_breaker_timeout: int = 60
+    consumer_max_in_flight: int = 256
+    fair_scheduler_max_concurrency: int = 32
+    fair_scheduler_quantum_tokens: int = 4000
+    org_default_concurrency: int = 8
+    org_caps_refresh_seconds: int = 60
 
 
 settings = ModelLayerSettings()
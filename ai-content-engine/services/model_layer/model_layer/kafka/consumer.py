@@ -1,9 +1,22 @@
 """Kafka consumer for PromptAssembled events."""
 
+import time
+
 import structlog
 
+from shared.events import timing
 from shared.events.envelope import EventEnvelope
+from shared.kafka.lanes import lane_topic
 from shared.kafka.producer import AsyncKafkaProducer
+from shared.metrics import (
+    PROVIDER_COST_USD,
+    PROVIDER_FAILURES,
+    PROVIDER_REQUEST_SECONDS,
+    PROVIDER_TOKENS,
+)
+from shared.quotas import UsageMeter
+from shared.tracing import tracer
+from model_layer.services.fair_scheduler import FairScheduler, estimate_cost, org_key
 from model_layer.services.routing_service import RoutingService
 # Replace with actual provider factory
 from model_layer.providers.base import LLMProvider
@@ -19,18 +32,46 @@ class PromptAssembledPayload(BaseModel):
     system_prompt: str
     user_prompt: str
     priority: str = "normal"
+    organization_id: str | None = None
     options: dict = {}
     parameters: dict = {}
     schema_id: str | None = None
+    repair_attempts: int = 0
+
+class _ProviderMetrics:
+    __slots__ = ("seconds", "tokens", "cost", "failures")
+
+    def __init__(self, provider: str, model: str) -> None:
+        self.seconds = PROVIDER_REQUEST_SECONDS.labels(provider, model)
+        self.tokens = PROVIDER_TOKENS.labels(provider, model)
+        self.cost = PROVIDER_COST_USD.labels(provider, model)
+        self.failures = PROVIDER_FAILURES.labels(provider, model)
+
+_provider_metrics: dict[tuple[str, str], _ProviderMetrics] = {}
+
+def _metrics_for(provider: str, model: str) -> _ProviderMetrics:
+    metrics = _provider_metrics.get((provider, model))
+    if metrics is None:
+        metrics = _provider_metrics[(provider, model)] = _ProviderMetrics(provider, model)
+    return metrics
 
 async def handle_prompt_assembled(
     msg: dict, 
     producer: AsyncKafkaProducer, 
     router: RoutingService,
-    provider_registry: dict[str, LLMProvider]
+    provider_registry: dict[str, LLMProvider],
+    scheduler: FairScheduler | None = None,
+    usage_meter: UsageMeter | None = None,
 ) -> None:
-    """Handle PromptAssembled event, invoke LLM, publish GenerationComplete."""
+    """Handle PromptAssembled event, invoke LLM, publish GenerationComplete.
+
+    With a ``scheduler`` the provider call waits for its organization's fair
+    share of call slots instead of running in arrival order. With a
+    ``usage_meter`` the tokens used are counted against the organization's
+    token quotas and queued for the usage rollup.
+    """
     logger.info("received_prompt_assembled_event", event_id=msg.get("event_id"))
+    timings = timing.received(msg, timing.MODEL_RECEIVED)
     
     try:
         payload = PromptAssembledPayload.model_validate(msg.get("payload", {}))
@@ -55,21 +96,57 @@ async def handle_prompt_assembled(
             raise ValueError(f"Provider {provider_name} not found")
             
         full_prompt = f"{system_prompt}\n{user_prompt}"
+        metrics = _metrics_for(provider_name, model_id)
+
+        async def generate():
+            timing.stamp(timings, timing.INFERENCE_STARTED)
+            start = time.perf_counter()
+            with tracer.start_as_current_span(
+                "provider.generate",
+                attributes={"provider": provider_name, "model": model_id},
+            ) as span:
+                try:
+                    result = await provider.generate(
+                        model_id=model_id,
+                        prompt=full_prompt,
+                        parameters=payload.parameters
+                    )
+                except Exception:
+                    metrics.failures.inc()
+                    raise
+                finally:
+                    metrics.seconds.observe(time.perf_counter() - start)
+                    timing.stamp(timings, timing.INFERENCE_FINISHED)
+                span.set_attribute("tokens_used", result.tokens_used)
+            metrics.tokens.inc(result.tokens_used)
+            metrics.cost.inc(result.cost_estimated)
+            return result
+
+        if scheduler is None:
+            result = await generate()
+        else:
+            cost = estimate_cost(full_prompt, payload.parameters)
+            async with scheduler.slot(org_key(payload.organization_id), cost):
+                result = await generate()
         
-        result = await provider.generate(
-            model_id=model_id,
-            prompt=full_prompt,
-            parameters=payload.parameters
-        )
-        
+        if usage_meter is not None and payload.organization_id:
+            await usage_meter.record(
+                payload.organization_id, request_id, result.tokens_used, result.cost_estimated
+            )
+
         event_payload = {
             "request_id": request_id,
             "status": "success",
             "raw_response": result.raw_response,
-            "tokens_used": result.tokens_used,
-            "cost_estimated": result.cost_estimated,
+            "model_provider": provider_name,
+            "model_id": model_id,
+            "token_usage": {"total_tokens": result.tokens_used},
+            "cost_usd": result.cost_estimated,
             "schema_id": payload.schema_id,
-            "timing_ms": {"inference": 100} # Mock timing
+            "repair_attempts": payload.repair_attempts,
+            "priority": payload.priority,
+            "organization_id": payload.organization_id,
+            "timing_ms": {"inference": timing.stage_latencies(timings)["inference"]},
         }
         
     except Exception as e:
@@ -77,7 +154,9 @@ async def handle_prompt_assembled(
         event_payload = {
             "request_id": request_id,
             "status": "failed",
-            "error_message": str(e)
+            "error_message": str(e),
+            "priority": payload.priority,
+            "organization_id": payload.organization_id,
         }
 
     envelope = EventEnvelope(
@@ -85,10 +164,11 @@ async def handle_prompt_assembled(
         correlation_id=msg.get("correlation_id"),
         source_service="model_layer",
         payload=event_payload,
+        timings=timing.stamp(timings, timing.MODEL_PUBLISHED),
     )
 
     await producer.send(
-        GENERATION_COMPLETE_TOPIC,
+        lane_topic(GENERATION_COMPLETE_TOPIC, payload.priority),
         value=envelope.to_kafka_value(),
         key=envelope.kafka_key,
     )
@@ -0,0 +1,126 @@
+"""Model Layer application entry point."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator
+
+from fastapi import FastAPI
+from redis.asyncio import Redis
+import uvicorn
+
+from shared.admission import ConsumerLagReporter
+from shared.database import get_session_factory, init_database
+from shared.kafka import AsyncKafkaConsumer, AsyncKafkaProducer
+from shared.logging import setup_logging
+from shared.metrics import MetricsMiddleware, metrics_router
+from shared.middleware.correlation import CorrelationIDMiddleware
+from shared.middleware.error_handler import register_error_handlers
+from shared.quotas import UsageMeter
+from shared.tracing import setup_tracing, shutdown_tracing
+
+from model_layer.config import settings
+from model_layer.kafka.consumer import handle_prompt_assembled
+from model_layer.providers.base import LLMProvider
+from model_layer.services.fair_scheduler import ConcurrencyCapRefresher, FairScheduler
+from model_layer.services.routing_service import RoutingService
+
+
+producer: AsyncKafkaProducer | None = None
+# Provider clients register here under the names RoutingService selects
+provider_registry: dict[str, LLMProvider] = {}
+router = RoutingService(provider_registry)
+scheduler = FairScheduler(
+    max_concurrency=settings.fair_scheduler_max_concurrency,
+    quantum=settings.fair_scheduler_quantum_tokens,
+    default_org_concurrency=settings.org_default_concurrency,
+)
+usage_meter: UsageMeter | None = None
+
+
+async def handle_message(message: dict) -> None:
+    await handle_prompt_assembled(
+        message, producer, router, provider_registry, scheduler, usage_meter
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    global producer, usage_meter
+    setup_logging(
+        settings.service_name,
+        settings.log_level,
+        settings.environment,
+        message_sample_rate=settings.log_message_sample_rate,
+        queue_size=settings.log_queue_size,
+    )
+    setup_tracing(
+        settings.service_name,
+        settings.otel_exporter_otlp_endpoint,
+        settings.otel_trace_sample_ratio,
+    )
+    init_database(settings.database_url, **settings.database_engine_options())
+
+    producer = AsyncKafkaProducer(settings.kafka_bootstrap_servers)
+    await producer.start()
+    app.state.kafka_producer = producer
+    redis = Redis.from_url(settings.redis_url)
+    usage_meter = UsageMeter(redis)
+
+    # Handlers run concurrently and wait for their organization's share of
+    # provider call slots in the fair scheduler
+    consumer = AsyncKafkaConsumer(
+        topic=settings.input_topic,
+        bootstrap_servers=settings.kafka_bootstrap_servers,
+        group_id=settings.kafka_consumer_group,
+        handler=handle_message,
+        lane_weights=settings.kafka_lane_weights,
+        lane_starvation_ms=settings.kafka_lane_starvation_ms,
+        max_in_flight=settings.consumer_max_in_flight,
+    )
+    await consumer.start()
+    cap_refresher = ConcurrencyCapRefresher(get_session_factory(), scheduler)
+    lag_reporter = ConsumerLagReporter(
+        redis,
+        consumer,
+        settings.kafka_consumer_group,
+        interval_seconds=settings.pipeline_lag_report_interval_seconds,
+    )
+    background_tasks = [
+        asyncio.create_task(consumer.run()),
+        asyncio.create_task(cap_refresher.run_forever(settings.org_caps_refresh_seconds)),
+        asyncio.create_task(lag_reporter.run_forever()),
+    ]
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await redis.aclose()
+    await producer.stop()
+    shutdown_tracing()
+
+
+app = FastAPI(
+    title="AI Content Engine - Model Layer",
+    version="0.1.0",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CorrelationIDMiddleware, access_log_sample_rate=settings.access_log_sample_rate
+)
+app.add_middleware(MetricsMiddleware)
+register_error_handlers(app)
+
+from model_layer.api.v1 import health  # noqa: E402
+app.include_router(metrics_router)
+app.include_router(health.router, prefix="/api/v1", tags=["health"])
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=settings.host, port=settings.port)
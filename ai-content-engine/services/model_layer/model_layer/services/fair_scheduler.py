@@ -0,0 +1,212 @@
+"""Per-organization fair scheduling of provider calls.
+
+Consumed prompts wait in one queue per organization. Provider call slots are
+handed out by deficit round robin, with each request's cost being its
+estimated token count. Every organization is also capped on concurrent
+calls, so a tenant's burst can use only its share of the model layer.
+"""
+
+import asyncio
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.metrics import FAIR_SCHEDULER_QUEUED
+from shared.models.quota import Quota
+
+logger = structlog.get_logger(__name__)
+
+CONCURRENCY_QUOTA_TYPE = "concurrency"
+
+
+def estimate_cost(prompt: str, parameters: dict) -> int:
+    """Rough token cost of a call: about four characters per prompt token plus the output budget."""
+    return max(1, len(prompt) // 4 + int(parameters.get("max_tokens", 0) or 0))
+
+
+def org_key(organization_id: str | uuid.UUID | None) -> str:
+    """Scheduler key for an organization; requests without one share a single queue."""
+    return str(organization_id) if organization_id else ""
+
+
+@dataclass
+class _OrgQueue:
+    waiters: deque[tuple[int, asyncio.Future[None]]] = field(default_factory=deque)
+    deficit: int = 0
+    in_flight: int = 0
+    # Whether this visit's quantum has already been granted
+    visited: bool = False
+
+
+class FairScheduler:
+    """Deficit round robin over organizations for a pool of provider call slots.
+
+    ``slot(org, cost)`` waits until the organization's turn comes up and a
+    slot is free. On each visit an organization gets ``quantum`` tokens of
+    credit and is served while its next request fits in that credit.
+    Organizations already at their concurrency cap are skipped without
+    losing credit. Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        quantum: int = 4000,
+        default_org_concurrency: int = 8,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._quantum = quantum
+        self._default_org_concurrency = default_org_concurrency
+        self._caps: dict[str, int] = {}
+        self._orgs: dict[str, _OrgQueue] = {}
+        self._active: deque[str] = deque()
+        self._in_flight = 0
+
+    def set_caps(self, caps: dict[str, int]) -> None:
+        """Replace per-organization concurrency caps; others use the default."""
+        self._caps = dict(caps)
+        self._dispatch()
+
+    def cap(self, org: str) -> int:
+        return self._caps.get(org, self._default_org_concurrency)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Queue depth, in-flight calls and cap for every organization with work."""
+        return {
+            org: {"queued": len(state.waiters), "in_flight": state.in_flight, "cap": self.cap(org)}
+            for org, state in self._orgs.items()
+            if state.waiters or state.in_flight
+        }
+
+    @asynccontextmanager
+    async def slot(self, org: str, cost: int = 1) -> AsyncIterator[None]:
+        """Hold one provider call slot for ``org`` for the duration of the block."""
+        state = self._orgs.setdefault(org, _OrgQueue())
+        granted: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter = (cost, granted)
+        state.waiters.append(waiter)
+        if org not in self._active:
+            self._active.append(org)
+        self._dispatch()
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self._release(org)
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+                self._dispatch()
+            raise
+        try:
+            yield
+        finally:
+            self._release(org)
+
+    def _release(self, org: str) -> None:
+        state = self._orgs[org]
+        state.in_flight -= 1
+        self._in_flight -= 1
+        if not state.waiters and not state.in_flight and org not in self._active:
+            del self._orgs[org]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # ``blocked`` counts consecutive organizations skipped for being at
+        # their cap; once every active organization is blocked, stop
+        blocked = 0
+        while self._in_flight < self._max_concurrency and blocked < len(self._active):
+            org = self._active[0]
+            state = self._orgs.get(org)
+            if state is None or not state.waiters:
+                # Left behind by cancelled waiters
+                self._active.popleft()
+                if state is not None and not state.in_flight:
+                    del self._orgs[org]
+                elif state is not None:
+                    state.deficit = 0
+                    state.visited = False
+                continue
+            if state.in_flight >= self.cap(org):
+                self._active.rotate(-1)
+                state.visited = False
+                blocked += 1
+                continue
+            if not state.visited:
+                state.deficit += self._quantum
+                state.visited = True
+            cost, granted = state.waiters[0]
+            if cost > state.deficit:
+                # Credit carries over; the request fits after enough visits
+                self._active.rotate(-1)
+                state.visited = False
+                continue
+            state.waiters.popleft()
+            state.deficit -= cost
+            state.in_flight += 1
+            self._in_flight += 1
+            granted.set_result(None)
+            blocked = 0
+            if not state.waiters:
+                self._active.popleft()
+                state.deficit = 0
+                state.visited = False
+
+
+async def load_concurrency_caps(session: AsyncSession) -> dict[str, int]:
+    """Per-organization concurrency caps from ``Quota`` rows of type ``concurrency``."""
+    result = await session.execute(
+        select(Quota.organization_id, Quota.max_value).where(
+            Quota.quota_type == CONCURRENCY_QUOTA_TYPE
+        )
+    )
+    return {str(org_id): max_value for org_id, max_value in result.all()}
+
+
+class ConcurrencyCapRefresher:
+    """Periodically reloads caps from the quotas table and reports per-org queue depths."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        scheduler: FairScheduler,
+    ) -> None:
+        self._session_factory = session_factory
+        self._scheduler = scheduler
+        self._queued_orgs: set[str] = set()
+
+    async def run_once(self) -> None:
+        async with self._session_factory() as session:
+            caps = await load_concurrency_caps(session)
+        self._scheduler.set_caps(caps)
+        stats = self._scheduler.stats()
+        for org, s in stats.items():
+            FAIR_SCHEDULER_QUEUED.labels(org).set(s["queued"])
+        # Drop series for organizations with no scheduler state left
+        for org in self._queued_orgs - stats.keys():
+            FAIR_SCHEDULER_QUEUED.remove(org)
+        self._queued_orgs = set(stats)
+        logger.info(
+            "fair_scheduler_queues",
+            organizations=len(stats),
+            queued={org: s["queued"] for org, s in stats.items() if s["queued"]},
+            in_flight={org: s["in_flight"] for org, s in stats.items()},
+        )
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("concurrency_cap_refresh_failed")
+            await asyncio.sleep(interval_seconds)
@@ -9,6 +9,15 @@ from shared.models.generation import GenerationRequest, RequestPriority
 
 logger = structlog.get_logger(__name__)
 
+# Approximate blended USD cost per 1K tokens, used to pick the cheapest
+# available model for low-stakes calls such as output repair.
+MODEL_COSTS_PER_1K: dict[tuple[str, str], float] = {
+    ("anthropic", "claude-3-opus-20240229"): 0.045,
+    ("anthropic", "claude-3-5-sonnet-20240620"): 0.009,
+    ("anthropic", "claude-3-haiku-20240307"): 0.00075,
+    ("google", "gemini-1.5-flash"): 0.000375,
+}
+
 
 class RoutingService:
     """Intelligent Model Selection and Routing Engine."""
@@ -16,6 +25,11 @@ class RoutingService:
     def __init__(self, provider_registry: dict[str, Any]) -> None:
         self.registry = provider_registry
 
+    def select_cheapest_model(self) -> tuple[str, str] | None:
+        """Return the cheapest known model whose provider is registered, if any."""
+        available = [m for m in MODEL_COSTS_PER_1K if m[0] in self.registry]
+        return min(available, key=MODEL_COSTS_PER_1K.__getitem__) if available else None
+
     async def select_model(self, request: GenerationRequest) -> tuple[str, str]:
         """
         Determine the most appropriate LLM provider and model alias
@@ -26,6 +40,13 @@ class RoutingService:
         max_tokens = options.get("max_tokens", 500)
         priority = request.priority
 
+        # Output repair passes only fix syntax, so use the cheapest registered model
+        if options.get("repair", False):
+            cheapest = self.select_cheapest_model()
+            if cheapest is not None:
+                return cheapest
+            logger.warning("no_priced_model_registered_for_repair")
+
         # Simple thresholding logic based on PRD cost routing
         # Critical tasks (forced by config -> Opus)
         if priority == RequestPriority.HIGH:
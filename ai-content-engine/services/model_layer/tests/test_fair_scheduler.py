@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from model_layer.services.fair_scheduler import FairScheduler, estimate_cost, org_key
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class Calls:
+    """Issues requests through a scheduler and records the order slots are granted in."""
+
+    def __init__(self, scheduler: FairScheduler) -> None:
+        self.scheduler = scheduler
+        self.granted: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def submit(self, org: str, name: str, cost: int = 1) -> asyncio.Task:
+        async def call() -> None:
+            async with self.scheduler.slot(org, cost):
+                self.granted.append(name)
+                await self.release.wait()
+
+        return asyncio.create_task(call())
+
+
+async def hold(scheduler: FairScheduler, org: str = "blocker"):
+    """Take a slot directly so the test controls exactly when it is released."""
+    slot = scheduler.slot(org)
+    await slot.__aenter__()
+    return slot
+
+
+async def test_equal_costs_alternate_between_organizations():
+    scheduler = FairScheduler(max_concurrency=1, quantum=10)
+    calls = Calls(scheduler)
+    blocker = await hold(scheduler)
+    tasks = [calls.submit("a", f"a{i}", cost=10) for i in range(3)]
+    tasks += [calls.submit("b", f"b{i}", cost=10) for i in range(3)]
+    await settle()
+
+    await blocker.__aexit__(None, None, None)
+    await asyncio.gather(*tasks)
+
+    assert calls.granted == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+
+async def test_deficit_round_robin_shares_tokens_not_requests():
+    scheduler = FairScheduler(max_concurrency=1, quantum=10)
+    calls = Calls(scheduler)
+    blocker = await hold(scheduler)
+    tasks = [calls.submit("a", f"a{i}", cost=20) for i in range(3)]
+    tasks += [calls.submit("b", f"b{i}", cost=5) for i in range(8)]
+    await settle()
+
+    await blocker.__aexit__(None, None, None)
+    await asyncio.gather(*tasks)
+
+    # "a" waits two visits per request; both get 40 tokens while contended
+    assert calls.granted == ["b0", "b1", "a0", "b2", "b3", "b4", "b5", "a1", "b6", "b7", "a2"]
+    assert scheduler.stats() == {}
+
+
+async def test_organization_concurrency_cap():
+    scheduler = FairScheduler(max_concurrency=10, default_org_concurrency=2)
+    calls = Calls(scheduler)
+    calls.release.clear()
+    tasks = [calls.submit("a", f"a{i}") for i in range(5)] + [calls.submit("b", "b0")]
+    await settle()
+
+    assert sorted(calls.granted) == ["a0", "a1", "b0"]
+    assert scheduler.stats()["a"] == {"queued": 3, "in_flight": 2, "cap": 2}
+
+    scheduler.set_caps({"a": 4})
+    await settle()
+    assert sorted(calls.granted) == ["a0", "a1", "a2", "a3", "b0"]
+
+    calls.release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats() == {}
+
+
+async def test_capped_organization_does_not_block_others():
+    scheduler = FairScheduler(max_concurrency=2, default_org_concurrency=1)
+    calls = Calls(scheduler)
+    calls.release.clear()
+    tasks = [calls.submit("a", "a0"), calls.submit("a", "a1"), calls.submit("b", "b0")]
+    await settle()
+
+    assert calls.granted == ["a0", "b0"]
+
+    calls.release.set()
+    await asyncio.gather(*tasks)
+    assert calls.granted == ["a0", "b0", "a1"]
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = FairScheduler(max_concurrency=1)
+    calls = Calls(scheduler)
+    blocker = await hold(scheduler)
+    cancelled = calls.submit("a", "a0")
+    remaining = [calls.submit("a", "a1"), calls.submit("b", "b0")]
+    await settle()
+
+    cancelled.cancel()
+    await settle()
+    assert scheduler.stats()["a"]["queued"] == 1
+
+    await blocker.__aexit__(None, None, None)
+    await asyncio.gather(*remaining)
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert sorted(calls.granted) == ["a1", "b0"]
+    assert scheduler.stats() == {}
+
+
+async def test_cancellation_after_grant_releases_the_slot():
+    scheduler = FairScheduler(max_concurrency=1)
+    calls = Calls(scheduler)
+    blocker = await hold(scheduler)
+    granted_then_cancelled = calls.submit("a", "a0")
+    waiting = calls.submit("b", "b0")
+    await settle()
+
+    # The slot is handed to "a0" on release; cancel it before it can run
+    await blocker.__aexit__(None, None, None)
+    granted_then_cancelled.cancel()
+    await asyncio.gather(waiting)
+
+    assert calls.granted == ["b0"]
+    assert scheduler.stats() == {}
+    async with scheduler.slot("c"):
+        assert scheduler.stats()["c"]["in_flight"] == 1
+
+
+def test_estimate_cost_and_org_key():
+    assert estimate_cost("x" * 400, {"max_tokens": 50}) == 150
+    assert estimate_cost("", {"max_tokens": None}) == 1
+    assert org_key(None) == ""
+    assert org_key("org") == "org"
@@ -0,0 +1,27 @@
+from shared.models.generation import GenerationRequest, RequestPriority
+from model_layer.services.routing_service import RoutingService
+
+
+def repair_request(priority: RequestPriority = RequestPriority.NORMAL) -> GenerationRequest:
+    return GenerationRequest(priority=priority, options={"repair": True})
+
+
+async def test_repair_uses_cheapest_registered_model():
+    router = RoutingService({"anthropic": object(), "google": object()})
+    assert await router.select_model(repair_request()) == ("google", "gemini-1.5-flash")
+
+    router = RoutingService({"anthropic": object()})
+    assert await router.select_model(repair_request()) == (
+        "anthropic",
+        "claude-3-haiku-20240307",
+    )
+
+
+async def test_repair_without_a_priced_provider_falls_back_to_normal_routing():
+    router = RoutingService({"openai": object()})
+
+    assert router.select_cheapest_model() is None
+    assert await router.select_model(repair_request(RequestPriority.HIGH)) == (
+        "anthropic",
+        "claude-3-opus-20240229",
+    )
@@ -0,0 +1,20 @@
+"""Output validation service configuration."""
+
+from shared.config import BaseServiceSettings
+
+
+class OutputValidationSettings(BaseServiceSettings):
+    service_name: str = "output_validation"
+    kafka_consumer_group: str = "output-validation-group"
+    input_topic: str = "content.generation.complete"
+    output_topic: str = "content.validation.complete"
+    repair_topic: str = "content.prompt.assembled"
+    host: str = "0.0.0.0"
+    port: int = 8004
+    repair_budget: int = 2
+    repair_fragment_max_chars: int = 4000
+    # How long a loaded OutputSchema (and its compiled rules) is reused
+    schema_cache_seconds: float = 60.0
+
+
+settings = OutputValidationSettings()
@@ -1,24 +1,103 @@
 import structlog
+from shared.events import timing
 from shared.events.envelope import EventEnvelope
+from shared.kafka.lanes import lane_topic
 from shared.kafka.producer import AsyncKafkaProducer
-from output_validation.services.validation_service import ValidationService
+from shared.metrics import VALIDATION_OUTCOMES
+from shared.tracing import tracer
+from output_validation.config import settings
+from output_validation.services.repair import build_repair_prompt
+from output_validation.services.validation_service import OutputValidationError, ValidationService
 
 from pydantic import BaseModel
 
 logger = structlog.get_logger(__name__)
 
 VALIDATION_COMPLETE_TOPIC = "content.validation.complete"
+REPAIR_REQUEST_TOPIC = settings.repair_topic
+REPAIRABLE_STAGES = frozenset({"parse", "schema"})
+
+_passed = VALIDATION_OUTCOMES.labels("passed")
+_failed = VALIDATION_OUTCOMES.labels("failed")
+_repair_requested = VALIDATION_OUTCOMES.labels("repair_requested")
 
 class GenerationCompletePayload(BaseModel):
     request_id: str
     raw_response: str
     schema_id: str | None = None
     timing_ms: dict | None = None
+    repair_attempts: int = 0
+    priority: str = "normal"
+    organization_id: str | None = None
+    model_provider: str | None = None
+    model_id: str | None = None
+    token_usage: dict | None = None
+    cost_usd: float | None = None
+
+def _generation_fields(payload: GenerationCompletePayload) -> dict:
+    """Fields of the generation carried through to the stored result."""
+    return {
+        "organization_id": payload.organization_id,
+        "model_provider": payload.model_provider,
+        "model_id": payload.model_id,
+        "token_usage": payload.token_usage or {},
+        "cost_usd": payload.cost_usd or 0.0,
+    }
+
+async def request_repair(
+    msg: dict,
+    producer: AsyncKafkaProducer,
+    validator: ValidationService,
+    payload: GenerationCompletePayload,
+    error: OutputValidationError,
+) -> None:
+    """Send the invalid fragment and its errors back to the model layer for repair."""
+    system_prompt, user_prompt = build_repair_prompt(
+        error.fragment,
+        error.errors,
+        validator.get_schema(payload.schema_id),
+        max_chars=settings.repair_fragment_max_chars,
+    )
+    envelope = EventEnvelope(
+        event_type="prompt.assembled",
+        correlation_id=msg.get("correlation_id"),
+        source_service="output_validation",
+        payload={
+            "request_id": payload.request_id,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "options": {"repair": True},
+            "parameters": {"temperature": 0, "max_tokens": len(error.fragment) // 3 + 256},
+            "schema_id": payload.schema_id,
+            "repair_attempts": payload.repair_attempts + 1,
+            "priority": payload.priority,
+            "organization_id": payload.organization_id,
+        },
+        # The repair prompt re-enters the model queue: the repeated stages are re-timed from here
+        timings=timing.repair_requested(msg),
+    )
+    await producer.send(
+        lane_topic(REPAIR_REQUEST_TOPIC, payload.priority),
+        value=envelope.to_kafka_value(),
+        key=envelope.kafka_key,
+    )
+    logger.info(
+        "output_repair_requested",
+        request_id=payload.request_id,
+        stage=error.stage,
+        attempt=payload.repair_attempts + 1,
+    )
 
-async def handle_generation_complete(msg: dict, producer: AsyncKafkaProducer, validator: ValidationService) -> None:
+async def handle_generation_complete(
+    msg: dict,
+    producer: AsyncKafkaProducer,
+    validator: ValidationService,
+    repair_budget: int = settings.repair_budget,
+) -> None:
     """Handle incoming GenerationComplete events, run validation, and publish ValidationComplete."""
     logger.info("received_generation_complete_event", event_id=msg.get("event_id"))
-    
+    timings = timing.received(msg, timing.VALIDATION_RECEIVED)
+
     try:
         # Schema Validation Boundary Layer
         payload = GenerationCompletePayload.model_validate(msg.get("payload", {}))
@@ -31,16 +110,48 @@ async def handle_generation_complete(msg: dict, producer: AsyncKafkaProducer, va
 
     try:
         # Step 1 & 2: Parse and Validate
-        parsed_data = await validator.validate_output(raw_response, schema_id)
-        
+        with tracer.start_as_current_span(
+            "output.validate", attributes={"schema.id": schema_id or ""}
+        ):
+            # Truncated output goes to a repair round while the budget allows
+            parsed_data, validation_results = await validator.validate_output(
+                raw_response, schema_id, allow_truncated=payload.repair_attempts >= repair_budget
+            )
+
         # Step 3: Publish ValidationComplete Success
         event_payload = {
             "request_id": request_id,
             "status": "success",
             "parsed_output": parsed_data,
+            "validation_results": validation_results,
             "raw_response": raw_response,
-            "timing_ms": payload.timing_ms or {}
+            "timing_ms": payload.timing_ms or {},
+            **_generation_fields(payload),
         }
+        _passed.inc()
+    except OutputValidationError as e:
+        if e.stage in REPAIRABLE_STAGES and payload.repair_attempts < repair_budget:
+            await request_repair(msg, producer, validator, payload, e)
+            _repair_requested.inc()
+            return
+        logger.error(
+            "validation_failed",
+            error=str(e),
+            stage=e.stage,
+            request_id=request_id,
+            repair_attempts=payload.repair_attempts,
+        )
+        event_payload = {
+            "request_id": request_id,
+            "status": "failed",
+            "error_message": str(e),
+            "errors": e.errors,
+            "stage": e.stage,
+            "validation_results": e.validation_results,
+            "raw_response": raw_response,
+            **_generation_fields(payload),
+        }
+        _failed.inc()
     except Exception as e:
         logger.error("validation_failed", error=str(e), request_id=request_id)
         # Step 3: Publish ValidationComplete Error
@@ -48,14 +159,17 @@ async def handle_generation_complete(msg: dict, producer: AsyncKafkaProducer, va
             "request_id": request_id,
             "status": "failed",
             "error_message": str(e),
-            "raw_response": raw_response
+            "raw_response": raw_response,
+            **_generation_fields(payload),
         }
+        _failed.inc()
 
     envelope = EventEnvelope(
         event_type="validation.complete",
         correlation_id=msg.get("correlation_id"),
         source_service="output_validation",
         payload=event_payload,
+        timings=timing.stamp(timings, timing.VALIDATION_PUBLISHED),
     )
 
     await producer.send(
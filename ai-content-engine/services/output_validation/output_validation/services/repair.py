@@ -0,0 +1,147 @@
+"""Output repair: deterministic local fixes and repair-model prompts."""
+
+import json
+import re
+from typing import Any, NamedTuple
+
+_DECODER = json.JSONDecoder()
+_UNQUOTED_KEY = re.compile(r"([{,]\s*)([A-Za-z_][A-Za-z0-9_\-]*)(\s*:)")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERAL = re.compile(r"\b(True|False|None)\b")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+REPAIR_SYSTEM_PROMPT = (
+    "You repair malformed JSON. Return only the corrected JSON document, "
+    "with no commentary and no markdown fences. Preserve all content; change "
+    "only what is required to make it valid and conform to the schema."
+)
+
+
+def _scan(text: str) -> tuple[list[tuple[bool, str]], bool]:
+    """Split text into (is_string, chunk) segments.
+
+    Returns the segments and whether the final string literal is unterminated.
+    """
+    segments: list[tuple[bool, str]] = []
+    buf: list[str] = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            buf.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                segments.append((True, "".join(buf)))
+                buf = []
+                in_string = False
+        elif ch == '"':
+            if buf:
+                segments.append((False, "".join(buf)))
+            buf = ['"']
+            in_string = True
+        else:
+            buf.append(ch)
+    if buf:
+        segments.append((in_string, "".join(buf)))
+    return segments, in_string
+
+
+def _fix_code(chunk: str) -> str:
+    chunk = _UNQUOTED_KEY.sub(r'\1"\2"\3', chunk)
+    chunk = _TRAILING_COMMA.sub(r"\1", chunk)
+    return _PY_LITERAL.sub(lambda m: _PY_LITERALS[m.group(1)], chunk)
+
+
+def _close(text: str) -> str:
+    """Append the closers needed to balance any open objects or arrays."""
+    segments, _ = _scan(text)
+    stack: list[str] = []
+    for is_string, chunk in segments:
+        if is_string:
+            continue
+        for ch in chunk:
+            if ch in _CLOSERS:
+                stack.append(ch)
+            elif stack and ch == _CLOSERS[stack[-1]]:
+                stack.pop()
+    return text + "".join(_CLOSERS[c] for c in reversed(stack))
+
+
+class RepairedJSON(NamedTuple):
+    value: Any
+    # The input was cut off: containers or a string were closed, and an
+    # incomplete trailing element may have been dropped or completed with null
+    truncated: bool
+
+
+def _candidates(base: str) -> list[str]:
+    candidates = [_close(base)]
+    cut = base.rfind(",")
+    if cut > 0:
+        # Drop the last, incomplete element of a truncated container.
+        candidates.append(_close(base[:cut]))
+    candidates.append(_close(base + (" null" if base.endswith(":") else ": null")))
+    return candidates
+
+
+def repair_json(raw_text: str) -> RepairedJSON:
+    """Apply deterministic local repairs and return the parsed value.
+
+    Handles leading/trailing prose, trailing commas, unquoted keys, Python
+    literals and truncated output (unterminated strings and missing closers).
+    Repairing truncated output can discard its incomplete tail, so such
+    results are flagged ``truncated``. Raises ValueError when no repair
+    yields valid JSON.
+    """
+    starts = [i for i in (raw_text.find("{"), raw_text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON object or array found in response")
+    text = raw_text[min(starts):]
+
+    try:
+        return RepairedJSON(_DECODER.raw_decode(text)[0], truncated=False)
+    except json.JSONDecodeError:
+        pass
+
+    segments, unterminated = _scan(text)
+    if unterminated:
+        tail = segments[-1][1]
+        if tail.endswith("\\") and not tail.endswith("\\\\"):
+            tail = tail[:-1]
+        segments[-1] = (True, tail + '"')
+    fixed = "".join(chunk if is_string else _fix_code(chunk) for is_string, chunk in segments)
+    base = fixed.rstrip().rstrip(",").rstrip()
+
+    for index, candidate in enumerate(_candidates(base)):
+        try:
+            value = _DECODER.raw_decode(candidate)[0]
+        except json.JSONDecodeError:
+            continue
+        return RepairedJSON(value, truncated=unterminated or index > 0 or candidate != base)
+    raise ValueError("Local JSON repair failed")
+
+
+def build_repair_prompt(
+    fragment: str,
+    errors: list[dict[str, Any]],
+    schema: dict[str, Any] | None = None,
+    max_chars: int = 4000,
+) -> tuple[str, str]:
+    """Build a minimal (system, user) prompt asking a model to fix invalid output.
+
+    Only the invalid fragment, the validation errors and the target schema are
+    sent, keeping the repair call far cheaper than the original generation.
+    """
+    if len(fragment) > max_chars:
+        fragment = fragment[:max_chars]
+    parts = ["Invalid JSON:", fragment, "", "Errors:"]
+    parts.extend(
+        f"- {e.get('path') or '$'}: {e.get('message', '')}" for e in errors
+    )
+    if schema:
+        parts.extend(["", "Schema:", json.dumps(schema, separators=(",", ":"))])
+    return REPAIR_SYSTEM_PROMPT, "\n".join(parts)
@@ -0,0 +1,224 @@
+"""Declarative rule engine for semantic and quality validation.
+
+Rules are stored as data on ``OutputSchema.semantic_rules`` / ``quality_rules``
+and compiled once into a list of predicate closures. No user-supplied code is
+ever executed; only the operators below are available::
+
+    {
+        "fail_fast": true,
+        "rules": [
+            {"name": "price_positive", "field": "price", "op": "gt", "value": 0},
+            {"name": "dates_ordered", "field": "start", "op": "lt", "other_field": "end"},
+            {"name": "sku_format", "field": "sku", "op": "regex", "value": "^[A-Z]{3}-\\\\d+$"},
+            {"name": "title_length", "field": "title", "op": "length", "min": 10, "max": 120},
+            {"name": "tag_count", "field": "tags", "op": "count", "min": 1, "max": 10},
+            {"name": "body_words", "field": "body", "op": "word_count", "min": 50,
+             "severity": "warning"}
+        ]
+    }
+"""
+
+import operator
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+_MISSING = object()
+
+_COMPARATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "in": lambda a, b: a in b,
+    "not_in": lambda a, b: a not in b,
+}
+_MEASURES: dict[str, Callable[[Any], int]] = {
+    "length": len,
+    "count": len,
+    "word_count": lambda v: len(v.split()),
+}
+
+Predicate = Callable[[Any], str | None]
+
+
+class RuleCompileError(ValueError):
+    """Raised when a rule definition is malformed or uses an unknown operator."""
+
+
+def _compile_path(path: str) -> Callable[[Any], Any]:
+    keys: tuple[str | int, ...] = tuple(
+        int(part) if part.isdigit() else part for part in path.split(".")
+    )
+
+    def get(data: Any) -> Any:
+        for key in keys:
+            try:
+                data = data[key]
+            except (KeyError, IndexError, TypeError):
+                return _MISSING
+        return data
+
+    return get
+
+
+def _compile_predicate(rule: dict[str, Any]) -> Predicate:
+    op = rule.get("op")
+    field = rule.get("field")
+    if not field:
+        raise RuleCompileError(f"Rule {rule.get('name')!r} has no field")
+    get = _compile_path(field)
+    optional = bool(rule.get("optional", False))
+
+    if op == "required":
+        return lambda data: f"{field} is required" if get(data) is _MISSING else None
+
+    if op in _COMPARATORS:
+        compare = _COMPARATORS[op]
+        if "other_field" in rule:
+            other_path = rule["other_field"]
+            get_other = _compile_path(other_path)
+
+            def check(data: Any) -> str | None:
+                value, other = get(data), get_other(data)
+                if value is _MISSING or other is _MISSING:
+                    return None if optional else f"{field} or {other_path} is missing"
+                try:
+                    ok = compare(value, other)
+                except TypeError:
+                    ok = False
+                return None if ok else f"{field} {op} {other_path} failed"
+
+            return check
+        if "value" not in rule:
+            raise RuleCompileError(f"Rule {rule.get('name')!r} needs 'value' or 'other_field'")
+        expected = rule["value"]
+        if op in ("in", "not_in"):
+            expected = frozenset(expected) if all(
+                isinstance(v, str | int | float | bool) for v in expected
+            ) else list(expected)
+
+        def check(data: Any) -> str | None:
+            value = get(data)
+            if value is _MISSING:
+                return None if optional else f"{field} is missing"
+            try:
+                ok = compare(value, expected)
+            except TypeError:
+                ok = False
+            return None if ok else f"{field} {op} {rule['value']!r} failed"
+
+        return check
+
+    if op == "regex":
+        try:
+            pattern = re.compile(rule["value"])
+        except (KeyError, re.error) as e:
+            raise RuleCompileError(f"Rule {rule.get('name')!r} has an invalid regex: {e}") from e
+
+        def check(data: Any) -> str | None:
+            value = get(data)
+            if value is _MISSING:
+                return None if optional else f"{field} is missing"
+            if isinstance(value, str) and pattern.search(value):
+                return None
+            return f"{field} does not match {pattern.pattern!r}"
+
+        return check
+
+    if op in _MEASURES:
+        measure = _MEASURES[op]
+        low = rule.get("min")
+        high = rule.get("max")
+        if low is None and high is None:
+            raise RuleCompileError(f"Rule {rule.get('name')!r} needs 'min' and/or 'max'")
+
+        def check(data: Any) -> str | None:
+            value = get(data)
+            if value is _MISSING:
+                return None if optional else f"{field} is missing"
+            try:
+                size = measure(value)
+            except (TypeError, AttributeError):
+                return f"{field} has no {op}"
+            if (low is not None and size < low) or (high is not None and size > high):
+                return f"{field} {op} {size} outside [{low}, {high}]"
+            return None
+
+        return check
+
+    raise RuleCompileError(f"Unknown rule operator {op!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    name: str
+    severity: str
+    predicate: Predicate
+
+
+class RuleProgram:
+    """A compiled, reusable set of rules for one validation stage."""
+
+    def __init__(self, stage: str, rules: list[CompiledRule], fail_fast: bool = True) -> None:
+        self.stage = stage
+        self.rules = rules
+        self.fail_fast = fail_fast
+
+    def evaluate(self, data: Any) -> dict[str, Any]:
+        """Run all rules against data and return the stage trace.
+
+        With ``fail_fast`` the program stops at the first failing error-severity
+        rule; warnings are recorded but never stop evaluation.
+        """
+        started = time.perf_counter_ns()
+        trace: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for rule in self.rules:
+            rule_started = time.perf_counter_ns()
+            message = rule.predicate(data)
+            entry: dict[str, Any] = {
+                "name": rule.name,
+                "passed": message is None,
+                "duration_us": (time.perf_counter_ns() - rule_started) // 1000,
+            }
+            trace.append(entry)
+            if message is None:
+                continue
+            entry["message"] = message
+            entry["severity"] = rule.severity
+            if rule.severity == "error":
+                errors.append({"path": rule.name, "message": message})
+                if self.fail_fast:
+                    break
+        return {
+            "passed": not errors,
+            "duration_us": (time.perf_counter_ns() - started) // 1000,
+            "rules": trace,
+            "errors": errors,
+        }
+
+
+def compile_rules(
+    stage: str, definition: dict[str, Any] | None, default_severity: str = "error"
+) -> RuleProgram | None:
+    """Compile a stored rule definition into a RuleProgram, or None if empty."""
+    if not definition or not definition.get("rules"):
+        return None
+    compiled = []
+    for i, rule in enumerate(definition["rules"]):
+        severity = rule.get("severity", default_severity)
+        if severity not in ("error", "warning"):
+            raise RuleCompileError(f"Rule {i} has invalid severity {severity!r}")
+        compiled.append(
+            CompiledRule(
+                name=rule.get("name") or f"{stage}_{i}",
+                severity=severity,
+                predicate=_compile_predicate(rule),
+            )
+        )
+    return RuleProgram(stage, compiled, fail_fast=definition.get("fail_fast", True))
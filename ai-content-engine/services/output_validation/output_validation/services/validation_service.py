@@ -2,20 +2,68 @@
 
 import json
 import re
+import time
+import uuid
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-logger = structlog.get_logger(__name__)
+from shared.models.schema import OutputSchema
+from shared.utils.cache import TTLCache
+
+from output_validation.services.repair import repair_json
+from output_validation.services.rule_engine import RuleProgram, compile_rules
 
+logger = structlog.get_logger(__name__)
 
-def extract_json(raw_text: str) -> dict[str, Any]:
-    """Pass 1 and 2: Direct Parsing and Regex Markdown Extraction."""
+# Parsed model output: the top level must be an object or an array
+JSONDocument = dict[str, Any] | list[Any]
+
+
+class OutputValidationError(ValueError):
+    """Raised when LLM output cannot be parsed or fails a validation stage."""
+
+    def __init__(
+        self,
+        message: str,
+        stage: str,
+        errors: list[dict[str, Any]] | None = None,
+        fragment: str = "",
+        validation_results: dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.stage = stage
+        self.errors = errors or []
+        self.fragment = fragment
+        self.validation_results = validation_results
+
+
+def _document(value: Any, fragment: str) -> JSONDocument:
+    if not isinstance(value, (dict, list)):
+        raise OutputValidationError(
+            "LLM response is not a JSON object or array",
+            stage="parse",
+            errors=[
+                {"path": "$", "message": f"expected an object or array, got {type(value).__name__}"}
+            ],
+            fragment=fragment,
+        )
+    return value
+
+
+def extract_json(raw_text: str) -> tuple[JSONDocument, bool]:
+    """Pass 1 and 2: Direct Parsing and Regex Markdown Extraction, then local repair.
+
+    Returns the document and whether it was repaired from truncated output,
+    in which case an incomplete trailing part may have been discarded.
+    """
     try:
         # Pass 1: Direct JSON parsing
-        return json.loads(raw_text)
+        return _document(json.loads(raw_text), raw_text), False
     except json.JSONDecodeError:
         logger.debug("direct_json_parse_failed, trying_regex")
 
@@ -23,44 +71,178 @@ def extract_json(raw_text: str) -> dict[str, Any]:
     match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", raw_text)
     if match:
         try:
-            return json.loads(match.group(1))
+            return _document(json.loads(match.group(1)), match.group(1)), False
         except json.JSONDecodeError:
             pass
 
-    # Pass 3: In an actual implementation, issue a 'Repair Model Invocation'
-    raise ValueError("Failed to extract valid JSON from LLM response")
+    # Pass 3: Deterministic local repair. When this fails the consumer
+    # escalates to a budgeted repair-model invocation.
+    fragment = match.group(1) if match else raw_text
+    try:
+        repaired = repair_json(fragment)
+    except ValueError as e:
+        raise OutputValidationError(
+            "Failed to extract valid JSON from LLM response",
+            stage="parse",
+            errors=[{"path": "$", "message": str(e)}],
+            fragment=fragment,
+        ) from e
+    return _document(repaired.value, fragment), repaired.truncated
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    schema: dict[str, Any]
+    validator: Validator
+    programs: list[RuleProgram]
+
+
+def compile_schema(
+    schema_def: dict[str, Any],
+    semantic_rules: dict[str, Any] | None = None,
+    quality_rules: dict[str, Any] | None = None,
+) -> CompiledSchema:
+    """Compile a JSON schema's validator and its semantic and quality rule programs."""
+    programs = [
+        program
+        for program in (
+            compile_rules("semantic", semantic_rules, default_severity="error"),
+            compile_rules("quality", quality_rules, default_severity="warning"),
+        )
+        if program is not None
+    ]
+    return CompiledSchema(schema_def, validator_for(schema_def)(schema_def), programs)
 
 
 class ValidationService:
-    """Service to validate structured data against JSON schemas and semantic rules."""
-
-    def __init__(self) -> None:
-        # Simulating external schema registry retrieval
-        self.schemas: dict[str, dict[str, Any]] = {}
-
-    def register_schema(self, schema_id: str, schema_def: dict[str, Any]) -> None:
-        self.schemas[schema_id] = schema_def
-
-    async def validate_output(self, raw_output: str, schema_id: str | None) -> dict[str, Any]:
-        """Parse raw text to structured format and validate against registered rules."""
-        parsed_data = extract_json(raw_output)
+    """Service to validate structured data against JSON schemas and semantic rules.
+
+    Schemas are resolved by ``schema_id``: first among those registered in
+    process, then from the ``output_schemas`` table when a session factory
+    is given. Loaded schemas are compiled once and cached for
+    ``cache_ttl_seconds``, so edits take effect after at most that long;
+    unknown ids are cached too.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        cache_ttl_seconds: float = 60.0,
+        cache_max_size: int = 1024,
+    ) -> None:
+        self._session_factory = session_factory
+        self._registered: dict[str, CompiledSchema] = {}
+        self._loaded: TTLCache[CompiledSchema] = TTLCache(
+            cache_ttl_seconds, max_size=cache_max_size, name="output_schemas"
+        )
+        self._unknown: TTLCache[bool] = TTLCache(cache_ttl_seconds, max_size=cache_max_size)
+
+    def register_schema(
+        self,
+        schema_id: str,
+        schema_def: dict[str, Any],
+        semantic_rules: dict[str, Any] | None = None,
+        quality_rules: dict[str, Any] | None = None,
+    ) -> None:
+        """Register a schema, compiling its validator and rule programs once."""
+        self._registered[schema_id] = compile_schema(schema_def, semantic_rules, quality_rules)
+
+    def get_schema(self, schema_id: str | None) -> dict[str, Any] | None:
+        """The JSON schema for ``schema_id`` if it is registered or cached."""
+        if not schema_id:
+            return None
+        compiled = self._registered.get(schema_id) or self._loaded.get(schema_id)
+        return compiled.schema if compiled is not None else None
+
+    async def resolve_schema(self, schema_id: str) -> CompiledSchema | None:
+        """The compiled schema for ``schema_id``, loading it from the database on a miss."""
+        compiled = self._registered.get(schema_id) or self._loaded.get(schema_id)
+        if compiled is not None or self._session_factory is None or self._unknown.get(schema_id):
+            return compiled
+        try:
+            key = uuid.UUID(schema_id)
+        except ValueError:
+            row = None
+        else:
+            async with self._session_factory() as session:
+                row = await session.get(OutputSchema, key)
+        if row is None or row.deleted_at is not None:
+            self._unknown.set(schema_id, True)
+            return None
+        compiled = compile_schema(row.json_schema, row.semantic_rules, row.quality_rules)
+        self._loaded.set(schema_id, compiled)
+        logger.info("output_schema_loaded", schema_id=schema_id, version=row.version)
+        return compiled
+
+    async def validate_output(
+        self, raw_output: str, schema_id: str | None, allow_truncated: bool = True
+    ) -> tuple[JSONDocument, dict[str, Any]]:
+        """Parse raw text and validate it against registered rules.
+
+        Returns the parsed output and the per-stage validation trace stored in
+        ``GenerationResult.validation_results``. Output repaired from a
+        truncated response is marked ``truncated`` in the trace's ``parse``
+        stage; unless ``allow_truncated``, it is rejected as a parse failure
+        instead so it can go to a repair round.
+        """
+        parsed_data, truncated = extract_json(raw_output)
+        stages: dict[str, Any] = {}
+        if truncated:
+            if not allow_truncated:
+                raise OutputValidationError(
+                    "LLM response was truncated",
+                    stage="parse",
+                    errors=[{"path": "$", "message": "output was cut off before its end"}],
+                    fragment=raw_output,
+                )
+            logger.warning("truncated_output_accepted", schema_id=schema_id)
+            stages["parse"] = {"passed": True, "truncated": True}
 
         if not schema_id:
             # Flexible validation if no explicit schema provided
-            return parsed_data
+            return parsed_data, {"status": "passed", "stages": stages}
 
-        schema = self.schemas.get(schema_id)
-        if not schema:
+        compiled = await self.resolve_schema(schema_id)
+        if compiled is None:
             logger.warning("schema_not_found", schema_id=schema_id)
-            return parsed_data
-
-        try:
-            # Stage 1 - Syntactic Validation
-            validate(instance=parsed_data, schema=schema)
-            # Future: Stage 2 - Semantic Validation (custom Javascript evaluation sandbox)
-            # Future: Stage 3 - Quality Validation
-            return parsed_data
-        except ValidationError as e:
-            logger.error("output_validation_failed", error=str(e))
-            raise ValueError(f"Output failed syntactic validation: {e.message}") from e
-
+            return parsed_data, {"status": "passed", "stages": stages}
+
+        # Stage 1 - Syntactic Validation
+        started = time.perf_counter_ns()
+        errors = [
+            {"path": e.json_path, "message": e.message}
+            for e in compiled.validator.iter_errors(parsed_data)
+        ]
+        stages["syntactic"] = {
+            "passed": not errors,
+            "duration_us": (time.perf_counter_ns() - started) // 1000,
+            "errors": errors,
+        }
+        if errors:
+            logger.error("output_validation_failed", error_count=len(errors))
+            raise OutputValidationError(
+                f"Output failed syntactic validation: {errors[0]['message']}",
+                stage="schema",
+                errors=errors,
+                fragment=json.dumps(parsed_data),
+                validation_results={"status": "failed", "stages": stages},
+            )
+
+        # Stage 2 - Semantic Validation, Stage 3 - Quality Validation
+        for program in compiled.programs:
+            trace = program.evaluate(parsed_data)
+            stages[program.stage] = trace
+            if not trace["passed"]:
+                logger.error(
+                    "output_validation_failed",
+                    stage=program.stage,
+                    error_count=len(trace["errors"]),
+                )
+                raise OutputValidationError(
+                    f"Output failed {program.stage} validation: {trace['errors'][0]['message']}",
+                    stage=program.stage,
+                    errors=trace["errors"],
+                    fragment=json.dumps(parsed_data),
+                    validation_results={"status": "failed", "stages": stages},
+                )
+        return parsed_data, {"status": "passed", "stages": stages}
@@ -0,0 +1,62 @@
+import pytest
+
+from output_validation.services.repair import build_repair_prompt, repair_json
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ('Sure! {"a": 1} hope this helps', {"a": 1}),
+        ('```json\n[1, 2]\n```', [1, 2]),
+        ('{"a": 1,}', {"a": 1}),
+        ("{a: True, b: None, c: [1, 2,],}", {"a": True, "b": None, "c": [1, 2]}),
+        ('{"a": "say \\"hi\\" {not: json,}"}', {"a": 'say "hi" {not: json,}'}),
+    ],
+)
+def test_repairs_complete_output(raw, expected):
+    repaired = repair_json(raw)
+    assert repaired.value == expected
+    assert not repaired.truncated
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ('{"title": "Hello wor', {"title": "Hello wor"}),
+        ('{"tags": ["a", "b", "c', {"tags": ["a", "b", "c"]}),
+        ('{"a": {"b": [1, 2', {"a": {"b": [1, 2]}}),
+        ('{"a": "x\\', {"a": "x"}),
+        ("[1, 2, 3", [1, 2, 3]),
+    ],
+)
+def test_closes_truncated_output(raw, expected):
+    repaired = repair_json(raw)
+    assert repaired.value == expected
+    assert repaired.truncated
+
+
+@pytest.mark.parametrize("raw", ['{"a": 1, "b":', '{"a": 1, "b"'])
+def test_drops_incomplete_trailing_member(raw):
+    repaired = repair_json(raw)
+    assert repaired.value == {"a": 1}
+    assert repaired.truncated
+
+
+@pytest.mark.parametrize("raw", ["no json here", "", '{"a": 1 "b": 2}'])
+def test_unrepairable_output_raises(raw):
+    with pytest.raises(ValueError):
+        repair_json(raw)
+
+
+def test_repair_prompt_carries_fragment_errors_and_schema():
+    system, user = build_repair_prompt(
+        "x" * 10,
+        [{"path": "title", "message": "is required"}, {"message": "bad"}],
+        schema={"type": "object"},
+        max_chars=4,
+    )
+    assert "JSON" in system
+    assert "xxxx\n" in user and "xxxxx" not in user
+    assert "- title: is required" in user
+    assert "- $: bad" in user
+    assert '{"type":"object"}' in user
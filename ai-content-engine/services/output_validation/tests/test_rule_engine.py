@@ -0,0 +1,113 @@
+import pytest
+
+from output_validation.services.rule_engine import RuleCompileError, compile_rules
+
+
+def evaluate(data, *rules, fail_fast=True):
+    program = compile_rules("semantic", {"fail_fast": fail_fast, "rules": list(rules)})
+    return program.evaluate(data)
+
+
+@pytest.mark.parametrize(
+    ("rule", "passing", "failing"),
+    [
+        ({"op": "eq", "value": 1}, 1, 2),
+        ({"op": "ne", "value": 1}, 2, 1),
+        ({"op": "lt", "value": 10}, 9, 10),
+        ({"op": "le", "value": 10}, 10, 11),
+        ({"op": "gt", "value": 0}, 1, 0),
+        ({"op": "ge", "value": 0}, 0, -1),
+        ({"op": "in", "value": ["a", "b"]}, "a", "c"),
+        ({"op": "not_in", "value": ["a", "b"]}, "c", "a"),
+        ({"op": "in", "value": [[1], [2]]}, [1], [3]),
+        ({"op": "regex", "value": "^[A-Z]{3}-\\d+$"}, "ABC-12", "abc-12"),
+        ({"op": "length", "min": 2, "max": 4}, "abc", "abcde"),
+        ({"op": "count", "min": 1}, [1], []),
+        ({"op": "word_count", "max": 2}, "two words", "three whole words"),
+    ],
+)
+def test_operators(rule, passing, failing):
+    rule = {"name": "r", "field": "x", **rule}
+    assert evaluate({"x": passing}, rule)["passed"]
+    result = evaluate({"x": failing}, rule)
+    assert not result["passed"]
+    assert result["errors"][0]["path"] == "r"
+
+
+def test_compares_against_other_field():
+    rule = {"name": "ordered", "field": "start", "op": "lt", "other_field": "end"}
+    assert evaluate({"start": 1, "end": 2}, rule)["passed"]
+    assert not evaluate({"start": 2, "end": 1}, rule)["passed"]
+    assert not evaluate({"start": 1}, rule)["passed"]
+
+
+def test_nested_paths_and_list_indexes():
+    rule = {"name": "first", "field": "items.0.price", "op": "gt", "value": 0}
+    assert evaluate({"items": [{"price": 5}]}, rule)["passed"]
+    assert not evaluate({"items": []}, rule)["passed"]
+
+
+def test_missing_fields_fail_unless_optional():
+    rule = {"name": "r", "field": "x", "op": "gt", "value": 0}
+    assert evaluate({}, rule)["errors"][0]["message"] == "x is missing"
+    assert evaluate({}, {**rule, "optional": True})["passed"]
+    assert not evaluate({}, {"name": "req", "field": "x", "op": "required"})["passed"]
+    assert evaluate({"x": None}, {"name": "req", "field": "x", "op": "required"})["passed"]
+
+
+def test_type_mismatches_fail_instead_of_raising():
+    assert not evaluate({"x": "1"}, {"name": "r", "field": "x", "op": "gt", "value": 0})["passed"]
+    assert not evaluate({"x": 5}, {"name": "r", "field": "x", "op": "length", "min": 1})["passed"]
+    regex = {"name": "r", "field": "x", "op": "regex", "value": "5"}
+    assert not evaluate({"x": 5}, regex)["passed"]
+
+
+def test_fail_fast_stops_at_first_error_but_not_at_warnings():
+    warning = {"name": "w", "field": "x", "op": "gt", "value": 10, "severity": "warning"}
+    first = {"name": "e1", "field": "x", "op": "gt", "value": 10}
+    second = {"name": "e2", "field": "x", "op": "lt", "value": 0}
+
+    result = evaluate({"x": 1}, warning, first, second)
+    assert [r["name"] for r in result["rules"]] == ["w", "e1"]
+    assert result["rules"][0]["severity"] == "warning"
+    assert [e["path"] for e in result["errors"]] == ["e1"]
+
+    result = evaluate({"x": 1}, warning, first, second, fail_fast=False)
+    assert [e["path"] for e in result["errors"]] == ["e1", "e2"]
+
+
+def test_warnings_alone_pass():
+    rule = {"name": "w", "field": "x", "op": "gt", "value": 10, "severity": "warning"}
+    result = evaluate({"x": 1}, rule)
+    assert result["passed"]
+    assert result["errors"] == []
+    assert not result["rules"][0]["passed"]
+
+
+def test_default_names_and_severity():
+    program = compile_rules(
+        "quality", {"rules": [{"field": "x", "op": "required"}]}, default_severity="warning"
+    )
+    assert program.rules[0].name == "quality_0"
+    assert program.rules[0].severity == "warning"
+
+
+@pytest.mark.parametrize("definition", [None, {}, {"rules": []}])
+def test_empty_definitions_compile_to_nothing(definition):
+    assert compile_rules("semantic", definition) is None
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"op": "gt", "value": 1},
+        {"field": "x", "op": "between", "value": 1},
+        {"field": "x", "op": "gt"},
+        {"field": "x", "op": "regex", "value": "("},
+        {"field": "x", "op": "length"},
+        {"field": "x", "op": "required", "severity": "fatal"},
+    ],
+)
+def test_malformed_rules_are_rejected(rule):
+    with pytest.raises(RuleCompileError):
+        compile_rules("semantic", {"rules": [rule]})
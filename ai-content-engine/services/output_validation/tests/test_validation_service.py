@@ -0,0 +1,175 @@
+import uuid
+
+import pytest
+
+from shared.models.schema import OutputSchema
+from shared.utils import cache
+from shared.utils.datetime import utcnow
+from output_validation.services.validation_service import (
+    OutputValidationError,
+    ValidationService,
+    extract_json,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"title": {"type": "string"}, "price": {"type": "number"}},
+    "required": ["title"],
+}
+SEMANTIC = {"rules": [{"name": "price_positive", "field": "price", "op": "gt", "value": 0}]}
+QUALITY = {"rules": [{"name": "title_length", "field": "title", "op": "length", "min": 5}]}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, rows: dict[uuid.UUID, OutputSchema], gets: list[uuid.UUID]) -> None:
+        self._rows = rows
+        self._gets = gets
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def get(self, model, key):
+        assert model is OutputSchema
+        self._gets.append(key)
+        return self._rows.get(key)
+
+
+class FakeSessionFactory:
+    """Serves ``output_schemas`` rows from a dict and records each lookup."""
+
+    def __init__(self, *rows: OutputSchema) -> None:
+        self.rows = {row.id: row for row in rows}
+        self.gets: list[uuid.UUID] = []
+
+    def __call__(self) -> FakeSession:
+        return FakeSession(self.rows, self.gets)
+
+
+def output_schema(**fields) -> OutputSchema:
+    return OutputSchema(
+        id=uuid.uuid4(),
+        name="product",
+        version="1.0.0",
+        json_schema=SCHEMA,
+        semantic_rules=SEMANTIC,
+        quality_rules=QUALITY,
+        **fields,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+async def test_schema_and_rules_are_loaded_by_id_and_cached():
+    row = output_schema()
+    sessions = FakeSessionFactory(row)
+    service = ValidationService(sessions)
+    schema_id = str(row.id)
+
+    parsed, results = await service.validate_output('{"title": "A lamp", "price": 5}', schema_id)
+
+    assert parsed == {"title": "A lamp", "price": 5}
+    assert results["status"] == "passed"
+    assert set(results["stages"]) == {"syntactic", "semantic", "quality"}
+    assert service.get_schema(schema_id) == SCHEMA
+
+    with pytest.raises(OutputValidationError) as e:
+        await service.validate_output('{"title": "A lamp", "price": 0}', schema_id)
+    assert e.value.stage == "semantic"
+    assert sessions.gets == [row.id]
+
+
+async def test_quality_rules_warn_without_failing():
+    row = output_schema()
+    service = ValidationService(FakeSessionFactory(row))
+
+    _, results = await service.validate_output('{"title": "Lamp", "price": 5}', str(row.id))
+
+    quality = results["stages"]["quality"]
+    assert results["status"] == "passed"
+    assert quality["rules"][0]["severity"] == "warning"
+
+
+async def test_schema_violations_fail_the_schema_stage():
+    row = output_schema()
+    service = ValidationService(FakeSessionFactory(row))
+
+    with pytest.raises(OutputValidationError) as e:
+        await service.validate_output('{"price": 5}', str(row.id))
+    assert e.value.stage == "schema"
+    assert e.value.validation_results["status"] == "failed"
+
+
+async def test_cached_schema_is_reloaded_after_the_ttl(clock):
+    row = output_schema()
+    sessions = FakeSessionFactory(row)
+    service = ValidationService(sessions, cache_ttl_seconds=60)
+
+    await service.resolve_schema(str(row.id))
+    clock.now += 59
+    await service.resolve_schema(str(row.id))
+    assert len(sessions.gets) == 1
+
+    clock.now += 2
+    await service.resolve_schema(str(row.id))
+    assert len(sessions.gets) == 2
+
+
+async def test_unknown_and_deleted_schemas_are_cached_as_missing():
+    deleted = output_schema(deleted_at=utcnow())
+    sessions = FakeSessionFactory(deleted)
+    service = ValidationService(sessions)
+
+    for schema_id in (str(deleted.id), str(uuid.uuid4()), "not-a-uuid"):
+        for _ in range(2):
+            parsed, results = await service.validate_output("[1]", schema_id)
+            assert results["status"] == "passed"
+    # Two lookups: the deleted row and the unknown id; the malformed id never queries
+    assert len(sessions.gets) == 2
+
+
+async def test_registered_schemas_take_precedence_over_the_database():
+    sessions = FakeSessionFactory()
+    service = ValidationService(sessions)
+    service.register_schema("inline", SCHEMA, semantic_rules=SEMANTIC)
+
+    with pytest.raises(OutputValidationError):
+        await service.validate_output('{"title": "A lamp", "price": -1}', "inline")
+    assert sessions.gets == []
+
+
+async def test_truncated_output_is_rejected_unless_allowed():
+    service = ValidationService()
+    with pytest.raises(OutputValidationError) as e:
+        await service.validate_output('{"title": "A la', None, allow_truncated=False)
+    assert e.value.stage == "parse"
+
+    parsed, results = await service.validate_output('{"title": "A la', None)
+    assert parsed == {"title": "A la"}
+    assert results["stages"]["parse"] == {"passed": True, "truncated": True}
+
+
+@pytest.mark.parametrize("raw", ["42", '"text"', "null"])
+def test_extract_json_rejects_scalars(raw):
+    with pytest.raises(OutputValidationError) as e:
+        extract_json(raw)
+    assert e.value.stage == "parse"
+
+
+def test_extract_json_reads_fenced_output():
+    assert extract_json('Here:\n```json\n{"a": [1]}\n```') == ({"a": [1]}, False)
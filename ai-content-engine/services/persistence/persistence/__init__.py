@@ -0,0 +1 @@
+"""Persistence Service - Result storage and indexing."""
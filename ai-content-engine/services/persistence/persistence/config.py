@@ -0,0 +1,45 @@
+"""Persistence service configuration."""
+
+from shared.config import BaseServiceSettings
+
+
+class PersistenceSettings(BaseServiceSettings):
+    service_name: str = "persistence"
+    kafka_consumer_group: str = "persistence-group"
+    input_topic: str = "content.validation.complete"
+    host: str = "0.0.0.0"
+    port: int = 8005
+    write_behind_enabled: bool = True
+    write_behind_max_rows: int = 500
+    write_behind_max_wait_ms: int = 250
+    search_indexing_enabled: bool = True
+    search_backend: str = "elasticsearch"  # "elasticsearch" or "memory"
+    search_index: str = "generation_results"
+    search_bulk_max_docs: int = 500
+    search_bulk_flush_ms: int = 1000
+    search_bulk_concurrency: int = 2
+    search_bulk_max_retries: int = 3
+    lifecycle_enabled: bool = True
+    lifecycle_interval_seconds: int = 3600
+    lifecycle_batch_size: int = 500
+    results_warm_after_days: int = 30
+    results_cold_after_days: int = 180
+    partition_maintenance_enabled: bool = True
+    partition_maintenance_interval_seconds: int = 3600
+    partition_premake_months: int = 3
+    partition_retention_months: int | None = None  # None keeps every partition
+    partition_lock_timeout_ms: int = 2000
+    # Dedup claims outlive any redelivery: a few times the Kafka topic retention (7 days)
+    processed_events_purge_enabled: bool = True
+    processed_events_horizon_days: int = 21
+    processed_events_purge_interval_seconds: int = 3600
+    processed_events_purge_batch_size: int = 10_000
+    completion_notifications_enabled: bool = True
+    status_cache_enabled: bool = True
+    status_cache_ttl_seconds: int = 86400
+    usage_rollup_enabled: bool = True
+    usage_rollup_interval_seconds: int = 10
+    usage_rollup_batch_size: int = 1000
+
+
+settings = PersistenceSettings()
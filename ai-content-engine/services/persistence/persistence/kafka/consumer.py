@@ -1,7 +1,15 @@
 """Kafka consumer for ValidationComplete events."""
 
+import uuid
+
 import structlog
 
+from shared.events import timing
+from shared.notifications import CompletionNotifier
+from shared.status_cache import StatusCache
+from shared.tracing import tracer
+
+from persistence.services.search_indexer import BulkIndexer
 from persistence.services.storage_service import StorageService
 from pydantic import BaseModel, UUID4
 
@@ -10,18 +18,70 @@ logger = structlog.get_logger(__name__)
 class ValidationCompletePayload(BaseModel):
     request_id: UUID4
     status: str
-    parsed_output: dict | None = None
+    parsed_output: dict | list | None = None
+    validation_results: dict | None = None
     raw_response: str
     error_message: str | None = None
     timing_ms: dict | None = None
+    organization_id: UUID4 | None = None
+    model_provider: str | None = None
+    model_id: str | None = None
+    token_usage: dict | None = None
+    cost_usd: float | None = None
+
+def _event_id(msg: dict) -> uuid.UUID | None:
+    event_id = msg.get("event_id")
+    return uuid.UUID(str(event_id)) if event_id else None
+
+def _with_stage_latencies(data: dict, timings: dict[str, float]) -> dict:
+    """Merge stage durations derived from the envelope's timing marks into ``timing_ms``."""
+    data["timing_ms"] = {**(data.get("timing_ms") or {}), **timing.stage_latencies(timings)}
+    return data
+
+def _final_status(payload: ValidationCompletePayload) -> str:
+    return "completed" if payload.status == "success" else "failed"
+
+def _completion(payload: ValidationCompletePayload) -> tuple[uuid.UUID, str, uuid.UUID | None]:
+    return payload.request_id, _final_status(payload), payload.organization_id
+
+async def _announce_completions(
+    completions: list[tuple[uuid.UUID, str, uuid.UUID | None]],
+    notifier: CompletionNotifier | None,
+    status_cache: StatusCache | None,
+) -> None:
+    """Write committed transitions through to the status cache, then wake waiters."""
+    if status_cache is not None:
+        await status_cache.set_many(completions)
+    if notifier is not None:
+        await notifier.publish([(request_id, status) for request_id, status, _ in completions])
+
+def _search_document(msg: dict, payload: ValidationCompletePayload) -> dict:
+    return {
+        "request_id": str(payload.request_id),
+        "correlation_id": msg.get("correlation_id"),
+        "status": _final_status(payload),
+        "parsed_output": payload.parsed_output,
+        "validation_status": (payload.validation_results or {}).get("status"),
+        "error_message": payload.error_message,
+        "timestamp": msg.get("timestamp"),
+    }
 
 async def handle_validation_complete(
     msg: dict, 
-    storage_service: StorageService
+    storage_service: StorageService,
+    indexer: BulkIndexer | None = None,
+    notifier: CompletionNotifier | None = None,
+    status_cache: StatusCache | None = None,
 ) -> None:
-    """Handle ValidationComplete event and store result."""
+    """Handle ValidationComplete event and store result.
+
+    An invalid payload is logged and skipped. Storage errors propagate so
+    the offset is not committed and the event is redelivered; the write is
+    idempotent, so redelivery is safe.
+    """
     logger.info("received_validation_complete_event", event_id=msg.get("event_id"))
-    
+    timings = timing.received(msg, timing.PERSISTENCE_RECEIVED)
+
     try:
         payload = ValidationCompletePayload.model_validate(msg.get("payload", {}))
         request_id_str = str(payload.request_id)
@@ -31,10 +91,65 @@ async def handle_validation_complete(
         
     try:
         request_id = payload.request_id
-        await storage_service.store_result(request_id, payload.model_dump())
-        
-        # In a complete implementation, this would also index to Elasticsearch
-        # es_client.index(index="generation_results", id=str(request_id), document=payload)
-        
+        data = _with_stage_latencies(
+            payload.model_dump(), timing.stamp(timings, timing.PERSISTENCE_STORED)
+        )
+        with tracer.start_as_current_span("persistence.flush", attributes={"db.batch_size": 1}):
+            await storage_service.store_result(request_id, data, event_id=_event_id(msg))
     except Exception as e:
         logger.error("persistence_failed", error=str(e), request_id=request_id_str)
+        raise
+
+    # Announced after commit so readers always see the stored result
+    await _announce_completions([_completion(payload)], notifier, status_cache)
+
+    # Indexing is buffered and flushed in the background, off the commit path
+    if indexer is not None:
+        indexer.add(request_id_str, _search_document(msg, payload))
+
+async def handle_validation_complete_batch(
+    msgs: list[dict],
+    storage_service: StorageService,
+    indexer: BulkIndexer | None = None,
+    notifier: CompletionNotifier | None = None,
+    status_cache: StatusCache | None = None,
+) -> None:
+    """Handle a batch of ValidationComplete events with a single bulk flush.
+
+    Invalid payloads are logged and skipped; flush errors propagate so the
+    consumer does not commit offsets for an unpersisted batch.
+    """
+    events = []
+    documents = []
+    completions = []
+    received = []
+    for msg in msgs:
+        try:
+            payload = ValidationCompletePayload.model_validate(msg.get("payload", {}))
+            event_id = _event_id(msg)
+        except Exception as e:
+            logger.error("invalid_event_payload_schema", error=str(e), event_id=msg.get("event_id"))
+            continue
+        events.append((event_id, payload.model_dump()))
+        received.append(timing.received(msg, timing.PERSISTENCE_RECEIVED))
+        documents.append((str(payload.request_id), _search_document(msg, payload)))
+        completions.append(_completion(payload))
+
+    stored_at = timing.now_ms()
+    for (_, data), timings in zip(events, received):
+        timings[timing.PERSISTENCE_STORED] = stored_at
+        _with_stage_latencies(data, timings)
+
+    try:
+        with tracer.start_as_current_span(
+            "persistence.flush", attributes={"db.batch_size": len(events)}
+        ):
+            await storage_service.store_results_bulk(events)
+    except Exception as e:
+        logger.error("persistence_batch_failed", error=str(e), size=len(events))
+        raise
+
+    await _announce_completions(completions, notifier, status_cache)
+    if indexer is not None:
+        for doc_id, document in documents:
+            indexer.add(doc_id, document)
@@ -0,0 +1,208 @@
+"""Persistence Service application entry point."""
+
+import asyncio
+from datetime import timedelta
+from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator
+
+from fastapi import FastAPI
+from redis.asyncio import Redis
+import uvicorn
+
+from shared.admission import ConsumerLagReporter
+from shared.archive import LocalArchiveStore
+from shared.database import get_session, get_session_factory, init_database
+from shared.dedup import ProcessedEventPurger
+from shared.kafka import AsyncKafkaConsumer
+from shared.logging import setup_logging
+from shared.metrics import MetricsMiddleware, metrics_router
+from shared.middleware.correlation import CorrelationIDMiddleware
+from shared.middleware.error_handler import register_error_handlers
+from shared.notifications import CompletionNotifier
+from shared.partitions import PartitionMaintainer
+from shared.quotas import UsageRollup
+from shared.status_cache import StatusCache
+from shared.tracing import setup_tracing, shutdown_tracing
+
+from persistence.config import settings
+from persistence.kafka.consumer import (
+    handle_validation_complete,
+    handle_validation_complete_batch,
+)
+from persistence.services.lifecycle_service import ResultLifecycleService
+from persistence.services.search_indexer import (
+    BulkIndexer,
+    ElasticsearchBackend,
+    InMemorySearchBackend,
+    SearchBackend,
+)
+from persistence.services.storage_service import StorageService
+
+
+indexer: BulkIndexer | None = None
+notifier: CompletionNotifier | None = None
+status_cache: StatusCache | None = None
+
+
+def create_search_backend() -> SearchBackend:
+    if settings.search_backend == "memory":
+        return InMemorySearchBackend()
+    return ElasticsearchBackend(settings.elasticsearch_url)
+
+
+async def handle_message(message: dict) -> None:
+    async for session in get_session():
+        await handle_validation_complete(
+            message, StorageService(session), indexer, notifier, status_cache
+        )
+
+
+async def handle_batch(messages: list[dict]) -> None:
+    async for session in get_session():
+        await handle_validation_complete_batch(
+            messages, StorageService(session), indexer, notifier, status_cache
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    global indexer, notifier, status_cache
+    setup_logging(
+        settings.service_name,
+        settings.log_level,
+        settings.environment,
+        message_sample_rate=settings.log_message_sample_rate,
+        queue_size=settings.log_queue_size,
+    )
+    setup_tracing(
+        settings.service_name,
+        settings.otel_exporter_otlp_endpoint,
+        settings.otel_trace_sample_ratio,
+    )
+    init_database(settings.database_url, **settings.database_engine_options())
+
+    if settings.search_indexing_enabled:
+        indexer = BulkIndexer(
+            create_search_backend(),
+            index=settings.search_index,
+            max_docs=settings.search_bulk_max_docs,
+            flush_interval_ms=settings.search_bulk_flush_ms,
+            max_concurrency=settings.search_bulk_concurrency,
+            max_retries=settings.search_bulk_max_retries,
+        )
+        await indexer.start()
+
+    redis = Redis.from_url(settings.redis_url)
+    if settings.completion_notifications_enabled:
+        notifier = CompletionNotifier(redis)
+    if settings.status_cache_enabled:
+        # Only written here, so no in-process layer is needed
+        status_cache = StatusCache(
+            redis, ttl_seconds=settings.status_cache_ttl_seconds, local_ttl_seconds=0
+        )
+
+    if settings.write_behind_enabled:
+        consumer = AsyncKafkaConsumer(
+            topic=settings.input_topic,
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            group_id=settings.kafka_consumer_group,
+            batch_handler=handle_batch,
+            max_batch_size=settings.write_behind_max_rows,
+            max_batch_wait_ms=settings.write_behind_max_wait_ms,
+        )
+    else:
+        consumer = AsyncKafkaConsumer(
+            topic=settings.input_topic,
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            group_id=settings.kafka_consumer_group,
+            handler=handle_message,
+        )
+    await consumer.start()
+    consumer_task = asyncio.create_task(consumer.run())
+    lag_reporter = ConsumerLagReporter(
+        redis,
+        consumer,
+        settings.kafka_consumer_group,
+        interval_seconds=settings.pipeline_lag_report_interval_seconds,
+    )
+    background_tasks = [consumer_task, asyncio.create_task(lag_reporter.run_forever())]
+
+    if settings.lifecycle_enabled:
+        lifecycle = ResultLifecycleService(
+            get_session_factory(),
+            LocalArchiveStore(settings.archive_root),
+            warm_after=timedelta(days=settings.results_warm_after_days),
+            cold_after=timedelta(days=settings.results_cold_after_days),
+            batch_size=settings.lifecycle_batch_size,
+        )
+        background_tasks.append(
+            asyncio.create_task(lifecycle.run_forever(settings.lifecycle_interval_seconds))
+        )
+
+    if settings.partition_maintenance_enabled:
+        maintainer = PartitionMaintainer(
+            get_session_factory(),
+            premake_months=settings.partition_premake_months,
+            retention_months=settings.partition_retention_months,
+            lock_timeout_ms=settings.partition_lock_timeout_ms,
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                maintainer.run_forever(settings.partition_maintenance_interval_seconds)
+            )
+        )
+
+    if settings.processed_events_purge_enabled:
+        purger = ProcessedEventPurger(
+            get_session_factory(),
+            horizon=timedelta(days=settings.processed_events_horizon_days),
+            batch_size=settings.processed_events_purge_batch_size,
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                purger.run_forever(settings.processed_events_purge_interval_seconds)
+            )
+        )
+
+    if settings.usage_rollup_enabled:
+        rollup = UsageRollup(
+            get_session_factory(), redis, batch_size=settings.usage_rollup_batch_size
+        )
+        background_tasks.append(
+            asyncio.create_task(rollup.run_forever(settings.usage_rollup_interval_seconds))
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    if indexer is not None:
+        await indexer.stop()
+    await redis.aclose()
+    shutdown_tracing()
+
+
+app = FastAPI(
+    title="AI Content Engine - Persistence Service",
+    version="0.1.0",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CorrelationIDMiddleware, access_log_sample_rate=settings.access_log_sample_rate
+)
+app.add_middleware(MetricsMiddleware)
+register_error_handlers(app)
+
+from persistence.api.v1 import health  # noqa: E402
+app.include_router(metrics_router)
+app.include_router(health.router, prefix="/api/v1", tags=["health"])
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=settings.host, port=settings.port)
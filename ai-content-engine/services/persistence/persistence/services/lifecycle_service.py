@@ -0,0 +1,162 @@
+"""Hot/warm/cold lifecycle management for generation results."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.archive import ArchiveStore, decode_segment, encode_segment
+from shared.models.generation import GenerationResult, StorageTier
+from shared.utils.datetime import utcnow
+
+logger = structlog.get_logger(__name__)
+
+
+class ResultLifecycleService:
+    """Moves aged results out of the hot table into compressed archive segments.
+
+    * hot -> warm: ``raw_response`` and ``parsed_output`` of results older than
+      ``warm_after`` are written, a batch at a time, into one zstd segment in
+      the warm store. The row stays as a thin pointer (``archive_uri``).
+    * warm -> cold: whole segments older than ``cold_after`` are recompressed
+      at a higher level into the cold store and their pointers rewritten.
+
+    Results under ``legal_hold`` are never moved, and a segment containing a
+    held result stays in the warm tier.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        store: ArchiveStore,
+        warm_after: timedelta,
+        cold_after: timedelta,
+        batch_size: int = 500,
+    ) -> None:
+        self._session_factory = session_factory
+        self._store = store
+        self._warm_after = warm_after
+        self._cold_after = cold_after
+        self._batch_size = batch_size
+
+    async def archive_hot(self, now: datetime | None = None) -> int:
+        """Archive one batch of hot results; returns the number of rows moved."""
+        cutoff = (now or utcnow()) - self._warm_after
+        async with self._session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        GenerationResult.id,
+                        GenerationResult.created_at,
+                        GenerationResult.raw_response,
+                        GenerationResult.parsed_output,
+                    )
+                    .where(
+                        GenerationResult.storage_tier == StorageTier.HOT,
+                        GenerationResult.legal_hold.is_(False),
+                        GenerationResult.created_at < cutoff,
+                        # Implied by the line above; lets Postgres prune newer partitions
+                        GenerationResult.request_created_at < cutoff,
+                    )
+                    .order_by(GenerationResult.created_at, GenerationResult.id)
+                    .limit(self._batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not rows:
+                return 0
+
+            segment = encode_segment(
+                {
+                    row.id: {"raw_response": row.raw_response, "parsed_output": row.parsed_output}
+                    for row in rows
+                }
+            )
+            # Keyed by the batch's bounds, so re-archiving the same rows after a
+            # failed commit overwrites the segment instead of orphaning a copy
+            first, last = rows[0], rows[-1]
+            uri = await self._store.put(
+                StorageTier.WARM.value,
+                f"{first.created_at:%Y/%m}/{first.id}-{last.id}.json.zst",
+                segment,
+            )
+            try:
+                await session.execute(
+                    update(GenerationResult)
+                    .where(GenerationResult.id.in_([row.id for row in rows]))
+                    .values(
+                        storage_tier=StorageTier.WARM,
+                        archive_uri=uri,
+                        archived_at=utcnow(),
+                        raw_response="",
+                        parsed_output=None,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            except BaseException:
+                await self._store.delete(uri)
+                raise
+        logger.info("results_archived", tier="warm", count=len(rows), uri=uri, bytes=len(segment))
+        return len(rows)
+
+    async def demote_warm(self, now: datetime | None = None) -> int:
+        """Move one batch of warm segments to the cold tier; returns segments moved."""
+        cutoff = (now or utcnow()) - self._cold_after
+        held = (
+            select(GenerationResult.archive_uri)
+            .where(GenerationResult.legal_hold.is_(True), GenerationResult.archive_uri.is_not(None))
+        )
+        async with self._session_factory() as session:
+            uris = (
+                await session.execute(
+                    select(GenerationResult.archive_uri)
+                    .where(
+                        GenerationResult.storage_tier == StorageTier.WARM,
+                        GenerationResult.archived_at < cutoff,
+                        GenerationResult.archive_uri.not_in(held),
+                    )
+                    .distinct()
+                    .limit(self._batch_size)
+                )
+            ).scalars().all()
+
+            moved = 0
+            for uri in uris:
+                records = decode_segment(await self._store.get(uri))
+                # Cold storage favours ratio over speed: recompress at a high level
+                cold_uri = await self._store.put(
+                    StorageTier.COLD.value,
+                    uri.split(f"{StorageTier.WARM.value}/", 1)[1],
+                    encode_segment({uuid.UUID(k): v for k, v in records.items()}, level=19),
+                )
+                await session.execute(
+                    update(GenerationResult)
+                    .where(GenerationResult.archive_uri == uri)
+                    .values(storage_tier=StorageTier.COLD, archive_uri=cold_uri)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                await self._store.delete(uri)
+                moved += 1
+        if moved:
+            logger.info("results_archived", tier="cold", segments=moved)
+        return moved
+
+    async def run_once(self) -> None:
+        while await self.archive_hot() == self._batch_size:
+            pass
+        await self.demote_warm()
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("result_lifecycle_failed")
+            await asyncio.sleep(interval_seconds)
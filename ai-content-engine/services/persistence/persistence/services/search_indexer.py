@@ -0,0 +1,187 @@
+"""Asynchronous bulk indexing of generation results into Elasticsearch."""
+
+import asyncio
+import json
+import random
+from typing import Any, Protocol
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Per-item bulk statuses worth retrying; everything else is a permanent failure
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class SearchBackend(Protocol):
+    async def bulk(self, body: str) -> dict[str, Any]:
+        """Submit an NDJSON ``_bulk`` body and return the parsed response."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class ElasticsearchBackend:
+    """Talks to the Elasticsearch ``_bulk`` API over HTTP."""
+
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        self._client = httpx.AsyncClient(base_url=url, timeout=timeout)
+
+    async def bulk(self, body: str) -> dict[str, Any]:
+        response = await self._client.post(
+            "/_bulk",
+            content=body.encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class InMemorySearchBackend:
+    """Local stand-in for Elasticsearch, for tests and development.
+
+    Documents are kept per index in memory. ``fail_next`` makes the next N item
+    operations fail with the given status, to exercise partial-failure retries.
+    """
+
+    def __init__(self) -> None:
+        self.indices: dict[str, dict[str, dict[str, Any]]] = {}
+        self.requests = 0
+        self._failures: list[int] = []
+
+    def fail_next(self, count: int, status: int = 429) -> None:
+        self._failures.extend([status] * count)
+
+    async def bulk(self, body: str) -> dict[str, Any]:
+        self.requests += 1
+        lines = [json.loads(line) for line in body.splitlines() if line]
+        items = []
+        for action, document in zip(lines[::2], lines[1::2], strict=True):
+            meta = action["index"]
+            if self._failures:
+                status = self._failures.pop(0)
+                items.append({"index": {"_id": meta["_id"], "status": status, "error": {"type": "stand_in"}}})
+                continue
+            self.indices.setdefault(meta["_index"], {})[meta["_id"]] = document
+            items.append({"index": {"_id": meta["_id"], "status": 201}})
+        return {"errors": any(i["index"]["status"] >= 300 for i in items), "items": items}
+
+    async def close(self) -> None:
+        pass
+
+
+class BulkIndexer:
+    """Buffers documents and flushes them through ``_bulk`` off the commit path.
+
+    ``add`` never awaits: documents are buffered and a background task flushes
+    whenever ``max_docs`` are queued or ``flush_interval_ms`` elapses. At most
+    ``max_concurrency`` bulk requests are in flight; items that fail with a
+    retryable status are re-sent with exponential backoff. When the buffer is
+    full, new documents are dropped and counted rather than blocking callers.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        index: str = "generation_results",
+        max_docs: int = 500,
+        flush_interval_ms: int = 1000,
+        max_concurrency: int = 2,
+        max_retries: int = 3,
+        max_buffer: int = 50_000,
+    ) -> None:
+        self._backend = backend
+        self._index = index
+        self._max_docs = max_docs
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_retries = max_retries
+        self._max_buffer = max_buffer
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._buffer: list[tuple[str, dict[str, Any]]] = []
+        self._wakeup = asyncio.Event()
+        self._inflight: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def add(self, doc_id: str, document: dict[str, Any]) -> None:
+        if len(self._buffer) >= self._max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append((doc_id, document))
+        if len(self._buffer) >= self._max_docs:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("search_indexer_started", index=self._index)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self._backend.close()
+        logger.info("search_indexer_stopped", index=self._index, dropped=self.dropped)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Dispatch everything buffered so far as bounded-concurrency bulk requests."""
+        while self._buffer:
+            chunk = self._buffer[: self._max_docs]
+            del self._buffer[: self._max_docs]
+            # Acquire before spawning so back-pressure applies to the flush loop
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._send(chunk))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _encode(self, docs: list[tuple[str, dict[str, Any]]]) -> str:
+        lines = []
+        for doc_id, document in docs:
+            lines.append(json.dumps({"index": {"_index": self._index, "_id": doc_id}}))
+            lines.append(json.dumps(document, default=str))
+        return "\n".join(lines) + "\n"
+
+    async def _send(self, docs: list[tuple[str, dict[str, Any]]]) -> None:
+        try:
+            for attempt in range(self._max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(min(2 ** attempt * 0.1, 5.0) * (0.5 + random.random()))
+                try:
+                    response = await self._backend.bulk(self._encode(docs))
+                except (httpx.HTTPError, OSError) as e:
+                    logger.warning("search_bulk_request_failed", error=str(e), attempt=attempt)
+                    continue
+                if not response.get("errors"):
+                    return
+                retry = []
+                for doc, item in zip(docs, response.get("items", []), strict=False):
+                    result = next(iter(item.values()))
+                    status = result.get("status", 500)
+                    if status in RETRYABLE_STATUSES:
+                        retry.append(doc)
+                    elif status >= 300:
+                        logger.error("search_document_rejected", doc_id=doc[0], error=result.get("error"))
+                if not retry:
+                    return
+                docs = retry
+            logger.error("search_bulk_retries_exhausted", count=len(docs), index=self._index)
+        finally:
+            self._semaphore.release()
@@ -1,46 +1,112 @@
 """Storage service for persisting Generation Results."""
 
 import uuid
+from datetime import datetime
 from typing import Any
 
 import structlog
+from sqlalchemy import cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shared.dedup import claim_events
 from shared.models.generation import GenerationRequest, GenerationResult, GenerationStatus
 
 logger = structlog.get_logger(__name__)
 
+DEDUP_CONSUMER = "persistence"
+
+# Recorded for results from producers that predate model attribution
+UNKNOWN_MODEL = "unknown"
+
+# Columns refreshed when a result for the same request is written again
+_UPSERT_COLUMNS = (
+    "model_provider",
+    "model_id",
+    "raw_response",
+    "parsed_output",
+    "validation_results",
+    "token_usage",
+    "cost_usd",
+    "latency_ms",
+)
+
+
+def _result_values(
+    request_id: uuid.UUID, request_created_at: datetime, event_payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Column values for the GenerationResult row of a successful validation event."""
+    return {
+        "request_id": request_id,
+        "request_created_at": request_created_at,
+        "model_provider": event_payload.get("model_provider") or UNKNOWN_MODEL,
+        "model_id": event_payload.get("model_id") or UNKNOWN_MODEL,
+        "raw_response": event_payload.get("raw_response", ""),
+        "parsed_output": event_payload.get("parsed_output", {}),
+        "validation_results": event_payload.get("validation_results") or {"status": "passed"},
+        "token_usage": event_payload.get("token_usage") or {},
+        "cost_usd": event_payload.get("cost_usd") or 0.0,
+        "latency_ms": event_payload.get("timing_ms") or {},
+    }
+
+
+def _upsert_results(rows: list[dict[str, Any]]):
+    """Multi-row INSERT that updates the existing result for a request on conflict."""
+    stmt = insert(GenerationResult).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[GenerationResult.request_id, GenerationResult.request_created_at],
+        set_={
+            **{name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
 
 class StorageService:
-    """Handles insertions of Generation Results into PostgreSQL."""
+    """Handles insertions of Generation Results into PostgreSQL.
+
+    Writes are idempotent: every event id is recorded in ``processed_events``
+    in the same transaction as its effects, and results are upserted on
+    ``request_id``, so Kafka redeliveries never duplicate work or fail.
+    """
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def store_result(self, request_id: uuid.UUID, event_payload: dict[str, Any]) -> None:
-        """Update request status and create result record."""
+    async def _claim_events(self, events: list[tuple[uuid.UUID, uuid.UUID]]) -> set[uuid.UUID]:
+        """Record (event_id, request_id) pairs; return the event ids not seen before."""
+        return await claim_events(self.session, DEDUP_CONSUMER, events)
+
+    async def store_result(
+        self,
+        request_id: uuid.UUID,
+        event_payload: dict[str, Any],
+        event_id: uuid.UUID | None = None,
+    ) -> None:
+        """Update request status and upsert the result record."""
+        if event_id is not None and not await self._claim_events([(event_id, request_id)]):
+            await self.session.rollback()
+            logger.info("duplicate_event_skipped", event_id=str(event_id), request_id=str(request_id))
+            return
+
         # 1. Update the Request Status
         request = await self.session.get(GenerationRequest, request_id)
         if not request:
             logger.error("generation_request_not_found", request_id=str(request_id))
+            await self.session.commit()
             return
 
         status_str = event_payload.get("status")
         if status_str == "success":
             request.status = GenerationStatus.COMPLETED
-            
+
             # 2. Store the Generation Result Context
-            result = GenerationResult(
-                request_id=request_id,
-                raw_response=event_payload.get("raw_response", ""),
-                parsed_output=event_payload.get("parsed_output", {}),
-                validation_results={"status": "passed"},
-                token_usage={}, # To be populated by model layer in future
-                cost_usd=0.0,
-                latency_ms=event_payload.get("timing_ms", {}),
+            await self.session.execute(
+                _upsert_results(
+                    [{"id": uuid.uuid4(), **_result_values(request_id, request.created_at, event_payload)}]
+                )
             )
-            self.session.add(result)
-            
+
         else:
             request.status = GenerationStatus.FAILED
             # Handle failure storing details...
@@ -48,3 +114,78 @@ class StorageService:
         await self.session.commit()
         logger.info("generation_result_stored", request_id=str(request_id), status=status_str)
 
+    async def store_results_bulk(
+        self, events: list[tuple[uuid.UUID | None, dict[str, Any]]]
+    ) -> int:
+        """Persist a batch of (event_id, payload) validation results in one transaction.
+
+        Already-processed events are dropped with one multi-row insert into
+        ``processed_events``; request statuses are then updated with a single
+        ``UPDATE ... FROM (VALUES ...)`` and results written with one multi-row
+        ``INSERT ... ON CONFLICT DO UPDATE``. Returns the number of result rows written.
+        """
+        if not events:
+            return 0
+
+        fresh = await self._claim_events(
+            [(event_id, payload["request_id"]) for event_id, payload in events if event_id]
+        )
+        # Last event wins when a batch holds several events for one request
+        latest = {
+            payload["request_id"]: payload
+            for event_id, payload in events
+            if event_id is None or event_id in fresh
+        }
+        if not latest:
+            await self.session.commit()
+            logger.info("duplicate_batch_skipped", events=len(events))
+            return 0
+
+        status_type = GenerationRequest.__table__.c.status.type
+        statuses = values(
+            column("id", UUID(as_uuid=True)),
+            column("status", status_type),
+            name="batch_status",
+        ).data(
+            [
+                (
+                    request_id,
+                    GenerationStatus.COMPLETED
+                    if payload.get("status") == "success"
+                    else GenerationStatus.FAILED,
+                )
+                for request_id, payload in latest.items()
+            ]
+        )
+        updated = await self.session.execute(
+            update(GenerationRequest)
+            .where(GenerationRequest.id == statuses.c.id)
+            .values(status=cast(statuses.c.status, status_type), updated_at=func.now())
+            .returning(GenerationRequest.id, GenerationRequest.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        existing = {row.id: row.created_at for row in updated}
+        missing = latest.keys() - existing
+        if missing:
+            logger.error(
+                "generation_requests_not_found",
+                request_ids=[str(request_id) for request_id in missing],
+            )
+
+        rows = [
+            {"id": uuid.uuid4(), **_result_values(request_id, existing[request_id], payload)}
+            for request_id, payload in latest.items()
+            if request_id in existing and payload.get("status") == "success"
+        ]
+        if rows:
+            await self.session.execute(_upsert_results(rows))
+
+        await self.session.commit()
+        logger.info(
+            "generation_results_flushed",
+            events=len(events),
+            skipped=len(events) - len(latest),
+            requests=len(existing),
+            results=len(rows),
+        )
+        return len(rows)
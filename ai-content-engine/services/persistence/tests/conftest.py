@@ -0,0 +1,81 @@
+"""Fixtures for tests that need a real PostgreSQL.
+
+They run only when ``TEST_DATABASE_URL`` names an asyncpg database URL the
+tests may create databases with. A throwaway database is migrated to head
+once per session, so tests see the production schema (partitions, enum
+types, indexes); every table is truncated after each test.
+"""
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from shared.database import create_session_factory
+from shared.models import Base, Organization, PromptTemplate, User
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+ROOT = Path(__file__).resolve().parents[3]
+
+
+async def _execute_autocommit(url: str, statement: str) -> None:
+    engine = create_async_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    asyncio.run(_execute_autocommit(TEST_DATABASE_URL, f'CREATE DATABASE "{name}"'))
+    url = make_url(TEST_DATABASE_URL).set(database=name).render_as_string(hide_password=False)
+    try:
+        config = Config(str(ROOT / "alembic.ini"))
+        config.set_main_option("script_location", str(ROOT / "shared/shared/migrations"))
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+        command.upgrade(config, "head")
+        yield url
+    finally:
+        asyncio.run(
+            _execute_autocommit(TEST_DATABASE_URL, f'DROP DATABASE "{name}" WITH (FORCE)')
+        )
+
+
+@pytest.fixture
+async def session_factory(database_url) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(database_url)
+    try:
+        yield create_session_factory(engine)
+    finally:
+        tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+        await engine.dispose()
+
+
+@pytest.fixture
+async def owner(session_factory) -> dict[str, uuid.UUID]:
+    """An organization, a user and a template for generation requests to reference."""
+    org = Organization(name="Acme", slug=f"acme-{uuid.uuid4().hex[:8]}")
+    user = User(email=f"{uuid.uuid4().hex[:8]}@acme.test", name="Ann", organization=org)
+    async with session_factory() as session:
+        session.add_all([org, user])
+        await session.flush()
+        template = PromptTemplate(
+            name="t", system_prompt="s", user_prompt="u", content_hash="0" * 64, created_by=user.id
+        )
+        session.add(template)
+        await session.commit()
+    return {"organization_id": org.id, "user_id": user.id, "template_id": template.id}
@@ -0,0 +1,112 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from shared.archive import LocalArchiveStore, load_archived_record
+from shared.models import GenerationRequest, GenerationResult, StorageTier
+from shared.utils.datetime import utcnow
+from persistence.services.lifecycle_service import ResultLifecycleService
+
+LATER = timedelta(days=400)
+
+
+def lifecycle(session_factory, store) -> ResultLifecycleService:
+    return ResultLifecycleService(
+        session_factory, store, warm_after=timedelta(days=30), cold_after=timedelta(days=90)
+    )
+
+
+async def create_results(session_factory, owner, count: int) -> dict[uuid.UUID, dict]:
+    """Hot results keyed by id, with the fields archiving moves out of the row."""
+    fields = {}
+    async with session_factory() as session:
+        for i in range(count):
+            request = GenerationRequest(**owner)
+            session.add(request)
+            await session.flush()
+            result = GenerationResult(
+                request_id=request.id,
+                request_created_at=request.created_at,
+                model_provider="anthropic",
+                model_id="claude-3-haiku-20240307",
+                raw_response=f'{{"n": {i}}}',
+                parsed_output={"n": i},
+            )
+            session.add(result)
+            await session.flush()
+            fields[result.id] = {"raw_response": result.raw_response, "parsed_output": {"n": i}}
+        await session.commit()
+    return fields
+
+
+async def load_results(session_factory) -> list[GenerationResult]:
+    async with session_factory() as session:
+        query = select(GenerationResult).order_by(GenerationResult.created_at, GenerationResult.id)
+        return list((await session.scalars(query)).all())
+
+
+async def test_archive_hot_moves_fields_into_a_segment_named_by_the_batch(
+    session_factory, owner, tmp_path
+):
+    fields = await create_results(session_factory, owner, 3)
+    store = LocalArchiveStore(str(tmp_path))
+
+    assert await lifecycle(session_factory, store).archive_hot(now=utcnow() + LATER) == 3
+
+    results = await load_results(session_factory)
+    uris = {r.archive_uri for r in results}
+    assert len(uris) == 1
+    (uri,) = uris
+    assert uri.endswith(f"/{results[0].id}-{results[-1].id}.json.zst")
+    for result in results:
+        assert result.storage_tier == StorageTier.WARM
+        assert (result.raw_response, result.parsed_output) == ("", None)
+        assert await load_archived_record(store, uri, result.id) == fields[result.id]
+
+
+async def test_archived_fields_rehydrate_from_the_cold_tier(session_factory, owner, tmp_path):
+    fields = await create_results(session_factory, owner, 2)
+    store = LocalArchiveStore(str(tmp_path))
+    service = lifecycle(session_factory, store)
+
+    await service.archive_hot(now=utcnow() + LATER)
+    assert await service.demote_warm(now=utcnow() + LATER) == 1
+
+    results = await load_results(session_factory)
+    assert {r.storage_tier for r in results} == {StorageTier.COLD}
+    assert not list((tmp_path / StorageTier.WARM.value).rglob("*.zst"))
+    for result in results:
+        assert await load_archived_record(store, result.archive_uri, result.id) == fields[
+            result.id
+        ]
+
+
+class FailingCommits:
+    """Session factory whose sessions fail to commit."""
+
+    def __init__(self, session_factory) -> None:
+        self._session_factory = session_factory
+
+    def __call__(self):
+        session = self._session_factory()
+
+        async def commit() -> None:
+            raise ConnectionError("connection lost")
+
+        session.commit = commit
+        return session
+
+
+async def test_failed_commit_deletes_the_segment(session_factory, owner, tmp_path):
+    fields = await create_results(session_factory, owner, 2)
+    store = LocalArchiveStore(str(tmp_path))
+
+    with pytest.raises(ConnectionError):
+        await lifecycle(FailingCommits(session_factory), store).archive_hot(now=utcnow() + LATER)
+
+    assert not list(tmp_path.rglob("*.zst"))
+    for result in await load_results(session_factory):
+        assert result.storage_tier == StorageTier.HOT
+        assert result.raw_response == fields[result.id]["raw_response"]
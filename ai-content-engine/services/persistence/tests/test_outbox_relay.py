@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import func, select
+
+from shared import outbox
+from shared.models.event import OutboxEvent
+from shared.outbox import OutboxRelay, enqueue
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class FakeProducer:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.sent: list[tuple] = []
+
+    async def send_many(self, messages) -> None:
+        messages = list(messages)
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        self.sent.extend(messages)
+
+
+async def enqueue_messages(session_factory, count: int, start: int = 0) -> None:
+    async with session_factory() as session:
+        messages = [("topic", {"n": n}, f"key-{n}") for n in range(start, start + count)]
+        await enqueue(session, messages)
+        await session.commit()
+
+
+async def outbox_size(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count(OutboxEvent.id)))).scalar_one()
+
+
+async def test_relay_publishes_in_order_and_deletes(session_factory):
+    await enqueue_messages(session_factory, 3)
+    producer = FakeProducer()
+
+    assert await OutboxRelay(session_factory, producer).run_once() == 3
+
+    assert [(topic, value, key) for topic, value, key, _ in producer.sent] == [
+        ("topic", {"n": n}, f"key-{n}") for n in range(3)
+    ]
+    assert await outbox_size(session_factory) == 0
+    assert await OutboxRelay(session_factory, producer).run_once() == 0
+
+
+async def test_relay_drains_in_batches(session_factory):
+    await enqueue_messages(session_factory, 5)
+    producer = FakeProducer()
+    relay = OutboxRelay(session_factory, producer, batch_size=2)
+
+    assert [await relay.run_once() for _ in range(4)] == [2, 2, 1, 0]
+    assert [value["n"] for _, value, _, _ in producer.sent] == list(range(5))
+
+
+async def test_failed_publish_keeps_rows_for_the_next_pass(session_factory):
+    await enqueue_messages(session_factory, 2)
+    producer = FakeProducer(fail=True)
+    relay = OutboxRelay(session_factory, producer)
+
+    with pytest.raises(ConnectionError):
+        await relay.run_once()
+    assert await outbox_size(session_factory) == 2
+
+    producer.fail = False
+    assert await relay.run_once() == 2
+    assert await outbox_size(session_factory) == 0
+
+
+async def test_rows_locked_by_another_relay_are_skipped(session_factory):
+    await enqueue_messages(session_factory, 4)
+    producer = FakeProducer()
+
+    async with session_factory() as other:
+        # Another relay holds the two oldest rows mid-publish
+        locked = select(OutboxEvent.id).order_by(OutboxEvent.id).limit(2).with_for_update()
+        await other.execute(locked)
+
+        assert await OutboxRelay(session_factory, producer).run_once() == 2
+
+    assert [value["n"] for _, value, _, _ in producer.sent] == [2, 3]
+    assert await outbox_size(session_factory) == 2
+
+
+async def test_trace_context_is_published_as_headers(session_factory, monkeypatch):
+    monkeypatch.setattr(outbox, "current_carrier", lambda: {"traceparent": TRACEPARENT})
+    await enqueue_messages(session_factory, 1)
+    monkeypatch.setattr(outbox, "current_carrier", dict)
+    await enqueue_messages(session_factory, 1, start=1)
+    producer = FakeProducer()
+
+    await OutboxRelay(session_factory, producer).run_once()
+
+    assert [headers for *_, headers in producer.sent] == [
+        [("traceparent", TRACEPARENT.encode())],
+        [],
+    ]
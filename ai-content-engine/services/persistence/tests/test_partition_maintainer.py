@@ -0,0 +1,83 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import func, select, text
+
+from shared.models import GenerationRequest, GenerationResult
+from shared.partitions import (
+    PARTITIONED_TABLES,
+    PartitionMaintainer,
+    default_partition_name,
+    ensure_partitions,
+    list_partitions,
+)
+
+MAY = date(2019, 5, 1)
+JUNE = date(2019, 6, 1)
+
+
+async def create_generation(session_factory, owner, created_at: datetime, legal_hold=False):
+    async with session_factory() as session:
+        request = GenerationRequest(**owner, created_at=created_at)
+        session.add(request)
+        await session.flush()
+        session.add(
+            GenerationResult(
+                request_id=request.id,
+                request_created_at=created_at,
+                model_provider="anthropic",
+                model_id="claude-3-haiku-20240307",
+                raw_response="{}",
+                legal_hold=legal_hold,
+            )
+        )
+        await session.commit()
+
+
+async def count(session, table: str) -> int:
+    return (await session.execute(text(f'SELECT count(*) FROM "{table}"'))).scalar_one()
+
+
+async def test_ensure_partitions_moves_default_rows_into_their_month(session_factory, owner):
+    created_at = datetime(2019, 5, 10, 8, tzinfo=timezone.utc)
+    await create_generation(session_factory, owner, created_at)
+
+    async with session_factory() as session:
+        for table in PARTITIONED_TABLES:
+            assert await count(session, default_partition_name(table)) == 1
+        await ensure_partitions(session, MAY, JUNE)
+        await session.commit()
+
+    async with session_factory() as session:
+        for table in PARTITIONED_TABLES:
+            partitions = await list_partitions(session, table)
+            assert {MAY, JUNE} <= partitions.keys()
+            assert await count(session, default_partition_name(table)) == 0
+            assert await count(session, partitions[MAY]) == 1
+        # Still reachable through the parents, with the foreign key intact
+        joined = select(func.count()).select_from(GenerationRequest).join(GenerationResult)
+        assert (await session.execute(joined)).scalar_one() == 1
+
+
+async def test_drop_expired_keeps_months_under_legal_hold(session_factory, owner):
+    await create_generation(
+        session_factory, owner, datetime(2019, 5, 3, tzinfo=timezone.utc), legal_hold=True
+    )
+    await create_generation(session_factory, owner, datetime(2019, 6, 3, tzinfo=timezone.utc))
+    maintainer = PartitionMaintainer(session_factory, retention_months=1)
+    async with session_factory() as session:
+        await ensure_partitions(session, MAY, JUNE)
+        await session.commit()
+
+    dropped = await maintainer.drop_expired(now=datetime(2019, 8, 15, tzinfo=timezone.utc))
+
+    assert sorted(dropped) == ["generation_requests_p2019_06", "generation_results_p2019_06"]
+    async with session_factory() as session:
+        for table in PARTITIONED_TABLES:
+            months = (await list_partitions(session, table)).keys()
+            assert MAY in months
+            assert JUNE not in months
+        assert (await session.execute(select(func.count(GenerationResult.id)))).scalar_one() == 1
+
+
+async def test_drop_expired_is_off_without_retention(session_factory):
+    assert await PartitionMaintainer(session_factory).drop_expired() == []
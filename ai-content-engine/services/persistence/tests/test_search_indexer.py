@@ -0,0 +1,177 @@
+import asyncio
+
+import httpx
+import pytest
+
+from persistence.services import search_indexer
+from persistence.services.search_indexer import BulkIndexer, InMemorySearchBackend
+
+INDEX = "generation_results"
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record backoff delays instead of sleeping; jitter is pinned to 1x."""
+    delays: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, result=None):
+        delays.append(delay)
+        return await real_sleep(0, result)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(search_indexer.random, "random", lambda: 0.5)
+    return delays
+
+
+class GatedBackend(InMemorySearchBackend):
+    """Holds every bulk request until ``gate`` is set, tracking concurrency."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.active = 0
+        self.max_active = 0
+
+    async def bulk(self, body: str) -> dict:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.gate.wait()
+            return await super().bulk(body)
+        finally:
+            self.active -= 1
+
+
+class FlakyBackend(InMemorySearchBackend):
+    def __init__(self, errors: int) -> None:
+        super().__init__()
+        self.errors = errors
+
+    async def bulk(self, body: str) -> dict:
+        if self.errors:
+            self.errors -= 1
+            self.requests += 1
+            raise httpx.ConnectError("connection refused")
+        return await super().bulk(body)
+
+
+def add_docs(indexer: BulkIndexer, count: int) -> None:
+    for i in range(count):
+        indexer.add(f"doc-{i}", {"n": i})
+
+
+async def wait_for_docs(backend: InMemorySearchBackend, count: int) -> None:
+    async def indexed() -> None:
+        while len(backend.indices.get(INDEX, {})) < count:
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(indexed(), timeout=2.0)
+
+
+async def test_flushes_when_max_docs_are_buffered():
+    backend = InMemorySearchBackend()
+    indexer = BulkIndexer(backend, max_docs=3, flush_interval_ms=60_000)
+    await indexer.start()
+
+    add_docs(indexer, 3)
+    await wait_for_docs(backend, 3)
+
+    assert backend.requests == 1
+    assert backend.indices[INDEX]["doc-2"] == {"n": 2}
+    await indexer.stop()
+
+
+async def test_flushes_a_partial_batch_after_the_interval():
+    backend = InMemorySearchBackend()
+    indexer = BulkIndexer(backend, max_docs=100, flush_interval_ms=20)
+    await indexer.start()
+
+    add_docs(indexer, 2)
+    await wait_for_docs(backend, 2)
+
+    assert backend.requests == 1
+    await indexer.stop()
+
+
+async def test_stop_flushes_buffered_documents():
+    backend = InMemorySearchBackend()
+    indexer = BulkIndexer(backend, max_docs=2, flush_interval_ms=60_000)
+
+    add_docs(indexer, 5)
+    await indexer.stop()
+
+    assert len(backend.indices[INDEX]) == 5
+    assert backend.requests == 3
+
+
+async def test_full_buffer_drops_new_documents():
+    backend = InMemorySearchBackend()
+    indexer = BulkIndexer(backend, max_docs=10, max_buffer=3)
+
+    add_docs(indexer, 5)
+    await indexer.stop()
+
+    assert indexer.dropped == 2
+    assert sorted(backend.indices[INDEX]) == ["doc-0", "doc-1", "doc-2"]
+
+
+async def test_in_flight_requests_are_bounded():
+    backend = GatedBackend()
+    indexer = BulkIndexer(backend, max_docs=1, max_concurrency=2)
+    add_docs(indexer, 5)
+
+    flush = asyncio.create_task(indexer.flush())
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # Two requests are held at the gate and the flush loop waits for a slot
+    assert backend.active == 2
+    assert not flush.done()
+
+    backend.gate.set()
+    await flush
+    await indexer.stop()
+
+    assert backend.max_active == 2
+    assert len(backend.indices[INDEX]) == 5
+
+
+async def test_retries_only_retryable_item_failures(sleeps):
+    backend = InMemorySearchBackend()
+    backend.fail_next(1, status=400)
+    backend.fail_next(1, status=429)
+    indexer = BulkIndexer(backend, max_docs=10)
+
+    add_docs(indexer, 3)
+    await indexer.stop()
+
+    # doc-0 is rejected for good, doc-1 is re-sent alone and succeeds
+    assert backend.requests == 2
+    assert sorted(backend.indices[INDEX]) == ["doc-1", "doc-2"]
+    assert sleeps == [pytest.approx(0.2)]
+
+
+async def test_backoff_grows_until_retries_are_exhausted(sleeps):
+    backend = InMemorySearchBackend()
+    backend.fail_next(10, status=503)
+    indexer = BulkIndexer(backend, max_docs=10, max_retries=3)
+
+    indexer.add("doc-0", {"n": 0})
+    await indexer.stop()
+
+    assert backend.requests == 4
+    assert INDEX not in backend.indices
+    assert sleeps == [pytest.approx(0.2), pytest.approx(0.4), pytest.approx(0.8)]
+
+
+async def test_request_errors_are_retried(sleeps):
+    backend = FlakyBackend(errors=2)
+    indexer = BulkIndexer(backend, max_docs=10)
+
+    add_docs(indexer, 2)
+    await indexer.stop()
+
+    assert backend.requests == 3
+    assert len(backend.indices[INDEX]) == 2
+    assert len(sleeps) == 2
@@ -0,0 +1,109 @@
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from shared.models import GenerationRequest, GenerationResult, GenerationStatus
+from persistence.services.storage_service import UNKNOWN_MODEL, StorageService
+
+
+async def create_requests(session_factory, owner, count: int) -> list[uuid.UUID]:
+    requests = [GenerationRequest(**owner) for _ in range(count)]
+    async with session_factory() as session:
+        session.add_all(requests)
+        await session.commit()
+    return [r.id for r in requests]
+
+
+def success(request_id: uuid.UUID, **fields) -> dict:
+    return {
+        "request_id": request_id,
+        "status": "success",
+        "raw_response": '{"title": "Hi"}',
+        "parsed_output": {"title": "Hi"},
+        "validation_results": {"status": "passed"},
+        "model_provider": "anthropic",
+        "model_id": "claude-3-haiku-20240307",
+        "token_usage": {"total_tokens": 42},
+        "cost_usd": 0.0125,
+        "timing_ms": {"inference": 120.0},
+        **fields,
+    }
+
+
+async def load(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(select(GenerationRequest.id, GenerationRequest.status))
+        statuses = dict(rows.all())
+        results = {r.request_id: r for r in (await session.scalars(select(GenerationResult))).all()}
+    return statuses, results
+
+
+async def test_store_results_bulk_writes_results_and_statuses(session_factory, owner):
+    ok, failed = await create_requests(session_factory, owner, 2)
+    events = [
+        (uuid.uuid4(), success(ok)),
+        (uuid.uuid4(), {"request_id": failed, "status": "failed", "raw_response": "oops"}),
+    ]
+
+    async with session_factory() as session:
+        assert await StorageService(session).store_results_bulk(events) == 1
+
+    statuses, results = await load(session_factory)
+    assert statuses == {ok: GenerationStatus.COMPLETED, failed: GenerationStatus.FAILED}
+    assert results.keys() == {ok}
+    result = results[ok]
+    assert (result.model_provider, result.model_id) == ("anthropic", "claude-3-haiku-20240307")
+    assert result.token_usage == {"total_tokens": 42}
+    assert result.cost_usd == Decimal("0.012500")
+    assert result.parsed_output == {"title": "Hi"}
+    assert result.latency_ms == {"inference": 120.0}
+
+
+async def test_store_results_bulk_is_idempotent_and_upserts(session_factory, owner):
+    (request_id,) = await create_requests(session_factory, owner, 1)
+    event_id = uuid.uuid4()
+
+    async with session_factory() as session:
+        storage = StorageService(session)
+        assert await storage.store_results_bulk([(event_id, success(request_id))]) == 1
+        # Redelivery of the same event is skipped
+        assert await storage.store_results_bulk([(event_id, success(request_id))]) == 0
+        # A new event for the request replaces its result
+        repaired = success(request_id, model_id="gemini-1.5-flash", model_provider="google")
+        assert await storage.store_results_bulk([(uuid.uuid4(), repaired)]) == 1
+
+    _, results = await load(session_factory)
+    assert len(results) == 1
+    assert results[request_id].model_id == "gemini-1.5-flash"
+
+
+async def test_store_results_bulk_tolerates_unattributed_and_unknown_requests(
+    session_factory, owner
+):
+    (request_id,) = await create_requests(session_factory, owner, 1)
+    legacy = {
+        k: v for k, v in success(request_id).items()
+        if k not in ("model_provider", "model_id", "token_usage", "cost_usd")
+    }
+    events = [(uuid.uuid4(), legacy), (uuid.uuid4(), success(uuid.uuid4()))]
+
+    async with session_factory() as session:
+        assert await StorageService(session).store_results_bulk(events) == 1
+
+    _, results = await load(session_factory)
+    result = results[request_id]
+    assert (result.model_provider, result.model_id) == (UNKNOWN_MODEL, UNKNOWN_MODEL)
+    assert result.token_usage == {}
+    assert result.cost_usd == 0
+
+
+async def test_store_result_single_event(session_factory, owner):
+    (request_id,) = await create_requests(session_factory, owner, 1)
+
+    async with session_factory() as session:
+        await StorageService(session).store_result(request_id, success(request_id), uuid.uuid4())
+
+    statuses, results = await load(session_factory)
+    assert statuses[request_id] == GenerationStatus.COMPLETED
+    assert results[request_id].model_provider == "anthropic"
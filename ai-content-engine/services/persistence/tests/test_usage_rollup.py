@@ -0,0 +1,69 @@
+import uuid
+from decimal import Decimal
+
+import fakeredis
+from sqlalchemy import select
+
+from shared.models import GenerationRequest
+from shared.models.quota import Usage
+from shared.quotas import USAGE_QUEUE_KEY, USAGE_ROLLUP_LOCK_KEY, UsageMeter, UsageRollup
+
+
+async def create_request(session_factory, owner) -> uuid.UUID:
+    request = GenerationRequest(**owner)
+    async with session_factory() as session:
+        session.add(request)
+        await session.commit()
+    return request.id
+
+
+async def usage_rows(session_factory) -> list[Usage]:
+    async with session_factory() as session:
+        return list((await session.scalars(select(Usage).order_by(Usage.tokens_used))).all())
+
+
+async def test_rollup_writes_queued_usage_in_batches(session_factory, owner):
+    redis = fakeredis.FakeAsyncRedis()
+    first, second = [await create_request(session_factory, owner) for _ in range(2)]
+    meter = UsageMeter(redis)
+    await meter.record(owner["organization_id"], first, tokens_used=10, cost_usd=0.001)
+    await meter.record(owner["organization_id"], second, tokens_used=20, cost_usd=0.002)
+    await meter.record(owner["organization_id"], first, tokens_used=30, cost_usd=0.003)
+
+    assert await UsageRollup(session_factory, redis, batch_size=2).run_once() == 3
+
+    rows = await usage_rows(session_factory)
+    assert [(r.request_id, r.tokens_used, r.cost_usd) for r in rows] == [
+        (first, 10, Decimal("0.001000")),
+        (second, 20, Decimal("0.002000")),
+        (first, 30, Decimal("0.003000")),
+    ]
+    assert {(r.organization_id, r.user_id) for r in rows} == {
+        (owner["organization_id"], owner["user_id"])
+    }
+    assert await redis.llen(USAGE_QUEUE_KEY) == 0
+
+
+async def test_entries_for_unknown_requests_are_dropped(session_factory, owner):
+    redis = fakeredis.FakeAsyncRedis()
+    known = await create_request(session_factory, owner)
+    meter = UsageMeter(redis)
+    await meter.record(owner["organization_id"], uuid.uuid4(), tokens_used=5, cost_usd=0)
+    await meter.record(owner["organization_id"], known, tokens_used=7, cost_usd=0)
+
+    assert await UsageRollup(session_factory, redis).run_once() == 1
+
+    assert [r.request_id for r in await usage_rows(session_factory)] == [known]
+    assert await redis.llen(USAGE_QUEUE_KEY) == 0
+
+
+async def test_rollup_skips_while_another_replica_holds_the_lock(session_factory, owner):
+    redis = fakeredis.FakeAsyncRedis()
+    request_id = await create_request(session_factory, owner)
+    await UsageMeter(redis).record(owner["organization_id"], request_id, 1, 0)
+    await redis.set(USAGE_ROLLUP_LOCK_KEY, "other-replica")
+
+    assert await UsageRollup(session_factory, redis).run_once() == 0
+
+    assert await redis.llen(USAGE_QUEUE_KEY) == 1
+    assert await usage_rows(session_factory) == []
@@ -0,0 +1,35 @@
+import uuid
+
+import pytest
+
+from persistence.kafka.consumer import handle_validation_complete
+
+
+class FailingStorage:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def store_result(self, request_id, data, event_id=None) -> None:
+        self.calls += 1
+        raise ConnectionError("database is down")
+
+
+def message(payload: dict) -> dict:
+    return {"event_id": str(uuid.uuid4()), "payload": payload}
+
+
+async def test_storage_failure_propagates_so_the_offset_is_not_committed():
+    storage = FailingStorage()
+    msg = message({"request_id": str(uuid.uuid4()), "status": "success", "raw_response": "{}"})
+
+    with pytest.raises(ConnectionError):
+        await handle_validation_complete(msg, storage)
+    assert storage.calls == 1
+
+
+async def test_invalid_payload_is_skipped():
+    storage = FailingStorage()
+
+    await handle_validation_complete(message({"request_id": "not-a-uuid"}), storage)
+
+    assert storage.calls == 0
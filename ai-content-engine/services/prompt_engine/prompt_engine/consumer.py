@@ -3,22 +3,30 @@
 import structlog
 
 from shared.database import get_session
+from shared.dedup import claim_event
+from shared.events import timing
 from shared.events.envelope import EventEnvelope
 from shared.events.input_events import InputReceivedEvent
 from shared.events.prompt_events import PromptAssembledEvent
+from shared.kafka.lanes import lane_topic
 from shared.models.template import PromptTemplate
+from shared.tracing import tracer
 
+from prompt_engine.config import settings
 from prompt_engine.services.template_compiler import TemplateCompiler
 from prompt_engine.services.prompt_assembler import PromptAssembler
 
 logger = structlog.get_logger(__name__)
 
+DEDUP_CONSUMER = "prompt_engine"
+
 compiler = TemplateCompiler()
 assembler = PromptAssembler()
 
 
 async def handle_input_received(message: dict) -> None:
     envelope = EventEnvelope(**message)
+    timings = timing.received(message, timing.PROMPT_RECEIVED)
     event = InputReceivedEvent(**envelope.payload)
 
     logger.info(
@@ -29,29 +37,44 @@ async def handle_input_received(message: dict) -> None:
     )
 
     async for session in get_session():
+        # The claim commits with the session after the send, so a failed send
+        # leaves the event unclaimed for the redelivery
+        if not await claim_event(session, DEDUP_CONSUMER, envelope.event_id, event.request_id):
+            logger.info(
+                "duplicate_event_skipped",
+                event_id=str(envelope.event_id),
+                request_id=str(event.request_id),
+            )
+            return
+
         template = await session.get(PromptTemplate, event.template_id)
         if template is None:
             logger.error("template_not_found", template_id=str(event.template_id))
             return
 
-        system_prompt = compiler.render(template.system_prompt, event.parameters)
-        user_prompt = compiler.render(template.user_prompt, event.parameters)
+        with tracer.start_as_current_span(
+            "prompt.render", attributes={"template.id": str(event.template_id)}
+        ):
+            system_prompt = compiler.render(template.system_prompt, event.parameters)
+            user_prompt = compiler.render(template.user_prompt, event.parameters)
 
-        assembled = assembler.assemble(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            few_shot_examples=template.few_shot_examples,
-        )
+            assembled = assembler.assemble(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                few_shot_examples=template.few_shot_examples,
+            )
 
         prompt_event = PromptAssembledEvent(
             request_id=event.request_id,
             correlation_id=event.correlation_id,
+            organization_id=event.organization_id,
             template_id=event.template_id,
             template_version=template.version,
             system_prompt=assembled["system_prompt"],
             user_prompt=assembled["user_prompt"],
             model_requirements=event.options.get("model_requirements", {}),
             content_hash=template.content_hash,
+            priority=event.priority,
         )
 
         out_envelope = EventEnvelope(
@@ -59,12 +82,13 @@ async def handle_input_received(message: dict) -> None:
             correlation_id=event.correlation_id,
             source_service="prompt_engine",
             payload=prompt_event.model_dump(mode="json"),
+            timings=timing.stamp(timings, timing.PROMPT_PUBLISHED),
         )
 
         from prompt_engine.main import producer
         if producer:
             await producer.send(
-                "content.prompt.assembled",
+                lane_topic(settings.output_topic, event.priority),
                 value=out_envelope.to_kafka_value(),
                 key=out_envelope.kafka_key,
             )
@@ -5,13 +5,17 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
+from redis.asyncio import Redis
 import uvicorn
 
+from shared.admission import ConsumerLagReporter
 from shared.database import init_database
 from shared.kafka import AsyncKafkaConsumer, AsyncKafkaProducer
 from shared.logging import setup_logging
+from shared.metrics import MetricsMiddleware, metrics_router
 from shared.middleware.correlation import CorrelationIDMiddleware
 from shared.middleware.error_handler import register_error_handlers
+from shared.tracing import setup_tracing, shutdown_tracing
 
 from prompt_engine.config import settings
 from prompt_engine.consumer import handle_input_received
@@ -23,8 +27,19 @@ producer: AsyncKafkaProducer | None = None
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     global producer
-    setup_logging(settings.service_name, settings.log_level, settings.environment)
-    init_database(settings.database_url, settings.database_pool_size, settings.database_max_overflow)
+    setup_logging(
+        settings.service_name,
+        settings.log_level,
+        settings.environment,
+        message_sample_rate=settings.log_message_sample_rate,
+        queue_size=settings.log_queue_size,
+    )
+    setup_tracing(
+        settings.service_name,
+        settings.otel_exporter_otlp_endpoint,
+        settings.otel_trace_sample_ratio,
+    )
+    init_database(settings.database_url, **settings.database_engine_options())
 
     producer = AsyncKafkaProducer(settings.kafka_bootstrap_servers)
     await producer.start()
@@ -35,18 +50,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         bootstrap_servers=settings.kafka_bootstrap_servers,
         group_id=settings.kafka_consumer_group,
         handler=handle_input_received,
+        lane_weights=settings.kafka_lane_weights,
+        lane_starvation_ms=settings.kafka_lane_starvation_ms,
     )
     await consumer.start()
     consumer_task = asyncio.create_task(consumer.run())
+    redis = Redis.from_url(settings.redis_url)
+    lag_reporter = ConsumerLagReporter(
+        redis,
+        consumer,
+        settings.kafka_consumer_group,
+        interval_seconds=settings.pipeline_lag_report_interval_seconds,
+    )
+    background_tasks = [consumer_task, asyncio.create_task(lag_reporter.run_forever())]
 
     yield
 
-    consumer_task.cancel()
-    try:
-        await consumer_task
-    except asyncio.CancelledError:
-        pass
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await redis.aclose()
     await producer.stop()
+    shutdown_tracing()
 
 
 app = FastAPI(
@@ -55,10 +84,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-app.add_middleware(CorrelationIDMiddleware)
+app.add_middleware(
+    CorrelationIDMiddleware, access_log_sample_rate=settings.access_log_sample_rate
+)
+app.add_middleware(MetricsMiddleware)
 register_error_handlers(app)
 
 from prompt_engine.api.v1 import health  # noqa: E402
+app.include_router(metrics_router)
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 
 
@@ -0,0 +1,129 @@
+"""Pipeline backlog gauge and priority-based admission control.
+
+Every pipeline consumer periodically reports its consumer-group lag per
+priority lane to Redis, in a short-lived hash per consumer instance.
+Ingestion refreshes the backlog of the most lagged consumer group in the
+background. New requests are then checked against per-priority thresholds
+in memory, so low-priority work is shed first and no request pays for the
+lookup. Reports that stop arriving expire, and the gauge then reads as
+empty (fail open).
+"""
+
+import asyncio
+import math
+import uuid
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from shared.exceptions import RateLimitError
+from shared.kafka import AsyncKafkaConsumer
+from shared.kafka.lanes import LANES
+from shared.metrics import KAFKA_CONSUMER_LAG
+
+logger = structlog.get_logger(__name__)
+
+LAG_KEY_PREFIX = "pipeline:lag:"
+
+# Backlog (messages) above which new requests of each priority are shed
+DEFAULT_SHED_THRESHOLDS = {"low": 1_000, "normal": 5_000, "high": 20_000}
+
+
+class ConsumerLagReporter:
+    """Publishes one consumer's lag per lane under its group."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        consumer: AsyncKafkaConsumer,
+        group_id: str,
+        interval_seconds: float = 5.0,
+    ) -> None:
+        self._redis = redis
+        self._consumer = consumer
+        self._key = f"{LAG_KEY_PREFIX}{group_id}:{uuid.uuid4()}"
+        self._interval = interval_seconds
+        self._lag_gauges = {lane: KAFKA_CONSUMER_LAG.labels(group_id, lane) for lane in LANES}
+
+    async def run_once(self) -> None:
+        lag = await self._consumer.lag()
+        for lane, gauge in self._lag_gauges.items():
+            gauge.set(lag.get(lane, 0))
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(self._key)
+        if lag:
+            pipe.hset(self._key, mapping=lag)
+            # Outlives a few missed reports, then drops out of the gauge
+            pipe.expire(self._key, max(1, math.ceil(self._interval * 3)))
+        await pipe.execute()
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("consumer_lag_report_failed")
+            await asyncio.sleep(self._interval)
+
+
+class AdmissionController:
+    """Sheds new requests by priority when the pipeline backlog is too deep.
+
+    The backlog is the total lag across lanes of the most lagged consumer
+    group, since the slowest stage bounds end-to-end latency. A request is
+    rejected with RateLimitError once the backlog exceeds its priority's
+    threshold. Retry-After grows with how far past the threshold the
+    backlog is.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        thresholds: dict[str, int] | None = None,
+        refresh_interval_seconds: float = 1.0,
+        retry_after_seconds: int = 5,
+        max_retry_after_seconds: int = 60,
+    ) -> None:
+        self._redis = redis
+        self._thresholds = thresholds or DEFAULT_SHED_THRESHOLDS
+        self._refresh_interval = refresh_interval_seconds
+        self._retry_after = retry_after_seconds
+        self._max_retry_after = max_retry_after_seconds
+        self.backlog = 0
+
+    def check(self, priority: str) -> None:
+        threshold = self._thresholds.get(priority)
+        if threshold is None or self.backlog <= threshold:
+            return
+        retry_after = min(
+            self._max_retry_after, math.ceil(self._retry_after * self.backlog / max(threshold, 1))
+        )
+        logger.info(
+            "request_shed", priority=priority, backlog=self.backlog, threshold=threshold
+        )
+        raise RateLimitError(
+            message="Pipeline is overloaded, retry later", retry_after=retry_after
+        )
+
+    async def refresh(self) -> None:
+        groups: dict[str, int] = {}
+        async for key in self._redis.scan_iter(match=f"{LAG_KEY_PREFIX}*", count=100):
+            key = key.decode() if isinstance(key, bytes) else key
+            group = key[len(LAG_KEY_PREFIX):].rsplit(":", 1)[0]
+            lanes = await self._redis.hvals(key)
+            groups[group] = groups.get(group, 0) + sum(int(v) for v in lanes)
+        self.backlog = max(groups.values(), default=0)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except RedisError as e:
+                # Keep the last reading rather than admitting everything on a blip
+                logger.warning("admission_refresh_failed", error=str(e))
+            await asyncio.sleep(self._refresh_interval)
@@ -0,0 +1,75 @@
+"""Compressed archive segments for results moved out of the hot table."""
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Protocol
+
+import zstandard
+
+ARCHIVE_SCHEME = "local://"
+
+
+class ArchiveStore(Protocol):
+    """Object store holding archived result segments."""
+
+    async def put(self, tier: str, key: str, data: bytes) -> str:
+        """Store data and return its URI."""
+        ...
+
+    async def get(self, uri: str) -> bytes: ...
+
+    async def delete(self, uri: str) -> None: ...
+
+
+class LocalArchiveStore:
+    """Filesystem stand-in for an object store (e.g. S3/GCS buckets per tier)."""
+
+    def __init__(self, root: str) -> None:
+        self._root = Path(root)
+
+    def _path(self, uri: str) -> Path:
+        if not uri.startswith(ARCHIVE_SCHEME):
+            raise ValueError(f"Unsupported archive URI: {uri}")
+        path = (self._root / uri[len(ARCHIVE_SCHEME):]).resolve()
+        if not path.is_relative_to(self._root.resolve()):
+            raise ValueError(f"Archive URI escapes the archive root: {uri}")
+        return path
+
+    async def put(self, tier: str, key: str, data: bytes) -> str:
+        uri = f"{ARCHIVE_SCHEME}{tier}/{key}"
+        path = self._path(uri)
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+
+        await asyncio.to_thread(write)
+        return uri
+
+    async def get(self, uri: str) -> bytes:
+        return await asyncio.to_thread(self._path(uri).read_bytes)
+
+    async def delete(self, uri: str) -> None:
+        await asyncio.to_thread(self._path(uri).unlink, True)
+
+
+def encode_segment(records: dict[uuid.UUID, dict[str, Any]], level: int = 10) -> bytes:
+    """Serialize result records keyed by result id into a zstd-compressed segment."""
+    body = json.dumps({str(k): v for k, v in records.items()}, default=str)
+    return zstandard.ZstdCompressor(level=level).compress(body.encode("utf-8"))
+
+
+def decode_segment(data: bytes) -> dict[str, dict[str, Any]]:
+    """Inverse of encode_segment; keys are result ids as strings."""
+    return json.loads(zstandard.ZstdDecompressor().decompress(data))
+
+
+async def load_archived_record(
+    store: ArchiveStore, uri: str, result_id: uuid.UUID
+) -> dict[str, Any] | None:
+    """Fetch the archived fields of a single result from its segment."""
+    return decode_segment(await store.get(uri)).get(str(result_id))
@@ -15,12 +15,64 @@ class BaseServiceSettings(BaseSettings):
     database_url: str
     database_pool_size: int = 20
     database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 300
+    # Off by default: disconnects invalidate the pool instead of pinging each checkout
+    database_pool_pre_ping: bool = False
+    database_statement_cache_size: int = 100
+    # Connecting through PgBouncer in transaction pooling mode: no prepared statement cache,
+    # and a small client-side pool since the bouncer multiplexes server connections
+    database_pgbouncer: bool = False
+    database_pgbouncer_pool_size: int = 5
+    database_pgbouncer_max_overflow: int = 0
+    # Read replicas for read-only queries, used while within the lag tolerance
+    database_replica_urls: list[str] = []
+    database_replica_max_lag_seconds: float = 1.0
+    database_replica_check_interval_seconds: float = 1.0
     kafka_bootstrap_servers: str = "localhost:9092"
     kafka_consumer_group: str = ""
+    # Priority lanes (shared.kafka.lanes): relative drain weights and the wait
+    # after which a lane is served regardless of weight
+    kafka_lane_weights: dict[str, int] = {"high": 8, "normal": 3, "low": 1}
+    kafka_lane_starvation_ms: int = 5000
+    # How often consumers report their lag for ingestion admission control
+    pipeline_lag_report_interval_seconds: float = 5.0
     redis_url: str = "redis://localhost:6379/0"
     elasticsearch_url: str = "http://localhost:9200"
+    archive_root: str = "/var/lib/ai-content-engine/archive"
     jwt_secret: str = "dev-secret-change-in-production-minimum-32-chars"
     jwt_algorithm: str = "HS256"
+    # Local JWKS file of public keys for tokens carrying a ``kid``; empty disables
+    jwt_jwks_path: str = ""
+    # Verified claims are reused until the token's exp, at most this long
+    jwt_claims_cache_seconds: float = 300.0
+    jwt_claims_cache_size: int = 10_000
     log_level: str = "INFO"
+    # Fraction of per-message INFO events kept (shared.logging.PER_MESSAGE_EVENTS)
+    log_message_sample_rate: float = 1.0
+    # Production log lines buffered for the writer thread before lines are dropped
+    log_queue_size: int = 10_000
+    # Fraction of HTTP requests given an access log line; 5xx responses are always logged
+    access_log_sample_rate: float = 1.0
+    # OTLP/HTTP collector base URL (e.g. http://localhost:4318); empty disables export
+    otel_exporter_otlp_endpoint: str = ""
+    otel_trace_sample_ratio: float = 1.0
     environment: str = "development"
     service_name: str = ""
+
+    def database_engine_options(self) -> dict:
+        """Pool and driver options for ``shared.database.init_database``."""
+        if self.database_pgbouncer:
+            pool_size = self.database_pgbouncer_pool_size
+            max_overflow = self.database_pgbouncer_max_overflow
+        else:
+            pool_size, max_overflow = self.database_pool_size, self.database_max_overflow
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": self.database_pool_timeout_seconds,
+            "pool_recycle": self.database_pool_recycle_seconds,
+            "pool_pre_ping": self.database_pool_pre_ping,
+            "statement_cache_size": self.database_statement_cache_size,
+            "pgbouncer": self.database_pgbouncer,
+        }
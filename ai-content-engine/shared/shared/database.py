@@ -1,31 +1,137 @@
-"""Database engine and session management."""
+"""Database engine and session management.
 
-from collections.abc import AsyncGenerator
+Besides the primary engine, ``init_database`` can set up read replicas.
+Read-only queries take a session from ``get_read_session``, which picks a
+replica within the staleness tolerance (or the primary when none is).
+``WriteStickiness`` sends a client's reads to the primary for a while
+after it writes, so it reads its own writes.
+"""
 
+import asyncio
+import itertools
+import math
+import time
+import uuid
+from collections.abc import AsyncGenerator, Sequence
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from shared.metrics import (
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_TIMEOUTS,
+    DB_REPLICA_LAG_SECONDS,
+)
+from shared.utils.cache import TTLCache
+
+logger = structlog.get_logger(__name__)
 
 _engine = None
 _session_factory = None
+_replica_router: "ReplicaRouter | None" = None
+
+# Seconds the replica is behind the primary; 0 when it has replayed all WAL it received
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+STICKY_KEY_PREFIX = "db:sticky:"
+
+
+def _instrumented_pool_class(name: str) -> type[AsyncAdaptedQueuePool]:
+    """Queue pool class recording checkout waits and timeouts under ``name``.
+
+    A class per pool name, because SQLAlchemy recreates pools (e.g. on
+    ``dispose``) from the class alone.
+    """
+    checkout_seconds = DB_POOL_CHECKOUT_SECONDS.labels(name)
+    timeouts = DB_POOL_TIMEOUTS.labels(name)
+
+    class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                timeouts.inc()
+                raise
+            finally:
+                checkout_seconds.observe(time.perf_counter() - start)
+
+    return InstrumentedQueuePool
+
+
+def _report_pool_connections(engine: AsyncEngine, name: str) -> None:
+    """Gauge the engine's current pool at scrape time."""
+    DB_POOL_CONNECTIONS.labels(name, "checked_out").set_function(
+        lambda: engine.pool.checkedout()
+    )
+    DB_POOL_CONNECTIONS.labels(name, "idle").set_function(lambda: engine.pool.checkedin())
+    DB_POOL_CONNECTIONS.labels(name, "overflow").set_function(
+        lambda: max(0, engine.pool.overflow())
+    )
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
 
 
 def create_engine(
     database_url: str,
     pool_size: int = 20,
     max_overflow: int = 10,
-):
-    """Create an async SQLAlchemy engine."""
-    return create_async_engine(
+    pool_timeout: float = 30.0,
+    pool_recycle: int = 300,
+    pool_pre_ping: bool = False,
+    statement_cache_size: int = 100,
+    pgbouncer: bool = False,
+    name: str = "primary",
+) -> AsyncEngine:
+    """Create an async SQLAlchemy engine.
+
+    Pre-ping is off by default: instead of a round trip on every checkout,
+    a connection that fails with a disconnect error is invalidated along
+    with the rest of the pool, so only the statement that hit it fails.
+    ``statement_cache_size`` sizes asyncpg's per-connection prepared
+    statement cache. ``pgbouncer`` makes the engine safe behind PgBouncer
+    in transaction pooling mode, where consecutive statements can land on
+    different server connections: statements are never cached and get
+    unique names.
+    """
+    connect_args: dict = {}
+    if make_url(database_url).get_driver_name() == "asyncpg":
+        if pgbouncer:
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _unique_statement_name,
+            }
+        else:
+            connect_args = {"prepared_statement_cache_size": statement_cache_size}
+    engine = create_async_engine(
         database_url,
         pool_size=pool_size,
         max_overflow=max_overflow,
-        pool_pre_ping=True,
-        pool_recycle=300,
+        poolclass=_instrumented_pool_class(name),
+        pool_timeout=pool_timeout,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        connect_args=connect_args,
         echo=False,
     )
+    _report_pool_connections(engine, name)
+    return engine
 
 
 def create_session_factory(engine) -> async_sessionmaker[AsyncSession]:
@@ -50,15 +156,159 @@ async def get_db_session(
             raise
 
 
+class ReplicaRouter:
+    """Spreads reads over the replicas whose replication lag is within tolerance.
+
+    Lag is measured in the background every ``check_interval_seconds``. A
+    replica that is too far behind or fails its check takes no reads until
+    it recovers. Replicas count as unhealthy until their first check, and
+    reads fall back to the primary whenever no replica is healthy.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: Sequence[tuple[str, AsyncEngine]],
+        max_lag_seconds: float = 1.0,
+        check_interval_seconds: float = 1.0,
+        check_timeout_seconds: float = 2.0,
+    ) -> None:
+        self._primary = primary
+        self._replicas = [
+            (name, engine, create_session_factory(engine), DB_REPLICA_LAG_SECONDS.labels(name))
+            for name, engine in replicas
+        ]
+        self._max_lag = max_lag_seconds
+        self._interval = check_interval_seconds
+        self._timeout = check_timeout_seconds
+        self._healthy: list[async_sessionmaker[AsyncSession]] = []
+        self._next = itertools.count()
+
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if not self._healthy:
+            return self._primary
+        return self._healthy[next(self._next) % len(self._healthy)]
+
+    async def _lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            return float((await conn.execute(_REPLICA_LAG_SQL)).scalar_one())
+
+    async def refresh(self) -> None:
+        healthy = []
+        for name, engine, factory, lag_gauge in self._replicas:
+            try:
+                lag = await asyncio.wait_for(self._lag(engine), self._timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("replica_check_failed", replica=name, error=str(e))
+                continue
+            lag_gauge.set(lag)
+            if lag <= self._max_lag:
+                healthy.append(factory)
+            else:
+                logger.warning("replica_lagging", replica=name, lag_seconds=lag)
+        self._healthy = healthy
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self._interval)
+
+    async def dispose(self) -> None:
+        for _, engine, _, _ in self._replicas:
+            await engine.dispose()
+
+
+class WriteStickiness:
+    """Remembers recent writers so their reads go to the primary for ``window_seconds``.
+
+    Kept in process and, given ``redis``, shared with the other instances
+    a client's next request may land on. If Redis fails, the client is
+    treated as sticky, so reads go to the primary.
+    """
+
+    def __init__(
+        self, window_seconds: float, redis: Redis | None = None, max_size: int = 100_000
+    ) -> None:
+        self._window = window_seconds
+        self._redis = redis
+        self._local: TTLCache[bool] = TTLCache(window_seconds, max_size)
+
+    async def mark(self, key: str) -> None:
+        self._local.set(key, True)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(f"{STICKY_KEY_PREFIX}{key}", 1, ex=max(1, math.ceil(self._window)))
+        except RedisError as e:
+            logger.warning("write_stickiness_mark_failed", error=str(e))
+
+    async def is_sticky(self, key: str) -> bool:
+        if self._local.get(key):
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._redis.exists(f"{STICKY_KEY_PREFIX}{key}"))
+        except RedisError as e:
+            logger.warning("write_stickiness_check_failed", error=str(e))
+            return True
+
+
 def init_database(
     url: str,
     pool_size: int = 20,
     max_overflow: int = 10,
+    replica_urls: Sequence[str] = (),
+    replica_max_lag_seconds: float = 1.0,
+    replica_check_interval_seconds: float = 1.0,
+    **engine_options,
 ) -> None:
-    """Initialize the module-level engine and session factory."""
-    global _engine, _session_factory
-    _engine = create_engine(url, pool_size=pool_size, max_overflow=max_overflow)
+    """Initialize the module-level engines and session factories.
+
+    ``engine_options`` are passed on to ``create_engine`` for the primary
+    and every replica. With ``replica_urls``, run ``get_replica_router().run_forever()``
+    in the background to start routing reads to them.
+    """
+    global _engine, _session_factory, _replica_router
+    _engine = create_engine(url, pool_size=pool_size, max_overflow=max_overflow, **engine_options)
     _session_factory = create_session_factory(_engine)
+    _replica_router = None
+    if replica_urls:
+        replicas = [
+            (
+                f"replica-{i}",
+                create_engine(
+                    replica_url,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    name=f"replica-{i}",
+                    **engine_options,
+                ),
+            )
+            for i, replica_url in enumerate(replica_urls)
+        ]
+        _replica_router = ReplicaRouter(
+            _session_factory,
+            replicas,
+            max_lag_seconds=replica_max_lag_seconds,
+            check_interval_seconds=replica_check_interval_seconds,
+        )
+
+
+def get_replica_router() -> ReplicaRouter | None:
+    """Return the module-level replica router, if replicas are configured."""
+    return _replica_router
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the module-level session factory for background jobs."""
+    if _session_factory is None:
+        raise RuntimeError(
+            "Database not initialized. Call init_database() first."
+        )
+    return _session_factory
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -69,3 +319,19 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         )
     async for session in get_db_session(_session_factory):
         yield session
+
+
+async def get_read_session(use_primary: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session for read-only queries on a replica (or the primary).
+
+    Never commits: nothing read through it should be modified.
+    """
+    if _session_factory is None:
+        raise RuntimeError(
+            "Database not initialized. Call init_database() first."
+        )
+    factory = _session_factory
+    if not use_primary and _replica_router is not None:
+        factory = _replica_router.session_factory()
+    async with factory() as session:
+        yield session
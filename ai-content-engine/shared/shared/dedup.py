@@ -0,0 +1,118 @@
+"""Consumer-side event deduplication on the ``processed_events`` table.
+
+Kafka delivery (and the outbox relay) is at least once. A consumer claims
+an event id in the same transaction as the event's effects; a redelivered
+event finds its claim already there and is skipped. Claims only need to
+outlive the window in which an event can be redelivered, so
+``ProcessedEventPurger`` deletes them after a dedup horizon.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+import structlog
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.models.event import ProcessedEvent
+from shared.utils.datetime import utcnow
+
+logger = structlog.get_logger(__name__)
+
+
+async def claim_events(
+    session: AsyncSession,
+    consumer: str,
+    events: Sequence[tuple[uuid.UUID, uuid.UUID | None]],
+) -> set[uuid.UUID]:
+    """Record (event_id, request_id) pairs for ``consumer``; return the ids not seen before.
+
+    A claim racing an uncommitted claim of the same event waits for it, so
+    two deliveries handled concurrently cannot both win.
+    """
+    if not events:
+        return set()
+    result = await session.execute(
+        insert(ProcessedEvent)
+        .values(
+            [
+                {"consumer": consumer, "event_id": event_id, "request_id": request_id}
+                for event_id, request_id in events
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[ProcessedEvent.consumer, ProcessedEvent.event_id])
+        .returning(ProcessedEvent.event_id)
+    )
+    return set(result.scalars().all())
+
+
+async def claim_event(
+    session: AsyncSession,
+    consumer: str,
+    event_id: uuid.UUID,
+    request_id: uuid.UUID | None = None,
+) -> bool:
+    """Claim a single event; False if ``consumer`` already processed it."""
+    return bool(await claim_events(session, consumer, [(event_id, request_id)]))
+
+
+class ProcessedEventPurger:
+    """Deletes claims older than ``horizon`` in batches, oldest first.
+
+    The horizon must comfortably exceed the longest time an event can sit
+    in Kafka (topic retention) or the outbox before being redelivered.
+    Each batch is its own short transaction, found through the
+    ``created_at`` index.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        horizon: timedelta,
+        batch_size: int = 10_000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._horizon = horizon
+        self._batch_size = batch_size
+
+    async def purge_batch(self, cutoff: datetime) -> int:
+        expired = (
+            select(ProcessedEvent.consumer, ProcessedEvent.event_id)
+            .where(ProcessedEvent.created_at < cutoff)
+            .order_by(ProcessedEvent.created_at)
+            .limit(self._batch_size)
+        )
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(ProcessedEvent).where(
+                    tuple_(ProcessedEvent.consumer, ProcessedEvent.event_id).in_(expired)
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Delete every claim older than the horizon; returns how many were deleted."""
+        cutoff = (now or utcnow()) - self._horizon
+        total = 0
+        while True:
+            deleted = await self.purge_batch(cutoff)
+            total += deleted
+            if deleted < self._batch_size:
+                break
+        if total:
+            logger.info("processed_events_purged", count=total, cutoff=cutoff.isoformat())
+        return total
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("processed_events_purge_failed")
+            await asyncio.sleep(interval_seconds)
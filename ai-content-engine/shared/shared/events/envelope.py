@@ -15,6 +15,8 @@ class EventEnvelope(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     source_service: str
     payload: dict
+    # Pipeline timing marks in epoch milliseconds, see shared.events.timing
+    timings: dict[str, float] = Field(default_factory=dict)
 
     def to_kafka_value(self) -> dict:
         return self.model_dump(mode="json")
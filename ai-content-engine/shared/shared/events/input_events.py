@@ -16,3 +16,4 @@ class InputReceivedEvent(BaseModel):
     template_version: str | None = None
     parameters: dict = Field(default_factory=dict)
     options: dict = Field(default_factory=dict)
+    priority: str = "normal"
@@ -10,6 +10,7 @@ class PromptAssembledEvent(BaseModel):
 
     request_id: uuid.UUID
     correlation_id: uuid.UUID
+    organization_id: uuid.UUID | None = None
     template_id: uuid.UUID
     template_version: str
     system_prompt: str
@@ -17,3 +18,4 @@ class PromptAssembledEvent(BaseModel):
     model_requirements: dict = Field(default_factory=dict)
     estimated_input_tokens: int = 0
     content_hash: str = ""
+    priority: str = "normal"
@@ -0,0 +1,89 @@
+"""Per-stage pipeline timing carried on ``EventEnvelope.timings``.
+
+Each service copies the inbound envelope's timing marks onto the envelope
+it publishes and adds its own marks (epoch milliseconds). Persistence turns
+the marks into stage durations stored in ``GenerationResult.latency_ms``.
+Marks come from different hosts, so durations across services are only as
+accurate as their clock sync. A repair request clears the marks of the
+stages it repeats and stamps its own mark: the ``repair`` stage covers every
+pass rejected for repair, and the repeated stages describe the last pass.
+"""
+
+import time
+
+ACCEPTED = "ingestion.accepted"
+PROMPT_RECEIVED = "prompt_engine.received"
+PROMPT_PUBLISHED = "prompt_engine.published"
+MODEL_RECEIVED = "model_layer.received"
+INFERENCE_STARTED = "model_layer.inference_started"
+INFERENCE_FINISHED = "model_layer.inference_finished"
+MODEL_PUBLISHED = "model_layer.published"
+VALIDATION_RECEIVED = "output_validation.received"
+VALIDATION_PUBLISHED = "output_validation.published"
+REPAIR_REQUESTED = "output_validation.repair_requested"
+PERSISTENCE_RECEIVED = "persistence.received"
+PERSISTENCE_STORED = "persistence.stored"
+
+# Marks of the stages a repair pass runs again
+REPEATED_ON_REPAIR = (
+    MODEL_RECEIVED,
+    INFERENCE_STARTED,
+    INFERENCE_FINISHED,
+    MODEL_PUBLISHED,
+    VALIDATION_RECEIVED,
+    VALIDATION_PUBLISHED,
+)
+
+# stage -> (start mark or marks, end mark); of several start marks the latest present is used
+STAGES: dict[str, tuple[str | tuple[str, ...], str]] = {
+    "queue_prompt": (ACCEPTED, PROMPT_RECEIVED),
+    "prompt_render": (PROMPT_RECEIVED, PROMPT_PUBLISHED),
+    "repair": (PROMPT_PUBLISHED, REPAIR_REQUESTED),
+    "queue_model": ((PROMPT_PUBLISHED, REPAIR_REQUESTED), MODEL_RECEIVED),
+    "scheduling": (MODEL_RECEIVED, INFERENCE_STARTED),
+    "inference": (INFERENCE_STARTED, INFERENCE_FINISHED),
+    "queue_validation": (MODEL_PUBLISHED, VALIDATION_RECEIVED),
+    "validation": (VALIDATION_RECEIVED, VALIDATION_PUBLISHED),
+    "queue_persistence": (VALIDATION_PUBLISHED, PERSISTENCE_RECEIVED),
+    "persistence": (PERSISTENCE_RECEIVED, PERSISTENCE_STORED),
+    "total": (ACCEPTED, PERSISTENCE_STORED),
+}
+
+
+def now_ms() -> float:
+    return round(time.time() * 1000, 3)
+
+
+def stamp(timings: dict[str, float], *marks: str) -> dict[str, float]:
+    """Set ``marks`` to the current time in place and return ``timings``."""
+    at = now_ms()
+    for mark in marks:
+        timings[mark] = at
+    return timings
+
+
+def received(msg: dict, mark: str) -> dict[str, float]:
+    """Copy an inbound message's timing marks and stamp its arrival."""
+    timings = dict(msg.get("timings") or {})
+    return stamp(timings, mark)
+
+
+def repair_requested(msg: dict) -> dict[str, float]:
+    """Timing marks for a repair pass: the repeated stages' marks cleared, the request stamped."""
+    timings = {
+        mark: at
+        for mark, at in (msg.get("timings") or {}).items()
+        if mark not in REPEATED_ON_REPAIR
+    }
+    return stamp(timings, REPAIR_REQUESTED)
+
+
+def stage_latencies(timings: dict[str, float]) -> dict[str, float]:
+    """Stage durations in milliseconds for every stage with both marks present."""
+    latencies = {}
+    for stage, (start, end) in STAGES.items():
+        candidates = (start,) if isinstance(start, str) else start
+        starts = [timings[mark] for mark in candidates if mark in timings]
+        if starts and end in timings:
+            latencies[stage] = round(max(0.0, timings[end] - max(starts)), 3)
+    return latencies
@@ -10,7 +10,7 @@ class ValidationCompletedEvent(BaseModel):
 
     request_id: uuid.UUID
     correlation_id: uuid.UUID
-    parsed_output: dict
+    parsed_output: dict | list
     validation_results: dict = Field(default_factory=dict)
     schema_id: uuid.UUID | None = None
     schema_version: str | None = None
@@ -1,6 +1,13 @@
 """Kafka producer and consumer wrappers."""
 
 from shared.kafka.consumer import AsyncKafkaConsumer
+from shared.kafka.lanes import WeightedLaneScheduler, lane_topic, lane_topics
 from shared.kafka.producer import AsyncKafkaProducer
 
-__all__ = ["AsyncKafkaProducer", "AsyncKafkaConsumer"]
+__all__ = [
+    "AsyncKafkaProducer",
+    "AsyncKafkaConsumer",
+    "WeightedLaneScheduler",
+    "lane_topic",
+    "lane_topics",
+]
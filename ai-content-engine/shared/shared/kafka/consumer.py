@@ -2,36 +2,88 @@
 
 import asyncio
 import json
-from collections.abc import Awaitable, Callable
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
 
 import structlog
-from aiokafka import AIOKafkaConsumer
+from aiokafka import AIOKafkaConsumer, TopicPartition
+
+from shared.kafka.lanes import DEFAULT_LANE, WeightedLaneScheduler, lane_topics
+from shared.metrics import KAFKA_HANDLER_FAILURES, KAFKA_HANDLER_SECONDS
+from shared.tracing import consume_batch_span, consume_span
 
 logger = structlog.get_logger(__name__)
 
 MessageHandler = Callable[[dict], Awaitable[None]]
+BatchMessageHandler = Callable[[list[dict]], Awaitable[None]]
 
 
 class AsyncKafkaConsumer:
-    """Async Kafka consumer with manual commit and graceful shutdown."""
+    """Async Kafka consumer with manual commit and graceful shutdown.
+
+    With a ``batch_handler`` the consumer accumulates up to ``max_batch_size``
+    messages or ``max_batch_wait_ms`` milliseconds, hands the whole batch to the
+    handler and commits offsets only once the handler has returned. A batch
+    that keeps failing is retried message by message so a single poison
+    message is skipped instead of blocking the partition forever. A
+    per-message handler that raises has its message redelivered up to
+    ``max_batch_retries`` times before it is skipped.
+
+    With ``lane_weights`` the consumer subscribes to every priority lane of
+    ``topic`` (see ``shared.kafka.lanes``) and, for per-message handlers,
+    serves buffered messages by lane weight with starvation protection. Each
+    lane buffers at most ``lane_buffer_size`` messages; full lanes are paused
+    so the rest keep flowing. Batch handlers receive all lanes unordered.
+    Lane consumers may run up to ``max_in_flight`` handlers concurrently, so
+    a downstream scheduler can reorder work; each partition's offset is then
+    committed only up to its lowest unfinished message.
+    """
 
     def __init__(
         self,
         topic: str,
         bootstrap_servers: str,
         group_id: str,
-        handler: MessageHandler,
+        handler: MessageHandler | None = None,
+        batch_handler: BatchMessageHandler | None = None,
+        max_batch_size: int = 500,
+        max_batch_wait_ms: int = 250,
+        retry_backoff_ms: int = 1000,
+        max_batch_retries: int = 3,
+        lane_weights: Mapping[str, int] | None = None,
+        lane_starvation_ms: int = 5000,
+        lane_buffer_size: int = 100,
+        max_in_flight: int = 1,
     ) -> None:
+        if (handler is None) == (batch_handler is None):
+            raise ValueError("Exactly one of handler or batch_handler is required")
         self._topic = topic
         self._bootstrap_servers = bootstrap_servers
         self._group_id = group_id
         self._handler = handler
+        self._batch_handler = batch_handler
+        self._max_batch_size = max_batch_size
+        self._max_batch_wait_ms = max_batch_wait_ms
+        self._retry_backoff_ms = retry_backoff_ms
+        self._max_batch_retries = max_batch_retries
+        self._lane_weights = lane_weights
+        self._lane_starvation_ms = lane_starvation_ms
+        self._lane_buffer_size = lane_buffer_size
+        self._max_in_flight = max_in_flight
+        self._topic_lanes = (
+            {name: lane for lane, name in lane_topics(topic).items()}
+            if lane_weights
+            else {topic: None}
+        )
+        self._handler_seconds = {t: KAFKA_HANDLER_SECONDS.labels(t) for t in self._topic_lanes}
+        self._handler_failures = {t: KAFKA_HANDLER_FAILURES.labels(t) for t in self._topic_lanes}
         self._consumer: AIOKafkaConsumer | None = None
         self._running = False
 
     async def start(self) -> None:
         self._consumer = AIOKafkaConsumer(
-            self._topic,
+            *self._topic_lanes,
             bootstrap_servers=self._bootstrap_servers,
             group_id=self._group_id,
             value_deserializer=lambda v: json.loads(v.decode("utf-8")),
@@ -42,7 +94,7 @@ class AsyncKafkaConsumer:
         self._running = True
         logger.info(
             "kafka_consumer_started",
-            topic=self._topic,
+            topics=list(self._topic_lanes),
             group_id=self._group_id,
         )
 
@@ -52,30 +104,275 @@ class AsyncKafkaConsumer:
             await self._consumer.stop()
             logger.info("kafka_consumer_stopped", topic=self._topic)
 
+    async def lag(self) -> dict[str, int]:
+        """Messages not yet committed on this consumer's partitions, per lane.
+
+        Uses each partition's high-water mark from the latest fetch, so it
+        only covers partitions that have been fetched from.
+        """
+        if not self._consumer:
+            return {}
+        lag: dict[str, int] = {}
+        for tp in self._consumer.assignment():
+            highwater = self._consumer.highwater(tp)
+            if highwater is None:
+                continue
+            committed = await self._consumer.committed(tp)
+            if committed is None:
+                committed = await self._consumer.position(tp)
+            lane = self._topic_lanes.get(tp.topic) or DEFAULT_LANE
+            lag[lane] = lag.get(lane, 0) + max(0, highwater - committed)
+        return lag
+
     async def run(self) -> None:
         if not self._consumer:
             raise RuntimeError("Consumer not started. Call start() first.")
 
         try:
-            async for message in self._consumer:
-                if not self._running:
-                    break
-                try:
-                    logger.info(
-                        "kafka_message_received",
-                        topic=message.topic,
-                        partition=message.partition,
-                        offset=message.offset,
-                    )
-                    await self._handler(message.value)
-                    await self._consumer.commit()
-                except Exception:
-                    logger.exception(
-                        "kafka_message_processing_failed",
-                        topic=message.topic,
-                        offset=message.offset,
-                    )
+            if self._batch_handler is not None:
+                await self._run_batches()
+            elif self._lane_weights:
+                await self._run_lanes()
+            else:
+                await self._run_messages()
         except asyncio.CancelledError:
             logger.info("kafka_consumer_cancelled", topic=self._topic)
         finally:
             await self.stop()
+
+    async def _run_messages(self) -> None:
+        failing: tuple[TopicPartition, int] | None = None
+        failures = 0
+        async for message in self._consumer:
+            if not self._running:
+                break
+            tp = TopicPartition(message.topic, message.partition)
+            try:
+                logger.info(
+                    "kafka_message_received",
+                    topic=message.topic,
+                    partition=message.partition,
+                    offset=message.offset,
+                )
+                start = time.perf_counter()
+                with consume_span(message):
+                    await self._handler(message.value)
+                self._handler_seconds[message.topic].observe(time.perf_counter() - start)
+                await self._consumer.commit()
+            except Exception:
+                self._handler_failures[message.topic].inc()
+                failures = failures + 1 if failing == (tp, message.offset) else 1
+                failing = (tp, message.offset)
+                logger.exception(
+                    "kafka_message_processing_failed",
+                    topic=message.topic,
+                    offset=message.offset,
+                    attempt=failures,
+                )
+                if failures < self._max_batch_retries:
+                    # Rewind so a later commit cannot skip past the failed message
+                    self._consumer.seek(tp, message.offset)
+                    await asyncio.sleep(self._retry_backoff_ms / 1000)
+                else:
+                    logger.error(
+                        "kafka_poison_message_skipped", topic=message.topic, offset=message.offset
+                    )
+
+    async def _handle_lane_message(self, message, tracker: "_OffsetTracker") -> None:
+        tp = TopicPartition(message.topic, message.partition)
+        if tp not in self._consumer.assignment():
+            # Revoked in a rebalance while buffered; the new owner redelivers it
+            tracker.finish(tp, message.offset)
+            return
+        try:
+            start = time.perf_counter()
+            with consume_span(message):
+                await self._handler(message.value)
+            self._handler_seconds[message.topic].observe(time.perf_counter() - start)
+        except Exception:
+            self._handler_failures[message.topic].inc()
+            logger.exception(
+                "kafka_message_processing_failed",
+                topic=message.topic,
+                offset=message.offset,
+            )
+        tracker.finish(tp, message.offset)
+        async with tracker.commit_lock:
+            position = tracker.take_commit(tp)
+            if position is not None and tp in self._consumer.assignment():
+                await self._consumer.commit({tp: position})
+
+    async def _run_lanes(self) -> None:
+        """Buffer fetched messages per lane and serve them in weighted order."""
+        scheduler = WeightedLaneScheduler(self._lane_weights, self._lane_starvation_ms)
+        buffers: dict[str, deque] = {lane: deque() for lane in self._topic_lanes.values()}
+        tracker = _OffsetTracker()
+        slots = asyncio.Semaphore(self._max_in_flight)
+        tasks: set[asyncio.Task] = set()
+        # One scheduling round per fetch keeps newly arrived high-lane work close to the front
+        round_size = sum(self._lane_weights.values())
+
+        async def run_one(message) -> None:
+            try:
+                await self._handle_lane_message(message, tracker)
+            finally:
+                slots.release()
+
+        try:
+            while self._running:
+                idle = not any(buffers.values())
+                records = await self._consumer.getmany(
+                    timeout_ms=self._max_batch_wait_ms if idle else 0,
+                    max_records=self._lane_buffer_size,
+                )
+                now = time.monotonic()
+                for tp, messages in records.items():
+                    buffers[self._topic_lanes[tp.topic]].extend((now, m) for m in messages)
+
+                for _ in range(round_size):
+                    heads = {lane: buffer[0][0] for lane, buffer in buffers.items() if buffer}
+                    lane = scheduler.pick(heads)
+                    if lane is None:
+                        break
+                    _, message = buffers[lane].popleft()
+                    tracker.start(TopicPartition(message.topic, message.partition), message.offset)
+                    await slots.acquire()
+                    if self._max_in_flight == 1:
+                        await run_one(message)
+                        continue
+                    task = asyncio.create_task(run_one(message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                self._apply_lane_backpressure(buffers)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _apply_lane_backpressure(self, buffers: dict[str, deque]) -> None:
+        """Pause fetching for lanes whose buffer is full and resume the others.
+
+        Re-applied after every round so partitions gained in a rebalance
+        pick up their lane's state.
+        """
+        full = {lane for lane, buffer in buffers.items() if len(buffer) >= self._lane_buffer_size}
+        to_pause, to_resume = [], []
+        for tp in self._consumer.assignment():
+            (to_pause if self._topic_lanes[tp.topic] in full else to_resume).append(tp)
+        if to_pause:
+            self._consumer.pause(*to_pause)
+        if to_resume:
+            self._consumer.resume(*to_resume)
+
+    async def _fetch_batch(self) -> dict[TopicPartition, list]:
+        """Accumulate records until the size or time threshold is reached."""
+        batch: dict[TopicPartition, list] = {}
+        count = 0
+        deadline: float | None = None
+        while self._running and count < self._max_batch_size:
+            timeout_ms = self._max_batch_wait_ms
+            if deadline is not None:
+                timeout_ms = int((deadline - time.monotonic()) * 1000)
+                if timeout_ms <= 0:
+                    break
+            records = await self._consumer.getmany(
+                timeout_ms=timeout_ms,
+                max_records=self._max_batch_size - count,
+            )
+            for tp, messages in records.items():
+                batch.setdefault(tp, []).extend(messages)
+                count += len(messages)
+            if count and deadline is None:
+                # The wait window starts with the first buffered record
+                deadline = time.monotonic() + self._max_batch_wait_ms / 1000
+        return batch
+
+    async def _isolate_poison(self, values: list[dict]) -> bool:
+        """Retry a failing batch one message at a time, skipping messages that fail.
+
+        Returns False when every message fails, which points at a systemic
+        error (e.g. the database is down) rather than a poison message.
+        """
+        failed = 0
+        for value in values:
+            try:
+                await self._batch_handler([value])
+            except Exception:
+                failed += 1
+                logger.exception(
+                    "kafka_poison_message_skipped",
+                    topic=self._topic,
+                    event_id=value.get("event_id") if isinstance(value, dict) else None,
+                )
+        return failed < len(values)
+
+    async def _run_batches(self) -> None:
+        failures = 0
+        while self._running:
+            batch = await self._fetch_batch()
+            if not batch:
+                continue
+            records = [m for messages in batch.values() for m in messages]
+            values = [m.value for m in records]
+            try:
+                start = time.perf_counter()
+                with consume_batch_span(self._topic, records):
+                    await self._batch_handler(values)
+                self._handler_seconds[self._topic].observe(time.perf_counter() - start)
+            except Exception:
+                self._handler_failures[self._topic].inc()
+                failures += 1
+                logger.exception(
+                    "kafka_batch_processing_failed",
+                    topic=self._topic,
+                    size=len(values),
+                    attempt=failures,
+                )
+                if failures < self._max_batch_retries or not await self._isolate_poison(values):
+                    # Rewind so the batch is redelivered instead of being skipped
+                    for tp, messages in batch.items():
+                        self._consumer.seek(tp, messages[0].offset)
+                    await asyncio.sleep(self._retry_backoff_ms / 1000)
+                    continue
+            failures = 0
+            await self._consumer.commit(
+                {tp: messages[-1].offset + 1 for tp, messages in batch.items()}
+            )
+            logger.debug("kafka_batch_committed", topic=self._topic, size=len(values))
+
+
+class _OffsetTracker:
+    """Tracks in-flight offsets per partition for out-of-order completion.
+
+    Messages of a partition are started in offset order; a partition's
+    commit position only advances past messages once every earlier message
+    has finished. Commits go through ``commit_lock`` so a slower commit can
+    never move a position backwards.
+    """
+
+    def __init__(self) -> None:
+        self.commit_lock = asyncio.Lock()
+        self._started: dict[TopicPartition, deque[int]] = {}
+        self._finished: dict[TopicPartition, set[int]] = {}
+        self._ready: dict[TopicPartition, int] = {}
+        self._committed: dict[TopicPartition, int] = {}
+
+    def start(self, tp: TopicPartition, offset: int) -> None:
+        self._started.setdefault(tp, deque()).append(offset)
+
+    def finish(self, tp: TopicPartition, offset: int) -> None:
+        started = self._started.get(tp)
+        if not started:
+            return
+        finished = self._finished.setdefault(tp, set())
+        finished.add(offset)
+        while started and started[0] in finished:
+            finished.discard(started[0])
+            self._ready[tp] = started.popleft() + 1
+
+    def take_commit(self, tp: TopicPartition) -> int | None:
+        """Return the position to commit if it advanced since the last commit."""
+        ready = self._ready.get(tp)
+        if ready is None or ready <= self._committed.get(tp, -1):
+            return None
+        self._committed[tp] = ready
+        return ready
@@ -0,0 +1,68 @@
+"""Per-priority topic lanes and weighted lane scheduling.
+
+Each pipeline topic has one lane per request priority: normal traffic keeps
+the base topic name, and high and low traffic go to ``<topic>.high`` and
+``<topic>.low``. Consumers subscribe to every lane of a topic and drain them
+by weight, so a large low-priority backlog cannot sit in front of
+interactive requests.
+"""
+
+import time
+from collections.abc import Mapping
+
+LANES = ("high", "normal", "low")
+DEFAULT_LANE = "normal"
+DEFAULT_LANE_WEIGHTS = {"high": 8, "normal": 3, "low": 1}
+
+
+def lane_topic(topic: str, priority: str | None) -> str:
+    """Topic carrying ``priority`` traffic; unknown priorities use the normal lane."""
+    if priority not in LANES or priority == DEFAULT_LANE:
+        return topic
+    return f"{topic}.{priority}"
+
+
+def lane_topics(topic: str) -> dict[str, str]:
+    """Map each lane to its topic name."""
+    return {lane: lane_topic(topic, lane) for lane in LANES}
+
+
+class WeightedLaneScheduler:
+    """Chooses the lane to serve next by smooth weighted round robin.
+
+    Over any window where every lane has work, lanes are served in
+    proportion to their weights, interleaved rather than in bursts. A lane
+    whose oldest pending message has waited ``starvation_ms`` or longer is
+    served first regardless of weight, so low lanes always make progress.
+    """
+
+    def __init__(self, weights: Mapping[str, int], starvation_ms: int = 5000) -> None:
+        if any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Lane weights must be positive")
+        self._weights = dict(weights)
+        self._starvation = starvation_ms / 1000
+        self._current: dict[str, int] = {}
+
+    def pick(self, heads: Mapping[str, float], now: float | None = None) -> str | None:
+        """Return the lane to serve, given each non-empty lane's oldest enqueue time."""
+        if not heads:
+            return None
+        now = time.monotonic() if now is None else now
+        oldest = min(heads, key=heads.__getitem__)
+        if now - heads[oldest] >= self._starvation:
+            return oldest
+
+        # Idle lanes do not bank credit while they have nothing to send
+        for lane in list(self._current):
+            if lane not in heads:
+                del self._current[lane]
+        total = 0
+        best: str | None = None
+        for lane in heads:
+            weight = self._weights.get(lane, 1)
+            self._current[lane] = self._current.get(lane, 0) + weight
+            total += weight
+            if best is None or self._current[lane] > self._current[best]:
+                best = lane
+        self._current[best] -= total
+        return best
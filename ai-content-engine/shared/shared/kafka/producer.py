@@ -1,12 +1,15 @@
 """Async Kafka producer wrapper."""
 
+import asyncio
 import json
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable
 from contextlib import asynccontextmanager
 
 import structlog
 from aiokafka import AIOKafkaProducer
 
+from shared.tracing import KafkaHeaders, inject_headers
+
 logger = structlog.get_logger(__name__)
 
 
@@ -33,12 +36,45 @@ class AsyncKafkaProducer:
             await self._producer.stop()
             logger.info("kafka_producer_stopped")
 
-    async def send(self, topic: str, value: dict, key: str | None = None) -> None:
+    async def send(
+        self,
+        topic: str,
+        value: dict,
+        key: str | None = None,
+        headers: KafkaHeaders | None = None,
+    ) -> None:
+        """Publish one message; ``headers`` default to the active trace context."""
         if not self._producer:
             raise RuntimeError("Producer not started. Call start() first.")
-        await self._producer.send_and_wait(topic, value=value, key=key)
+        if headers is None:
+            headers = inject_headers()
+        await self._producer.send_and_wait(topic, value=value, key=key, headers=headers or None)
         logger.debug("kafka_message_sent", topic=topic, key=key)
 
+    async def send_many(self, messages: Iterable[tuple]) -> None:
+        """Publish (topic, value, key[, headers]) messages without waiting on each one.
+
+        Every message is handed to the producer's batching buffer first and the
+        delivery acknowledgements are awaited together, so the round trips to
+        the brokers overlap instead of running one after another. Messages
+        without headers carry the active trace context.
+        """
+        if not self._producer:
+            raise RuntimeError("Producer not started. Call start() first.")
+        current = None
+        pending = []
+        for topic, value, key, *rest in messages:
+            headers = rest[0] if rest else None
+            if headers is None:
+                if current is None:
+                    current = inject_headers()
+                headers = current
+            pending.append(
+                await self._producer.send(topic, value=value, key=key, headers=headers or None)
+            )
+        await asyncio.gather(*pending)
+        logger.debug("kafka_messages_sent", count=len(pending))
+
     @asynccontextmanager
     async def lifespan(self) -> AsyncGenerator[None, None]:
         await self.start()
@@ -1,43 +1,182 @@
-"""Structured logging configuration using structlog."""
+"""Structured logging configuration using structlog.
 
+Development renders console lines synchronously. Production renders JSON
+with orjson and hands each line to ``QueueSink``, whose writer thread owns
+stdout, so a handler never blocks on the write. Both modes drop events
+below ``log_level`` before any processor runs, and can sample the INFO
+events logged once per consumed message.
+"""
+
+import atexit
 import logging
+import queue
+import random
+import sys
+import threading
+from collections.abc import Iterable
+from typing import BinaryIO
 
+import orjson
 import structlog
 
+# Logged once per consumed message; thinned by ``message_sample_rate``
+PER_MESSAGE_EVENTS = frozenset(
+    {
+        "kafka_message_received",
+        "processing_input_received",
+        "prompt_assembled",
+        "received_prompt_assembled_event",
+        "received_generation_complete_event",
+        "received_validation_complete_event",
+        "generation_result_stored",
+    }
+)
+
+
+class EventSampler:
+    """Processor keeping only a ``rate`` fraction of the named DEBUG/INFO events.
+
+    Warnings and errors always pass. Runs first in the chain so a dropped
+    event costs one lookup.
+    """
+
+    def __init__(self, events: Iterable[str], rate: float) -> None:
+        self._events = frozenset(events)
+        self._rate = rate
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        if (
+            method_name in ("debug", "info")
+            and event_dict.get("event") in self._events
+            and random.random() >= self._rate
+        ):
+            raise structlog.DropEvent
+        return event_dict
+
+
+class QueueSink:
+    """Bounded queue of rendered lines drained to ``stream`` by a daemon thread.
+
+    ``write`` never blocks: when the writer falls behind, lines are dropped
+    and counted, and the count is reported on the stream once it catches up.
+    Lines lost to a failing stream are counted the same way. The writer
+    coalesces whatever is queued into a single write.
+    """
+
+    def __init__(self, stream: BinaryIO | None = None, max_size: int = 10_000) -> None:
+        self._stream = stream or sys.stdout.buffer
+        self._queue: queue.Queue[bytes | None] = queue.Queue(max_size)
+        self.dropped = 0
+        self._reported = 0
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush queued lines and stop the writer."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _drain(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            while len(lines) < 1000:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in lines
+            lines = [line for line in lines if line is not None]
+            written = len(lines)
+            dropped = self.dropped
+            if dropped > self._reported:
+                lines.append(
+                    orjson.dumps({"event": "log_lines_dropped", "count": dropped - self._reported})
+                )
+            if lines:
+                try:
+                    self._stream.write(b"\n".join(lines) + b"\n")
+                    self._stream.flush()
+                except Exception:
+                    # A closed or broken stream must not kill the writer: count the
+                    # lines as dropped and report them once writes succeed again
+                    self.dropped += written
+                else:
+                    self._reported = dropped
+            if stop:
+                return
+
+
+class QueueLogger:
+    """structlog logger handing rendered bytes to a ``QueueSink``."""
+
+    def __init__(self, sink: QueueSink) -> None:
+        self._sink = sink
+
+    def msg(self, message: bytes) -> None:
+        self._sink.write(message)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+def _orjson_dumps(event_dict: dict, default=None) -> bytes:
+    return orjson.dumps(event_dict, default=default or str)
+
 
 def setup_logging(
     service_name: str,
     log_level: str = "INFO",
     environment: str = "development",
+    message_sample_rate: float = 1.0,
+    queue_size: int = 10_000,
 ) -> None:
     """Configure structlog with appropriate processors and renderer."""
-    shared_processors: list[structlog.types.Processor] = [
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    shared_processors: list[structlog.types.Processor] = []
+    if message_sample_rate < 1.0:
+        shared_processors.append(EventSampler(PER_MESSAGE_EVENTS, message_sample_rate))
+    shared_processors += [
         structlog.contextvars.merge_contextvars,
-        structlog.stdlib.add_log_level,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
     ]
 
     if environment == "production":
-        renderer: structlog.types.Processor = structlog.processors.JSONRenderer()
+        sink = QueueSink(max_size=queue_size)
+        atexit.register(sink.close)
+        renderer: structlog.types.Processor = structlog.processors.JSONRenderer(
+            serializer=_orjson_dumps
+        )
+        logger_factory = lambda *args: QueueLogger(sink)  # noqa: E731
     else:
         renderer = structlog.dev.ConsoleRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
 
     structlog.configure(
         processors=[
             *shared_processors,
             renderer,
         ],
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
     logging.basicConfig(
         format="%(message)s",
-        level=getattr(logging, log_level.upper(), logging.INFO),
+        level=level,
     )
 
 
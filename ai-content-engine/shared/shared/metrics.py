@@ -0,0 +1,185 @@
+"""Prometheus metrics shared by every service.
+
+Metric families are defined once here. Hot paths bind their labelled child
+once with ``.labels(...)`` and keep it, so an observation is a lock and an
+increment with no per-call allocation or label lookup. FastAPI apps mount
+``metrics_router`` and add ``MetricsMiddleware``. Workers without an HTTP
+app call ``start_metrics_server``.
+"""
+
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Seconds; spans sub-millisecond cache reads up to slow model calls
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+KAFKA_HANDLER_SECONDS = Histogram(
+    "kafka_handler_duration_seconds",
+    "Time spent in a Kafka message or batch handler",
+    ["topic"],
+    buckets=LATENCY_BUCKETS,
+)
+KAFKA_HANDLER_FAILURES = Counter(
+    "kafka_handler_failures_total",
+    "Kafka handler invocations that raised",
+    ["topic"],
+)
+KAFKA_CONSUMER_LAG = Gauge(
+    "kafka_consumer_lag_messages",
+    "Uncommitted messages on this consumer's partitions",
+    ["group", "lane"],
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout",
+    ["pool"],
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state (checked_out, idle or overflow)",
+    ["pool", "state"],
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag of each read replica at its last check",
+    ["pool"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+PROVIDER_REQUEST_SECONDS = Histogram(
+    "provider_request_duration_seconds",
+    "Model provider call latency",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+PROVIDER_TOKENS = Counter(
+    "provider_tokens_total",
+    "Tokens used by model provider calls",
+    ["provider", "model"],
+)
+PROVIDER_COST_USD = Counter(
+    "provider_cost_usd_total",
+    "Estimated cost of model provider calls",
+    ["provider", "model"],
+)
+PROVIDER_FAILURES = Counter(
+    "provider_failures_total",
+    "Model provider calls that raised",
+    ["provider", "model"],
+)
+VALIDATION_OUTCOMES = Counter(
+    "validation_outcomes_total",
+    "Output validation results (passed, failed or repair_requested)",
+    ["outcome"],
+)
+AUTH_SECONDS = Histogram(
+    "auth_duration_seconds",
+    "JWT authentication latency by result (cached, verified or rejected)",
+    ["result"],
+    buckets=LATENCY_BUCKETS,
+)
+FAIR_SCHEDULER_QUEUED = Gauge(
+    "fair_scheduler_queued_requests",
+    "Requests waiting for a provider call slot per organization",
+    ["organization"],
+)
+
+
+class CacheMetrics:
+    """Pre-bound hit and miss counters for one named cache."""
+
+    __slots__ = ("hit", "miss")
+
+    def __init__(self, cache: str) -> None:
+        self.hit = CACHE_REQUESTS.labels(cache, "hit")
+        self.miss = CACHE_REQUESTS.labels(cache, "miss")
+
+    def record(self, hit: bool) -> None:
+        (self.hit if hit else self.miss).inc()
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, with the prefixes of included routers."""
+    if scope.get("route") is None:
+        return "unmatched"
+    # Rebuilt from the request path: a nested route's own ``path`` may omit
+    # the prefix it was included under
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(str(value), f"{{{name}}}", 1)
+    return path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware observing request latency per route template.
+
+    Labelled by route template rather than raw path, so ids in paths do not
+    create new series. Unmatched paths are labelled ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._children: dict[tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            key = (scope["method"], route_template(scope), status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_REQUEST_SECONDS.labels(*key)
+            child.observe(time.perf_counter() - start)
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve ``/metrics`` from a background thread, for workers without an HTTP app."""
+    start_http_server(port)
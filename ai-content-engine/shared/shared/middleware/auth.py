@@ -1,21 +1,73 @@
 """JWT authentication middleware."""
 
+import hashlib
+import json
+import time
+
 import structlog
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from shared.metrics import AUTH_SECONDS
+from shared.utils.cache import TTLCache
 
 logger = structlog.get_logger(__name__)
 
 security = HTTPBearer(auto_error=False)
 
 
+class JWKSKeyStore:
+    """Public keys read once from a local JWKS file, looked up by ``kid``.
+
+    Every key must name its ``kid`` and ``alg``; a token is only accepted
+    under the algorithm its key declares.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path) as f:
+            jwks = json.load(f)
+        self._keys: dict[str, tuple[Key, str]] = {}
+        for entry in jwks.get("keys", []):
+            kid, algorithm = entry.get("kid"), entry.get("alg")
+            if not kid or not algorithm:
+                logger.warning("jwks_key_skipped", kid=kid, reason="missing kid or alg")
+                continue
+            self._keys[kid] = (jwk.construct(entry, algorithm), algorithm)
+        logger.info("jwks_loaded", path=path, keys=len(self._keys))
+
+    def get(self, kid: str) -> tuple[Key, str] | None:
+        return self._keys.get(kid)
+
+
 class JWTAuthMiddleware:
-    """JWT token verification dependency."""
+    """JWT token verification dependency.
 
-    def __init__(self, secret: str, algorithm: str = "HS256") -> None:
+    Tokens whose header carries a ``kid`` are verified against the JWKS
+    key store; others against the shared secret. Verified claims are cached
+    by token hash until the token's ``exp`` (at most ``cache_ttl_seconds``),
+    so a client reusing a token pays for one signature check. Rejections
+    are never cached.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        algorithm: str = "HS256",
+        jwks: JWKSKeyStore | None = None,
+        cache_ttl_seconds: float = 300.0,
+        cache_max_size: int = 10_000,
+    ) -> None:
         self._secret = secret
         self._algorithm = algorithm
+        self._jwks = jwks
+        self._claims: TTLCache[dict] = TTLCache(
+            cache_ttl_seconds, max_size=cache_max_size, name="jwt_claims"
+        )
+        self._cached_seconds = AUTH_SECONDS.labels("cached")
+        self._verified_seconds = AUTH_SECONDS.labels("verified")
+        self._rejected_seconds = AUTH_SECONDS.labels("rejected")
 
     async def __call__(
         self, credentials: HTTPAuthorizationCredentials | None = Depends(security)
@@ -27,17 +79,38 @@ class JWTAuthMiddleware:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        try:
-            payload = jwt.decode(
-                credentials.credentials,
-                self._secret,
-                algorithms=[self._algorithm],
-            )
+        start = time.perf_counter()
+        token = credentials.credentials
+        token_hash = hashlib.sha256(token.encode()).digest()
+        payload = self._claims.get(token_hash)
+        if payload is not None:
+            self._cached_seconds.observe(time.perf_counter() - start)
             return payload
+
+        try:
+            payload = self._verify(token)
         except JWTError as e:
+            self._rejected_seconds.observe(time.perf_counter() - start)
             logger.warning("jwt_validation_failed", error=str(e))
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+        expires_at = payload.get("exp")
+        ttl = None if expires_at is None else float(expires_at) - time.time()
+        if ttl is None or ttl > 0:
+            self._claims.set(token_hash, payload, ttl)
+        self._verified_seconds.observe(time.perf_counter() - start)
+        return payload
+
+    def _verify(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            return jwt.decode(token, self._secret, algorithms=[self._algorithm])
+        entry = self._jwks.get(kid) if self._jwks is not None else None
+        if entry is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        key, algorithm = entry
+        return jwt.decode(token, key, algorithms=[algorithm])
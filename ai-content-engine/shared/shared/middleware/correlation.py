@@ -1,40 +1,101 @@
-"""Correlation ID middleware for request tracing."""
+"""Correlation ID and access-log middleware for request tracing."""
 
+import random
+import time
 import uuid
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.metrics import route_template
+from shared.tracing import tracer
 
 logger = structlog.get_logger(__name__)
 
 CORRELATION_ID_HEADER = "X-Correlation-ID"
 
+_CORRELATION_ID_KEY = CORRELATION_ID_HEADER.lower().encode("latin-1")
+# Incoming headers handed to the trace context propagator
+_TRACE_HEADERS = frozenset({b"traceparent", b"tracestate", b"baggage"})
+
+
+class CorrelationIDMiddleware:
+    """Extracts or generates a correlation ID for each request.
+
+    Pure ASGI, so responses (including streamed ones) pass through without
+    being buffered or run in a separate task. The correlation ID is bound
+    to the structlog context for the whole request and echoed in the
+    ``X-Correlation-ID`` response header. One ``request_completed`` access
+    line is logged per request, for a ``access_log_sample_rate`` fraction of
+    requests. Server errors are always logged. The server span is named
+    after the method and matched route template, never the raw path, which
+    is recorded as ``http.target``.
+    """
+
+    def __init__(self, app: ASGIApp, access_log_sample_rate: float = 1.0) -> None:
+        self.app = app
+        self._sample_rate = access_log_sample_rate
 
-class CorrelationIDMiddleware(BaseHTTPMiddleware):
-    """Extracts or generates a correlation ID for each request."""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        correlation_id = request.headers.get(CORRELATION_ID_HEADER, str(uuid.uuid4()))
+        correlation_id = None
+        trace_carrier = {}
+        for key, value in scope["headers"]:
+            if key == _CORRELATION_ID_KEY:
+                correlation_id = value.decode("latin-1")
+            elif key in _TRACE_HEADERS:
+                trace_carrier[key.decode("latin-1")] = value.decode("latin-1")
+        correlation_id = correlation_id or str(uuid.uuid4())
 
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
 
-        logger.info(
-            "request_started",
-            method=request.method,
-            path=str(request.url.path),
-        )
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+        start = time.perf_counter()
 
-        response = await call_next(request)
-        response.headers[CORRELATION_ID_HEADER] = correlation_id
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[CORRELATION_ID_HEADER] = correlation_id
+            await send(message)
 
-        logger.info(
-            "request_completed",
-            method=request.method,
-            path=str(request.url.path),
-            status_code=response.status_code,
-        )
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(trace_carrier),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": method,
+                "http.target": path,
+                "correlation_id": correlation_id,
+            },
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception:
+                logger.exception("request_failed", method=method, path=path)
+                raise
+            finally:
+                span.set_attribute("http.response.status_code", status_code)
+                # Known once routing has run
+                if scope.get("route") is not None:
+                    route = route_template(scope)
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
 
-        return response
+        if status_code >= 500 or self._sample_rate >= 1.0 or random.random() < self._sample_rate:
+            logger.info(
+                "request_completed",
+                method=method,
+                path=path,
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - start) * 1000, 3),
+            )
@@ -4,7 +4,7 @@ import structlog
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from shared.exceptions import AppError
+from shared.exceptions import AppError, RateLimitError
 
 logger = structlog.get_logger(__name__)
 
@@ -21,6 +21,9 @@ def register_error_handlers(app: FastAPI) -> None:
             message=exc.message,
             path=str(request.url.path),
         )
+        headers = None
+        if isinstance(exc, RateLimitError):
+            headers = {"Retry-After": str(exc.retry_after)}
         return JSONResponse(
             status_code=exc.status_code,
             content={
@@ -30,6 +33,7 @@ def register_error_handlers(app: FastAPI) -> None:
                     "details": exc.details,
                 }
             },
+            headers=headers,
         )
 
     @app.exception_handler(Exception)
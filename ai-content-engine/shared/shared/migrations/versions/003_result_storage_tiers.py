@@ -0,0 +1,53 @@
+"""Storage tier, archive pointer and legal hold columns on generation_results.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    storage_tier = postgresql.ENUM("hot", "warm", "cold", name="storage_tier", create_type=False)
+    storage_tier.create(op.get_bind(), checkfirst=True)
+
+    op.add_column(
+        "generation_results",
+        sa.Column("storage_tier", storage_tier, nullable=False, server_default="hot"),
+    )
+    op.add_column("generation_results", sa.Column("archive_uri", sa.String(512), nullable=True))
+    op.add_column(
+        "generation_results", sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "generation_results",
+        sa.Column("legal_hold", sa.Boolean, nullable=False, server_default=sa.false()),
+    )
+
+    # Lifecycle scans only look at rows still eligible to move down a tier
+    op.create_index(
+        "ix_generation_results_lifecycle",
+        "generation_results",
+        ["storage_tier", "created_at"],
+        postgresql_where=sa.text("legal_hold = false AND storage_tier <> 'cold'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_results_lifecycle", table_name="generation_results")
+    op.drop_column("generation_results", "legal_hold")
+    op.drop_column("generation_results", "archived_at")
+    op.drop_column("generation_results", "archive_uri")
+    op.drop_column("generation_results", "storage_tier")
+    op.execute("DROP TYPE IF EXISTS storage_tier")
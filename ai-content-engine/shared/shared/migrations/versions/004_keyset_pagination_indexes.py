@@ -0,0 +1,39 @@
+"""Composite indexes backing keyset pagination of generations and templates.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Match the listing ORDER BY (created_at DESC, id DESC) so a page is a
+    # single index range scan; soft-deleted rows are never listed
+    op.create_index(
+        "ix_generation_requests_org_created_id",
+        "generation_requests",
+        ["organization_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_prompt_templates_created_id",
+        "prompt_templates",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prompt_templates_created_id", table_name="prompt_templates")
+    op.drop_index("ix_generation_requests_org_created_id", table_name="generation_requests")
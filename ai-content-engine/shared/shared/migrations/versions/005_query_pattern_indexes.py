@@ -0,0 +1,53 @@
+"""Indexes for the remaining hot query patterns and foreign keys.
+
+Lookups by primary key (status polling) and ``generation_results.request_id``
+are already served by the primary key and unique constraint indexes from 001;
+the org-scoped listing indexes come from 004.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-03-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Foreign keys Postgres does not index on its own; without these, template
+    # deletes and usage lookups per request scan the whole child table
+    op.create_index("ix_generation_requests_template_id", "generation_requests", ["template_id"])
+    op.create_index("ix_usage_records_request_id", "usage_records", ["request_id"])
+    op.create_index(
+        "ix_prompt_templates_parent_template_id",
+        "prompt_templates",
+        ["parent_template_id"],
+        postgresql_where=sa.text("parent_template_id IS NOT NULL"),
+    )
+
+    # Per-organization time-window scans (quota and usage reporting, audit trail)
+    op.create_index("ix_quotas_org_type", "quotas", ["organization_id", "quota_type"])
+    op.create_index("ix_usage_records_org_created", "usage_records", ["organization_id", "created_at"])
+    op.create_index(
+        "ix_audit_logs_org_created",
+        "audit_logs",
+        ["organization_id", sa.text("created_at DESC")],
+        postgresql_where=sa.text("organization_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_org_created", table_name="audit_logs")
+    op.drop_index("ix_usage_records_org_created", table_name="usage_records")
+    op.drop_index("ix_quotas_org_type", table_name="quotas")
+    op.drop_index("ix_prompt_templates_parent_template_id", table_name="prompt_templates")
+    op.drop_index("ix_usage_records_request_id", table_name="usage_records")
+    op.drop_index("ix_generation_requests_template_id", table_name="generation_requests")
@@ -0,0 +1,235 @@
+"""Monthly range partitioning of generation_requests and generation_results.
+
+generation_requests is partitioned by created_at and generation_results by
+the new request_created_at column, so both tables share partition bounds and
+retention drops a month of each. Primary and unique keys gain the partition
+key, results reference requests through (request_id, request_created_at),
+and the usage_records foreign key to generation_requests is dropped since
+id alone is no longer unique at the database level.
+
+Existing rows are copied into the partitioned tables; partitions are created
+from the oldest existing month through three months ahead. Afterwards the
+persistence service keeps future partitions created (shared.partitions);
+the partition DDL is inlined here so this revision stays fixed.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-03-15 00:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 3
+# Results first: they reference requests
+PARTITIONED_TABLES = ("generation_results", "generation_requests")
+
+REQUEST_COLUMNS = (
+    "id, correlation_id, user_id, organization_id, project_id, template_id, template_version, "
+    "parameters, options, status, mode, priority, created_at, updated_at, deleted_at"
+)
+RESULT_COLUMNS = (
+    "id, request_id, model_provider, model_id, model_version, raw_response, parsed_output, "
+    "validation_results, token_usage, cost_usd, latency_ms, storage_tier, archive_uri, "
+    "archived_at, legal_hold, created_at, updated_at, deleted_at"
+)
+
+
+# Partition naming and bounds as of this revision, kept here so later changes
+# to shared.partitions cannot change what this migration does
+def _month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition_sql(table: str, month: date) -> str:
+    upper = _add_months(month, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{table}_p{month:%Y_%m}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def _request_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("correlation_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id"), nullable=True),
+        sa.Column("template_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("prompt_templates.id"), nullable=False),
+        sa.Column("template_version", sa.String(50), nullable=True),
+        sa.Column("parameters", postgresql.JSONB, nullable=False, server_default="{}"),
+        sa.Column("options", postgresql.JSONB, nullable=False, server_default="{}"),
+        sa.Column("status", postgresql.ENUM(name="generation_status", create_type=False), nullable=False, server_default="pending"),
+        sa.Column("mode", postgresql.ENUM(name="request_mode", create_type=False), nullable=False, server_default="async"),
+        sa.Column("priority", postgresql.ENUM(name="request_priority", create_type=False), nullable=False, server_default="normal"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _result_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("request_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("model_provider", sa.String(100), nullable=False),
+        sa.Column("model_id", sa.String(100), nullable=False),
+        sa.Column("model_version", sa.String(100), nullable=True),
+        sa.Column("raw_response", sa.Text, nullable=False),
+        sa.Column("parsed_output", postgresql.JSONB, nullable=True),
+        sa.Column("validation_results", postgresql.JSONB, nullable=True),
+        sa.Column("token_usage", postgresql.JSONB, nullable=False, server_default="{}"),
+        sa.Column("cost_usd", sa.Numeric(10, 6), nullable=False, server_default="0"),
+        sa.Column("latency_ms", postgresql.JSONB, nullable=False, server_default="{}"),
+        sa.Column("storage_tier", postgresql.ENUM(name="storage_tier", create_type=False), nullable=False, server_default="hot"),
+        sa.Column("archive_uri", sa.String(512), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("legal_hold", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _create_secondary_indexes() -> None:
+    op.create_index("ix_generation_requests_template_id", "generation_requests", ["template_id"])
+    op.create_index(
+        "ix_generation_requests_org_created_id",
+        "generation_requests",
+        ["organization_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_generation_results_lifecycle",
+        "generation_results",
+        ["storage_tier", "created_at"],
+        postgresql_where=sa.text("legal_hold = false AND storage_tier <> 'cold'"),
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # The old tables keep their index names until dropped; only the primary key
+    # constraint names would clash with the new tables and are renamed
+    op.drop_constraint("usage_records_request_id_fkey", "usage_records", type_="foreignkey")
+    op.rename_table("generation_results", "generation_results_unpartitioned")
+    op.rename_table("generation_requests", "generation_requests_unpartitioned")
+    op.execute(
+        "ALTER TABLE generation_requests_unpartitioned "
+        "RENAME CONSTRAINT generation_requests_pkey TO generation_requests_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE generation_results_unpartitioned "
+        "RENAME CONSTRAINT generation_results_pkey TO generation_results_unpartitioned_pkey"
+    )
+
+    op.create_table(
+        "generation_requests",
+        *_request_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="generation_requests_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_table(
+        "generation_results",
+        *_result_columns(),
+        sa.Column("request_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", "request_created_at", name="generation_results_pkey"),
+        sa.UniqueConstraint("request_id", "request_created_at", name="uq_generation_results_request"),
+        postgresql_partition_by="RANGE (request_created_at)",
+    )
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM generation_requests_unpartitioned")).scalar()
+    current = _month_start(datetime.now(timezone.utc))
+    month = _month_start(oldest.astimezone(timezone.utc)) if oldest is not None else current
+    while month <= _add_months(current, PREMAKE_MONTHS):
+        for table in PARTITIONED_TABLES:
+            op.execute(_create_partition_sql(table, month))
+        month = _add_months(month, 1)
+
+    op.execute(
+        f"INSERT INTO generation_requests ({REQUEST_COLUMNS}) "
+        f"SELECT {REQUEST_COLUMNS} FROM generation_requests_unpartitioned"
+    )
+    prefixed = ", ".join(f"r.{name.strip()}" for name in RESULT_COLUMNS.split(","))
+    op.execute(
+        f"INSERT INTO generation_results ({RESULT_COLUMNS}, request_created_at) "
+        f"SELECT {prefixed}, q.created_at FROM generation_results_unpartitioned r "
+        "JOIN generation_requests_unpartitioned q ON q.id = r.request_id"
+    )
+    op.drop_table("generation_results_unpartitioned")
+    op.drop_table("generation_requests_unpartitioned")
+
+    # Indexes and the foreign key are added after the bulk copy, which is far cheaper
+    op.create_index("ix_generation_requests_correlation_id", "generation_requests", ["correlation_id"])
+    _create_secondary_indexes()
+    op.create_foreign_key(
+        "generation_results_request_fkey",
+        "generation_results",
+        "generation_requests",
+        ["request_id", "request_created_at"],
+        ["id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    # Undoes the index upgrade() added; correlation ids get their unique
+    # constraint back below, which is all revision 005 had on the column
+    op.drop_index("ix_generation_requests_correlation_id", table_name="generation_requests")
+    op.rename_table("generation_results", "generation_results_partitioned")
+    op.rename_table("generation_requests", "generation_requests_partitioned")
+    op.execute(
+        "ALTER TABLE generation_requests_partitioned "
+        "RENAME CONSTRAINT generation_requests_pkey TO generation_requests_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE generation_results_partitioned "
+        "RENAME CONSTRAINT generation_results_pkey TO generation_results_partitioned_pkey"
+    )
+
+    op.create_table(
+        "generation_requests",
+        *_request_columns(),
+        sa.PrimaryKeyConstraint("id", name="generation_requests_pkey"),
+        sa.UniqueConstraint("correlation_id", name="generation_requests_correlation_id_key"),
+    )
+    op.create_table(
+        "generation_results",
+        *_result_columns(),
+        sa.PrimaryKeyConstraint("id", name="generation_results_pkey"),
+        sa.UniqueConstraint("request_id", name="generation_results_request_id_key"),
+        sa.ForeignKeyConstraint(["request_id"], ["generation_requests.id"], name="generation_results_request_id_fkey"),
+    )
+    op.execute(
+        f"INSERT INTO generation_requests ({REQUEST_COLUMNS}) "
+        f"SELECT {REQUEST_COLUMNS} FROM generation_requests_partitioned"
+    )
+    op.execute(
+        f"INSERT INTO generation_results ({RESULT_COLUMNS}) "
+        f"SELECT {RESULT_COLUMNS} FROM generation_results_partitioned"
+    )
+    # Dropping the parents drops every partition with them
+    op.drop_table("generation_results_partitioned")
+    op.drop_table("generation_requests_partitioned")
+
+    _create_secondary_indexes()
+    op.create_foreign_key(
+        "usage_records_request_id_fkey", "usage_records", "generation_requests", ["request_id"], ["id"]
+    )
@@ -0,0 +1,26 @@
+"""Trace context on outbox events.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-04-05 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("outbox_events", sa.Column("trace_context", postgresql.JSONB, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("outbox_events", "trace_context")
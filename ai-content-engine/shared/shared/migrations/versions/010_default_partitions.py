@@ -0,0 +1,44 @@
+"""Default partitions for generation_requests and generation_results.
+
+Rows whose partition key falls outside every monthly partition (the
+maintainer has not created that month yet, or a skewed clock) land in the
+default partition instead of failing the insert. The persistence service's
+partition maintenance moves them into their monthly partition.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-04-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Results first on the way down: they reference requests
+PARTITIONED_TABLES = ("generation_results", "generation_requests")
+
+
+def upgrade() -> None:
+    for table in reversed(PARTITIONED_TABLES):
+        op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in PARTITIONED_TABLES:
+        if bind.execute(sa.text(f'SELECT EXISTS (SELECT 1 FROM "{table}_default")')).scalar():
+            raise RuntimeError(
+                f"{table}_default is not empty; run partition maintenance to move its rows "
+                "into monthly partitions before downgrading"
+            )
+    for table in PARTITIONED_TABLES:
+        # Detached first: the results -> requests foreign key depends on the partition
+        op.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{table}_default"')
+        op.execute(f'DROP TABLE "{table}_default"')
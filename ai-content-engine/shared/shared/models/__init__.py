@@ -2,12 +2,15 @@
 
 from shared.models.audit import AuditLog
 from shared.models.base import Base
+from shared.models.event import OutboxEvent, ProcessedEvent
 from shared.models.generation import (
+    GenerationBatch,
     GenerationRequest,
     GenerationResult,
     GenerationStatus,
     RequestMode,
     RequestPriority,
+    StorageTier,
 )
 from shared.models.quota import Quota, Usage
 from shared.models.schema import OutputSchema
@@ -20,15 +23,19 @@ __all__ = [
     "Project",
     "User",
     "UserRole",
+    "GenerationBatch",
     "GenerationRequest",
     "GenerationResult",
     "GenerationStatus",
     "RequestMode",
     "RequestPriority",
+    "StorageTier",
     "PromptTemplate",
     "TemplateStatus",
     "OutputSchema",
     "Quota",
     "Usage",
     "AuditLog",
+    "ProcessedEvent",
+    "OutboxEvent",
 ]
@@ -1,9 +1,10 @@
 """Base model classes and mixins for all SQLAlchemy models."""
 
+import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Enum, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -14,6 +15,11 @@ class Base(DeclarativeBase):
     pass
 
 
+def enum_type(enum_class: type[enum.Enum], name: str) -> Enum:
+    """A Postgres enum column type stored by member value, as the migrations define it."""
+    return Enum(enum_class, name=name, values_callable=lambda members: [m.value for m in members])
+
+
 class UUIDPrimaryKeyMixin:
     """Mixin that adds a UUID primary key column."""
 
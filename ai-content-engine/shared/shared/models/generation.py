@@ -2,20 +2,26 @@
 
 import enum
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
 from sqlalchemy import (
-    Enum,
+    Boolean,
+    DateTime,
     ForeignKey,
+    ForeignKeyConstraint,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from shared.models.base import Base, SoftDeleteMixin, TimestampMixin, UUIDPrimaryKeyMixin
+from shared.models.base import Base, SoftDeleteMixin, TimestampMixin, UUIDPrimaryKeyMixin, enum_type
+from shared.utils.datetime import utcnow
 
 
 class GenerationStatus(str, enum.Enum):
@@ -37,11 +43,56 @@ class RequestPriority(str, enum.Enum):
     HIGH = "high"
 
 
+class StorageTier(str, enum.Enum):
+    HOT = "hot"
+    WARM = "warm"
+    COLD = "cold"
+
+
+class GenerationBatch(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """A set of generation requests submitted together.
+
+    Every request in a batch shares the batch's ``created_at`` so per-batch
+    queries touch a single partition of ``generation_requests``.
+    """
+
+    __tablename__ = "generation_batches"
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+    )
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
+    )
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class GenerationRequest(Base, UUIDPrimaryKeyMixin, TimestampMixin, SoftDeleteMixin):
-    __tablename__ = "generation_requests"
+    """Range-partitioned monthly by ``created_at`` (see ``shared.partitions``).
+
+    The table's primary key is ``(id, created_at)`` as Postgres requires the
+    partition key in every unique constraint; ``id`` alone stays the ORM
+    identity. Queries that can bound ``created_at`` should, so partitions
+    are pruned.
+    """
 
+    __tablename__ = "generation_requests"
+    __table_args__ = ({"postgresql_partition_by": "RANGE (created_at)"},)
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    # Set client-side so the partition key is known before the INSERT
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
     correlation_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), unique=True, nullable=False, default=uuid.uuid4
+        UUID(as_uuid=True), nullable=False, default=uuid.uuid4, index=True
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
@@ -59,40 +110,64 @@ class GenerationRequest(Base, UUIDPrimaryKeyMixin, TimestampMixin, SoftDeleteMix
     parameters: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     options: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     status: Mapped[GenerationStatus] = mapped_column(
-        Enum(GenerationStatus, name="generation_status"),
+        enum_type(GenerationStatus, "generation_status"),
         default=GenerationStatus.PENDING,
         nullable=False,
     )
     mode: Mapped[RequestMode] = mapped_column(
-        Enum(RequestMode, name="request_mode"),
+        enum_type(RequestMode, "request_mode"),
         default=RequestMode.ASYNC,
         nullable=False,
     )
     priority: Mapped[RequestPriority] = mapped_column(
-        Enum(RequestPriority, name="request_priority"),
+        enum_type(RequestPriority, "request_priority"),
         default=RequestPriority.NORMAL,
         nullable=False,
     )
 
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("generation_batches.id"), nullable=True
+    )
+
     result: Mapped["GenerationResult | None"] = relationship(back_populates="request")
 
 
 class GenerationResult(Base, UUIDPrimaryKeyMixin, TimestampMixin, SoftDeleteMixin):
+    """Range-partitioned monthly by ``request_created_at``, aligned with its request."""
+
     __tablename__ = "generation_results"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["request_id", "request_created_at"],
+            ["generation_requests.id", "generation_requests.created_at"],
+        ),
+        UniqueConstraint("request_id", "request_created_at", name="uq_generation_results_request"),
+        {"postgresql_partition_by": "RANGE (request_created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
 
-    request_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("generation_requests.id"), unique=True, nullable=False
+    request_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    request_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, nullable=False
     )
     model_provider: Mapped[str] = mapped_column(String(100), nullable=False)
     model_id: Mapped[str] = mapped_column(String(100), nullable=False)
     model_version: Mapped[str | None] = mapped_column(String(100), nullable=True)
     raw_response: Mapped[str] = mapped_column(Text, nullable=False)
-    parsed_output: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    parsed_output: Mapped[dict | list | None] = mapped_column(JSONB, nullable=True)
     validation_results: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     token_usage: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     cost_usd: Mapped[Decimal] = mapped_column(
         Numeric(10, 6), nullable=False, default=Decimal("0")
     )
     latency_ms: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    storage_tier: Mapped[StorageTier] = mapped_column(
+        enum_type(StorageTier, "storage_tier"),
+        default=StorageTier.HOT,
+        nullable=False,
+    )
+    archive_uri: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    legal_hold: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
     request: Mapped["GenerationRequest"] = relationship(back_populates="result")
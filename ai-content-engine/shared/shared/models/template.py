@@ -3,11 +3,11 @@
 import enum
 import uuid
 
-from sqlalchemy import Enum, ForeignKey, String, Text
+from sqlalchemy import ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from shared.models.base import Base, SoftDeleteMixin, TimestampMixin, UUIDPrimaryKeyMixin
+from shared.models.base import Base, SoftDeleteMixin, TimestampMixin, UUIDPrimaryKeyMixin, enum_type
 
 
 class TemplateStatus(str, enum.Enum):
@@ -31,7 +31,7 @@ class PromptTemplate(Base, UUIDPrimaryKeyMixin, TimestampMixin, SoftDeleteMixin)
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, nullable=False, default=dict)
     content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     status: Mapped[TemplateStatus] = mapped_column(
-        Enum(TemplateStatus, name="template_status"),
+        enum_type(TemplateStatus, "template_status"),
         default=TemplateStatus.DRAFT,
         nullable=False,
     )
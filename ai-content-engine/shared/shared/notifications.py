@@ -0,0 +1,131 @@
+"""Generation completion notifications over Redis pub/sub.
+
+Persistence publishes one message per finished request after its result is
+committed; ingestion processes hold a single pattern subscription and wake
+the HTTP handlers waiting on those requests, so waiting clients never poll
+Postgres.
+"""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = structlog.get_logger(__name__)
+
+COMPLETION_CHANNEL_PREFIX = "generation:completed:"
+
+
+def completion_channel(request_id: uuid.UUID) -> str:
+    return f"{COMPLETION_CHANNEL_PREFIX}{request_id}"
+
+
+class CompletionNotifier:
+    """Publishes completion messages; publishing is best effort."""
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    async def publish(self, completions: Iterable[tuple[uuid.UUID, str]]) -> None:
+        """Publish (request_id, status) pairs in one pipelined round trip."""
+        pipe = self._redis.pipeline(transaction=False)
+        count = 0
+        for request_id, status in completions:
+            pipe.publish(
+                completion_channel(request_id),
+                json.dumps({"request_id": str(request_id), "status": status}),
+            )
+            count += 1
+        if not count:
+            return
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            # Waiters fall back to their timeout and a final database read
+            logger.warning("completion_notify_failed", error=str(e), count=count)
+
+
+class CompletionWaiter:
+    """Lets request handlers await completion of a generation request.
+
+    One ``PSUBSCRIBE`` per process receives every completion; messages are
+    dispatched to futures registered through ``expect``. Register before
+    reading the request's current status so a completion landing between
+    the read and the wait is not missed.
+    """
+
+    def __init__(self, redis: Redis, reconnect_backoff_ms: int = 1000) -> None:
+        self._redis = redis
+        self._reconnect_backoff = reconnect_backoff_ms / 1000
+        self._waiters: dict[uuid.UUID, set[asyncio.Future[str]]] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen())
+        logger.info("completion_waiter_started")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+
+    @contextmanager
+    def expect(self, request_id: uuid.UUID) -> Iterator[asyncio.Future[str]]:
+        """Register interest in a request; the future resolves to its final status."""
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, set()).add(future)
+        try:
+            yield future
+        finally:
+            futures = self._waiters.get(request_id)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._waiters[request_id]
+
+    @staticmethod
+    async def wait(future: asyncio.Future[str], timeout: float) -> str | None:
+        """Wait up to ``timeout`` seconds; returns the status or None on timeout."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            return None
+
+    def _dispatch(self, data: bytes | str) -> None:
+        try:
+            message = json.loads(data)
+            request_id = uuid.UUID(message["request_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("completion_message_invalid")
+            return
+        for future in self._waiters.get(request_id, ()):
+            if not future.done():
+                future.set_result(message.get("status", ""))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{COMPLETION_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except RedisError as e:
+                logger.warning("completion_subscription_lost", error=str(e))
+                await asyncio.sleep(self._reconnect_backoff)
+            finally:
+                await pubsub.aclose()
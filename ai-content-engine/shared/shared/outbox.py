@@ -0,0 +1,99 @@
+"""Transactional outbox: enqueue Kafka messages with DB writes, publish them later."""
+
+import asyncio
+from collections.abc import Iterable
+
+import structlog
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.kafka import AsyncKafkaProducer
+from shared.models.event import OutboxEvent
+from shared.tracing import carrier_headers, current_carrier
+
+logger = structlog.get_logger(__name__)
+
+OutboxMessage = tuple[str, dict, str | None]
+
+
+async def enqueue(session: AsyncSession, messages: Iterable[OutboxMessage]) -> None:
+    """Add (topic, value, key) messages to the outbox in the session's transaction.
+
+    The active trace context is stored with them so the relay can publish
+    them as part of the trace that produced them.
+    """
+    trace_context = current_carrier() or None
+    rows = [
+        {"topic": topic, "payload": value, "key": key, "trace_context": trace_context}
+        for topic, value, key in messages
+    ]
+    if rows:
+        await session.execute(insert(OutboxEvent), rows)
+
+
+class OutboxRelay:
+    """Drains the outbox to Kafka in batches.
+
+    Each pass locks up to ``batch_size`` of the oldest rows with ``FOR UPDATE
+    SKIP LOCKED`` (so several relays can run side by side), publishes them
+    with pipelined sends and deletes them in the same transaction. A failed
+    publish (or delete) rolls back and the rows are published again, so
+    delivery is at least once: consumers of these topics must claim the
+    envelope's ``event_id`` (see ``shared.dedup``) before acting on it.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        producer: AsyncKafkaProducer,
+        batch_size: int = 500,
+        poll_interval_ms: int = 50,
+        retry_backoff_ms: int = 1000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._producer = producer
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval_ms / 1000
+        self._retry_backoff = retry_backoff_ms / 1000
+
+    async def run_once(self) -> int:
+        """Publish one batch; returns the number of messages sent."""
+        async with self._session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        OutboxEvent.id,
+                        OutboxEvent.topic,
+                        OutboxEvent.key,
+                        OutboxEvent.payload,
+                        OutboxEvent.trace_context,
+                    )
+                    .order_by(OutboxEvent.id)
+                    .limit(self._batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not rows:
+                return 0
+            await self._producer.send_many(
+                (row.topic, row.payload, row.key, carrier_headers(row.trace_context))
+                for row in rows
+            )
+            await session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+            await session.commit()
+        logger.debug("outbox_batch_published", count=len(rows))
+        return len(rows)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                sent = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("outbox_relay_failed")
+                await asyncio.sleep(self._retry_backoff)
+                continue
+            # A full batch means a backlog: keep draining without sleeping
+            if sent < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
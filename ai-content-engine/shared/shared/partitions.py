@@ -0,0 +1,282 @@
+"""Monthly range partition management for the generation tables.
+
+``generation_requests`` is partitioned by ``created_at`` and
+``generation_results`` by ``request_created_at`` (its request's creation
+time), so a month of requests and their results always live in partitions
+with the same bounds and can be dropped together. Partitions are named
+``<table>_pYYYY_MM`` and cover ``[first of month, first of next month)`` UTC.
+Rows outside every monthly partition land in ``<table>_default`` and are
+moved into their month by ``ensure_partitions``.
+"""
+
+import asyncio
+import re
+from collections.abc import Iterable
+from datetime import date, datetime
+
+import structlog
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from shared.utils.datetime import utcnow
+
+logger = structlog.get_logger(__name__)
+
+# Parent tables in drop order: results reference requests, so they go first
+PARTITIONED_TABLES = ("generation_results", "generation_requests")
+PARTITION_KEYS = {"generation_results": "request_created_at", "generation_requests": "created_at"}
+
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _bounds(month: date) -> tuple[str, str]:
+    lower = month_start(month)
+    upper = add_months(lower, 1)
+    return f"'{lower.isoformat()} 00:00:00+00'", f"'{upper.isoformat()} 00:00:00+00'"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL creating the partition of ``table`` for the month starting at ``month``."""
+    lower, upper = _bounds(month)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month_start(month))}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ({lower}) TO ({upper})"
+    )
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """Month starts from ``first`` through ``last`` inclusive."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+async def ensure_partitions(
+    conn: AsyncConnection | AsyncSession,
+    first: date,
+    last: date,
+) -> None:
+    """Create any missing monthly partitions of every partitioned table in [first, last].
+
+    Months with rows in a default partition are split out of it first,
+    since Postgres refuses to create a partition whose range has rows in the
+    default partition.
+    """
+    await move_default_rows(conn)
+    for month in months_between(first, last):
+        for table in PARTITIONED_TABLES:
+            await conn.execute(text(create_partition_sql(table, month)))
+
+
+async def move_default_rows(conn: AsyncConnection | AsyncSession) -> list[date]:
+    """Move rows out of the default partitions into their monthly partitions.
+
+    Each month's partitions are built as plain tables, filled from the
+    default partitions and then attached. Results move out before requests
+    and requests attach before results, so the foreign key between them is
+    never violated. Returns the months that were split out.
+    """
+    months: set[date] = set()
+    for table in PARTITIONED_TABLES:
+        result = await conn.execute(
+            text(
+                f"SELECT DISTINCT date_trunc('month', {PARTITION_KEYS[table]} AT TIME ZONE 'UTC')::date "
+                f'FROM "{default_partition_name(table)}"'
+            )
+        )
+        months.update(result.scalars())
+    for month in sorted(months):
+        existing = {table: await list_partitions(conn, table) for table in PARTITIONED_TABLES}
+        lower, upper = _bounds(month)
+        created = []
+        for table in PARTITIONED_TABLES:
+            if month in existing[table]:
+                continue
+            name = partition_name(table, month)
+            key = PARTITION_KEYS[table]
+            await conn.execute(
+                text(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            )
+            await conn.execute(
+                text(
+                    f'WITH moved AS (DELETE FROM "{default_partition_name(table)}" '
+                    f"WHERE {key} >= {lower} AND {key} < {upper} RETURNING *) "
+                    f'INSERT INTO "{name}" SELECT * FROM moved'
+                )
+            )
+            created.append(table)
+        for table in reversed(created):
+            await conn.execute(
+                text(
+                    f'ALTER TABLE "{table}" ATTACH PARTITION "{partition_name(table, month)}" '
+                    f"FOR VALUES FROM ({lower}) TO ({upper})"
+                )
+            )
+    if months:
+        logger.warning(
+            "default_partition_rows_moved", months=[month.isoformat() for month in sorted(months)]
+        )
+    return sorted(months)
+
+
+def _by_month(table: str, names: Iterable[str]) -> dict[date, str]:
+    """Monthly partition names of ``table`` keyed by month start; other names are ignored."""
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$")
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def list_partitions(conn: AsyncConnection | AsyncSession, table: str) -> dict[date, str]:
+    """Monthly partitions of ``table`` keyed by month start; other children are ignored."""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return _by_month(table, result.scalars())
+
+
+async def list_detached_partitions(
+    conn: AsyncConnection | AsyncSession, table: str
+) -> dict[date, str]:
+    """Monthly partitions of ``table`` that were detached but not yet dropped."""
+    result = await conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition AND relname LIKE :prefix"
+        ),
+        {"prefix": f"{table}\\_p%"},
+    )
+    return _by_month(table, result.scalars())
+
+
+class PartitionMaintainer:
+    """Keeps future partitions created ahead of time and drops expired ones.
+
+    Retention drops whole partitions instead of deleting rows. A month is
+    kept as long as any of its results is under legal hold.
+
+    Detaching a partition locks its parent exclusively, and Postgres does
+    not allow ``DETACH ... CONCURRENTLY`` while a default partition exists.
+    So each detach and drop runs in its own short transaction under
+    ``lock_timeout_ms``: rather than queueing behind long-running queries
+    (and stalling every query behind it), it gives up and is retried on the
+    next run.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        premake_months: int = 3,
+        retention_months: int | None = None,
+        lock_timeout_ms: int = 2000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._premake_months = premake_months
+        self._retention_months = retention_months
+        self._lock_timeout_ms = lock_timeout_ms
+
+    async def create_upcoming(self, now: datetime | None = None) -> None:
+        current = month_start(now or utcnow())
+        async with self._session_factory() as session:
+            await ensure_partitions(session, current, add_months(current, self._premake_months))
+            await session.commit()
+
+    async def _execute_with_lock_timeout(self, statement: str) -> None:
+        async with self._session_factory() as session:
+            await session.execute(text(f"SET LOCAL lock_timeout = {int(self._lock_timeout_ms)}"))
+            await session.execute(text(statement))
+            await session.commit()
+
+    async def drop_expired(self, now: datetime | None = None) -> list[str]:
+        """Drop partitions entirely older than the retention window; returns their names."""
+        if not self._retention_months:
+            return []
+        cutoff = add_months(month_start(now or utcnow()), -self._retention_months)
+        async with self._session_factory() as session:
+            results = await list_partitions(session, "generation_results")
+            requests = await list_partitions(session, "generation_requests")
+            expired = []
+            for month in sorted(results.keys() | requests.keys()):
+                if month >= cutoff:
+                    continue
+                held = month in results and (
+                    await session.execute(
+                        text(f'SELECT EXISTS (SELECT 1 FROM "{results[month]}" WHERE legal_hold)')
+                    )
+                ).scalar_one()
+                if held:
+                    logger.warning("partition_retention_skipped_legal_hold", month=month.isoformat())
+                    continue
+                expired.append(month)
+            # Detached by an earlier run whose DROP did not get its lock
+            leftovers = [
+                name
+                for table in PARTITIONED_TABLES
+                for month, name in sorted((await list_detached_partitions(session, table)).items())
+                if month < cutoff
+            ]
+
+        dropped: list[str] = []
+        try:
+            for name in leftovers:
+                await self._execute_with_lock_timeout(f'DROP TABLE "{name}"')
+                dropped.append(name)
+            for month in expired:
+                for table, partitions in (("generation_results", results), ("generation_requests", requests)):
+                    if month not in partitions:
+                        continue
+                    # Detach first: it validates the results -> requests foreign key
+                    await self._execute_with_lock_timeout(
+                        f'ALTER TABLE "{table}" DETACH PARTITION "{partitions[month]}"'
+                    )
+                    await self._execute_with_lock_timeout(f'DROP TABLE "{partitions[month]}"')
+                    dropped.append(partitions[month])
+        except exc.DBAPIError as e:
+            # Typically lock_timeout: whatever is left is retried on the next run
+            logger.warning("partition_retention_deferred", error=str(e), dropped=dropped)
+        if dropped:
+            logger.info("partitions_dropped", partitions=dropped)
+        return dropped
+
+    async def run_once(self) -> None:
+        await self.create_upcoming()
+        await self.drop_expired()
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("partition_maintenance_failed")
+            await asyncio.sleep(interval_seconds)
+
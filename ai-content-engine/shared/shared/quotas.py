@@ -0,0 +1,280 @@
+"""Quota enforcement and usage metering on Redis sliding-window counters.
+
+Each (organization, quota_type, period) window is a Redis hash of
+fixed-width buckets: the window total is the sum of the buckets still inside
+it, so the window slides one bucket at a time. Admission checks every quota
+of an organization and consumes from them in a single Lua script call.
+
+Token usage is counted by the model layer as calls finish and is also
+queued on a Redis list. ``UsageRollup`` drains that list into
+``usage_records`` in bulk, so no database write happens per request.
+"""
+
+import asyncio
+import json
+import math
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Integer, Numeric, column, func, insert, select, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.exceptions import RateLimitError
+from shared.models.generation import GenerationRequest
+from shared.models.quota import Usage
+
+logger = structlog.get_logger(__name__)
+
+QUOTA_KEY_PREFIX = "quota:"
+USAGE_QUEUE_KEY = "usage:pending"
+USAGE_ROLLUP_LOCK_KEY = "usage:rollup:lock"
+
+REQUESTS_QUOTA = "requests"
+TOKENS_QUOTA = "tokens"
+
+# period -> (window seconds, buckets per window)
+PERIODS: dict[str, tuple[int, int]] = {
+    "minute": (60, 12),
+    "hourly": (3600, 60),
+    "daily": (86400, 96),
+    "monthly": (30 * 86400, 120),
+}
+
+# Returns 0 when every window has room (and consumes from all of them), or
+# {index, oldest bucket} of the first exhausted window. An amount of 0 only
+# checks that the window is not already at its limit.
+_CHECK_AND_CONSUME = """
+local exhausted = 0
+local oldest = 0
+for i, key in ipairs(KEYS) do
+    local base = (i - 1) * 5
+    local bucket = tonumber(ARGV[base + 1])
+    local buckets = tonumber(ARGV[base + 2])
+    local limit = tonumber(ARGV[base + 3])
+    local amount = tonumber(ARGV[base + 4])
+    local total = 0
+    local first = bucket
+    local entries = redis.call('HGETALL', key)
+    for j = 1, #entries, 2 do
+        local b = tonumber(entries[j])
+        if b > bucket - buckets then
+            total = total + tonumber(entries[j + 1])
+            if b < first then first = b end
+        else
+            redis.call('HDEL', key, entries[j])
+        end
+    end
+    local over
+    if amount > 0 then over = total + amount > limit else over = total >= limit end
+    if over and exhausted == 0 then
+        exhausted = i
+        oldest = first
+    end
+end
+if exhausted > 0 then
+    return {exhausted, oldest}
+end
+for i, key in ipairs(KEYS) do
+    local base = (i - 1) * 5
+    local amount = tonumber(ARGV[base + 4])
+    if amount > 0 then
+        redis.call('HINCRBY', key, ARGV[base + 1], amount)
+        redis.call('EXPIRE', key, ARGV[base + 5])
+    end
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class QuotaLimit:
+    quota_type: str
+    period: str
+    max_value: int
+
+
+def quota_key(organization_id: uuid.UUID | str, quota_type: str, period: str) -> str:
+    return f"{QUOTA_KEY_PREFIX}{organization_id}:{quota_type}:{period}"
+
+
+def _bucket(period: str, now: float) -> tuple[int, int, float]:
+    """Current bucket number, bucket count and bucket width for ``period``."""
+    window, buckets = PERIODS[period]
+    width = window / buckets
+    return int(now // width), buckets, width
+
+
+class QuotaEnforcer:
+    """Checks and consumes organization quotas in one Redis round trip."""
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+        self._script = redis.register_script(_CHECK_AND_CONSUME)
+
+    async def admit(
+        self,
+        organization_id: uuid.UUID,
+        limits: Iterable[QuotaLimit],
+        requests: int = 1,
+    ) -> None:
+        """Consume ``requests`` from request quotas and check token quotas have room.
+
+        Raises RateLimitError, with the seconds until the exhausted window
+        frees up, when any quota is exhausted. Quotas with an unknown period
+        are ignored, and Redis failures let the request through.
+        """
+        now = time.time()
+        keys: list[str] = []
+        args: list[int] = []
+        checked: list[tuple[QuotaLimit, float]] = []
+        for limit in limits:
+            if limit.period not in PERIODS:
+                logger.warning("quota_period_unsupported", period=limit.period)
+                continue
+            if limit.quota_type == REQUESTS_QUOTA:
+                amount = requests
+            elif limit.quota_type == TOKENS_QUOTA:
+                amount = 0
+            else:
+                continue
+            bucket, buckets, width = _bucket(limit.period, now)
+            keys.append(quota_key(organization_id, limit.quota_type, limit.period))
+            args += [bucket, buckets, limit.max_value, amount, PERIODS[limit.period][0]]
+            checked.append((limit, width))
+        if not keys:
+            return
+
+        try:
+            result = await self._script(keys=keys, args=args)
+        except RedisError as e:
+            logger.warning("quota_check_failed", error=str(e))
+            return
+        if result == 0:
+            return
+        index, oldest = int(result[0]), int(result[1])
+        limit, width = checked[index - 1]
+        buckets = PERIODS[limit.period][1]
+        retry_after = max(1, math.ceil((oldest + buckets) * width - now))
+        raise RateLimitError(
+            message=f"{limit.period} {limit.quota_type} quota of {limit.max_value} exceeded",
+            retry_after=retry_after,
+        )
+
+
+class UsageMeter:
+    """Counts generated tokens against token quotas and queues usage for rollup."""
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+
+    async def record(
+        self,
+        organization_id: uuid.UUID | str,
+        request_id: uuid.UUID | str,
+        tokens_used: int,
+        cost_usd: float,
+    ) -> None:
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        for period, (window, _) in PERIODS.items():
+            key = quota_key(organization_id, TOKENS_QUOTA, period)
+            pipe.hincrby(key, str(_bucket(period, now)[0]), tokens_used)
+            pipe.expire(key, window)
+        pipe.rpush(
+            USAGE_QUEUE_KEY,
+            json.dumps(
+                {"request_id": str(request_id), "tokens_used": tokens_used, "cost_usd": cost_usd}
+            ),
+        )
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            logger.warning("usage_record_failed", error=str(e), request_id=str(request_id))
+
+
+class UsageRollup:
+    """Moves queued usage entries into ``usage_records`` in bulk.
+
+    Entries are read, inserted, and only then trimmed from the queue under a
+    Redis lock, so concurrent replicas never insert the same entries twice.
+    User and organization come from the generation request row.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        redis: Redis,
+        batch_size: int = 1000,
+        lock_timeout_seconds: int = 60,
+    ) -> None:
+        self._session_factory = session_factory
+        self._redis = redis
+        self._batch_size = batch_size
+        self._lock_timeout = lock_timeout_seconds
+
+    async def run_once(self) -> int:
+        """Roll up queued entries until the queue is empty; returns rows written."""
+        lock = self._redis.lock(USAGE_ROLLUP_LOCK_KEY, timeout=self._lock_timeout)
+        if not await lock.acquire(blocking=False):
+            return 0
+        written = 0
+        try:
+            while True:
+                raw = await self._redis.lrange(USAGE_QUEUE_KEY, 0, self._batch_size - 1)
+                if not raw:
+                    break
+                written += await self._insert([json.loads(entry) for entry in raw])
+                await self._redis.ltrim(USAGE_QUEUE_KEY, len(raw), -1)
+                if len(raw) < self._batch_size:
+                    break
+        finally:
+            await lock.release()
+        if written:
+            logger.info("usage_rolled_up", rows=written)
+        return written
+
+    async def _insert(self, entries: list[dict]) -> int:
+        usage = values(
+            column("request_id", UUID(as_uuid=True)),
+            column("tokens_used", Integer),
+            column("cost_usd", Numeric(10, 6)),
+            name="usage",
+        ).data(
+            [
+                (uuid.UUID(e["request_id"]), int(e["tokens_used"]), e["cost_usd"])
+                for e in entries
+            ]
+        )
+        stmt = insert(Usage).from_select(
+            ["id", "organization_id", "user_id", "request_id", "tokens_used", "cost_usd"],
+            select(
+                func.gen_random_uuid(),
+                GenerationRequest.organization_id,
+                GenerationRequest.user_id,
+                usage.c.request_id,
+                usage.c.tokens_used,
+                usage.c.cost_usd,
+            ).join(usage, GenerationRequest.id == usage.c.request_id),
+        )
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        if result.rowcount < len(entries):
+            logger.warning("usage_requests_missing", dropped=len(entries) - result.rowcount)
+        return result.rowcount
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("usage_rollup_failed")
+            await asyncio.sleep(interval_seconds)
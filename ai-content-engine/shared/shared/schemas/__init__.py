@@ -1,9 +1,15 @@
 """Shared API response schemas."""
 
 from shared.schemas.health import HealthCheckResponse
-from shared.schemas.responses import DataResponse, ErrorResponse, PaginatedResponse
+from shared.schemas.responses import (
+    CursorPaginatedResponse,
+    DataResponse,
+    ErrorResponse,
+    PaginatedResponse,
+)
 
 __all__ = [
+    "CursorPaginatedResponse",
     "DataResponse",
     "ErrorResponse",
     "PaginatedResponse",
@@ -32,3 +32,15 @@ class PaginationMeta(BaseModel):
 class PaginatedResponse(BaseModel, Generic[T]):
     data: list[T]
     meta: PaginationMeta
+
+
+class CursorPaginationMeta(BaseModel):
+    page_size: int
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_items: int | None = None
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    data: list[T]
+    meta: CursorPaginationMeta
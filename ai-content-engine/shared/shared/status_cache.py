@@ -0,0 +1,141 @@
+"""Write-through cache of generation request statuses.
+
+Persistence writes every status transition it commits; ingestion serves
+status reads from a short-lived in-process layer backed by Redis and falls
+back to the database only on a miss, filling the cache with ``SET NX`` so a
+fill can never overwrite a newer transition written concurrently. Entries
+carry the request's organization so reads can be scoped to the caller.
+"""
+
+import json
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TypedDict
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from shared.metrics import CacheMetrics
+from shared.models.generation import GenerationStatus
+from shared.utils.cache import TTLCache
+from shared.utils.datetime import utcnow
+
+logger = structlog.get_logger(__name__)
+
+STATUS_KEY_PREFIX = "generation:status:"
+
+# Statuses after which a request no longer changes
+FINAL_STATUSES = frozenset(
+    status.value
+    for status in (GenerationStatus.COMPLETED, GenerationStatus.FAILED, GenerationStatus.CANCELLED)
+)
+
+
+class StatusEntry(TypedDict):
+    status: str
+    updated_at: str
+    organization_id: str | None
+
+
+def status_key(request_id: uuid.UUID) -> str:
+    return f"{STATUS_KEY_PREFIX}{request_id}"
+
+
+class StatusCache:
+    """Redis-backed status lookups with an optional in-process TTL layer.
+
+    The local layer (disabled when ``local_ttl_seconds`` is 0) bounds how
+    stale a read can be on a process that did not write the transition.
+    Final statuses are kept for ``ttl_seconds``. In-flight statuses filled
+    from the database only live for ``pending_ttl_seconds``: they are
+    replaced by a write-through only when the request finishes, and if that
+    write is lost a long-lived entry would report the request unfinished
+    for its whole TTL. Cache failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl_seconds: int = 86400,
+        local_ttl_seconds: float = 1.0,
+        local_max_size: int = 10_000,
+        pending_ttl_seconds: int = 5,
+    ) -> None:
+        self._redis = redis
+        self._ttl = ttl_seconds
+        self._pending_ttl = pending_ttl_seconds
+        self._local: TTLCache[StatusEntry] | None = (
+            TTLCache(local_ttl_seconds, local_max_size, name="status_local")
+            if local_ttl_seconds > 0
+            else None
+        )
+        self._metrics = CacheMetrics("status_redis")
+
+    async def get(self, request_id: uuid.UUID) -> StatusEntry | None:
+        if self._local is not None:
+            entry = self._local.get(request_id)
+            if entry is not None:
+                return entry
+        try:
+            raw = await self._redis.get(status_key(request_id))
+        except RedisError as e:
+            logger.warning("status_cache_read_failed", error=str(e))
+            return None
+        self._metrics.record(raw is not None)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if self._local is not None:
+            self._local.set(request_id, entry)
+        return entry
+
+    async def set_many(
+        self,
+        statuses: Iterable[tuple[uuid.UUID, str, uuid.UUID | None]],
+        updated_at: datetime | None = None,
+    ) -> None:
+        """Record (request_id, status, organization_id) transitions, overwriting cached entries."""
+        await self._write(statuses, updated_at or utcnow(), only_if_absent=False)
+
+    async def fill(
+        self,
+        request_id: uuid.UUID,
+        status: str,
+        updated_at: datetime,
+        organization_id: uuid.UUID,
+    ) -> None:
+        """Cache a status read from the database unless a transition is already cached."""
+        await self._write(
+            [(request_id, status, organization_id)], updated_at, only_if_absent=True
+        )
+
+    async def _write(
+        self,
+        statuses: Iterable[tuple[uuid.UUID, str, uuid.UUID | None]],
+        updated_at: datetime,
+        only_if_absent: bool,
+    ) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        count = 0
+        for request_id, status, organization_id in statuses:
+            entry = StatusEntry(
+                status=status,
+                updated_at=updated_at.isoformat(),
+                organization_id=str(organization_id) if organization_id else None,
+            )
+            ttl = self._ttl if status in FINAL_STATUSES else self._pending_ttl
+            pipe.set(status_key(request_id), json.dumps(entry), ex=ttl, nx=only_if_absent)
+            if self._local is not None:
+                if only_if_absent:
+                    self._local.invalidate(request_id)
+                else:
+                    self._local.set(request_id, entry)
+            count += 1
+        if not count:
+            return
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            logger.warning("status_cache_write_failed", error=str(e), count=count)
@@ -0,0 +1,112 @@
+"""OpenTelemetry tracing across HTTP and Kafka hops.
+
+Trace context travels in W3C ``traceparent``/``tracestate`` message headers:
+``AsyncKafkaProducer`` injects the current context into every message and
+``AsyncKafkaConsumer`` runs each handler under a consumer span continuing
+it, so one request's spans line up from ingestion through persistence.
+Messages published through the outbox carry the context captured when they
+were enqueued. Batch handlers get one span linked to every message's trace.
+
+Without an OTLP endpoint no SDK provider is installed and the API's
+no-op tracer makes every span free.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Link, Span, SpanKind
+
+KafkaHeaders = list[tuple[str, bytes]]
+
+tracer = trace.get_tracer("ai_content_engine")
+
+
+def setup_tracing(service_name: str, otlp_endpoint: str = "", sample_ratio: float = 1.0) -> None:
+    """Export spans over OTLP/HTTP to ``otlp_endpoint``; a no-op when it is empty.
+
+    New traces are sampled at ``sample_ratio``; continued traces follow the
+    caller's sampling decision so a trace is never exported in part.
+    """
+    if not otlp_endpoint:
+        return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{otlp_endpoint.rstrip('/')}/v1/traces"))
+    )
+    trace.set_tracer_provider(provider)
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans on shutdown."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def current_carrier() -> dict[str, str]:
+    """The active trace context as W3C headers; empty outside a sampled span."""
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def carrier_headers(carrier: Mapping[str, str] | None) -> KafkaHeaders:
+    return [(key, value.encode()) for key, value in (carrier or {}).items()]
+
+
+def inject_headers() -> KafkaHeaders:
+    """Kafka headers carrying the active trace context."""
+    return carrier_headers(current_carrier())
+
+
+def extract_context(headers: Iterable[tuple[str, bytes | None]] | None) -> Context:
+    carrier = {key: value.decode() for key, value in headers or () if value is not None}
+    return propagate.extract(carrier)
+
+
+def _message_attributes(topic: str) -> dict[str, str]:
+    return {"messaging.system": "kafka", "messaging.destination.name": topic}
+
+
+@contextmanager
+def consume_span(message) -> Iterator[Span]:
+    """Span for handling one consumed record, continuing the producer's trace."""
+    with tracer.start_as_current_span(
+        f"{message.topic} process",
+        context=extract_context(message.headers),
+        kind=SpanKind.CONSUMER,
+        attributes={
+            **_message_attributes(message.topic),
+            "messaging.kafka.destination.partition": message.partition,
+            "messaging.kafka.message.offset": message.offset,
+        },
+    ) as span:
+        yield span
+
+
+@contextmanager
+def consume_batch_span(topic: str, messages: list) -> Iterator[Span]:
+    """Span for handling a batch, linked to the trace of every message in it."""
+    links = []
+    for message in messages:
+        span_context = trace.get_current_span(extract_context(message.headers)).get_span_context()
+        if span_context.is_valid:
+            links.append(Link(span_context))
+    with tracer.start_as_current_span(
+        f"{topic} process",
+        context=Context(),
+        kind=SpanKind.CONSUMER,
+        links=links,
+        attributes={**_message_attributes(topic), "messaging.batch.message_count": len(messages)},
+    ) as span:
+        yield span
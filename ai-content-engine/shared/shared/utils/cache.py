@@ -0,0 +1,59 @@
+"""Small in-process caches."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from shared.metrics import CacheMetrics
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU mapping whose entries expire ``ttl_seconds`` after being set.
+
+    ``set`` can give an entry a shorter lifetime of its own.
+
+    Not thread-safe; intended for use from a single event loop. A ``name``
+    reports hits and misses under that cache label in ``cache_requests_total``.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024, name: str | None = None) -> None:
+        self._ttl = ttl_seconds
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._metrics = CacheMetrics(name) if name else None
+
+    def get(self, key: Hashable) -> V | None:
+        value = self._get(key)
+        if self._metrics is not None:
+            self._metrics.record(value is not None)
+        return value
+
+    def _get(self, key: Hashable) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl_seconds: float | None = None) -> None:
+        ttl = self._ttl if ttl_seconds is None else min(ttl_seconds, self._ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,41 @@
+"""Opaque keyset cursors for ``(created_at, id)`` ordered listings."""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from shared.exceptions import ValidationError
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; raises ValidationError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValidationError(
+            message="Invalid pagination cursor",
+            details=[{"field": "cursor", "message": str(e)}],
+        ) from e
+
+
+def next_page(rows: list, page_size: int) -> tuple[list, str | None]:
+    """Trim a ``page_size + 1`` keyset fetch to a page and derive the next cursor.
+
+    Rows must expose ``created_at`` and ``id``; the extra row is only used to
+    detect whether another page exists.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,104 @@
+import fakeredis
+import pytest
+
+from shared.admission import LAG_KEY_PREFIX, AdmissionController, ConsumerLagReporter
+from shared.exceptions import RateLimitError
+
+THRESHOLDS = {"low": 100, "normal": 500, "high": 2_000}
+
+
+class FakeConsumer:
+    def __init__(self, lag: dict[str, int]) -> None:
+        self.lag_by_lane = lag
+
+    async def lag(self) -> dict[str, int]:
+        return dict(self.lag_by_lane)
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+
+def controller(redis, backlog: int = 0, **kwargs) -> AdmissionController:
+    admission = AdmissionController(redis, thresholds=THRESHOLDS, **kwargs)
+    admission.backlog = backlog
+    return admission
+
+
+@pytest.mark.parametrize(
+    ("backlog", "shed"),
+    [
+        (0, set()),
+        (100, set()),
+        (101, {"low"}),
+        (500, {"low"}),
+        (501, {"low", "normal"}),
+        (2_001, {"low", "normal", "high"}),
+    ],
+)
+def test_lower_priorities_are_shed_first(redis, backlog, shed):
+    admission = controller(redis, backlog)
+
+    rejected = set()
+    for priority in THRESHOLDS:
+        try:
+            admission.check(priority)
+        except RateLimitError:
+            rejected.add(priority)
+
+    assert rejected == shed
+
+
+def test_unknown_priorities_are_never_shed(redis):
+    controller(redis, backlog=10**9).check("urgent")
+
+
+@pytest.mark.parametrize(
+    ("backlog", "retry_after"), [(101, 6), (200, 10), (1_000, 50), (5_000, 60)]
+)
+def test_retry_after_grows_with_the_overload_up_to_a_cap(redis, backlog, retry_after):
+    admission = controller(redis, backlog, retry_after_seconds=5, max_retry_after_seconds=60)
+
+    with pytest.raises(RateLimitError) as excinfo:
+        admission.check("low")
+
+    assert excinfo.value.retry_after == retry_after
+
+
+async def test_backlog_is_the_total_lag_of_the_most_lagged_group(redis):
+    # Two instances of the model layer share the lag of its group
+    await ConsumerLagReporter(redis, FakeConsumer({"low": 300, "normal": 100}), "model").run_once()
+    await ConsumerLagReporter(redis, FakeConsumer({"high": 250}), "model").run_once()
+    await ConsumerLagReporter(redis, FakeConsumer({"normal": 600}), "prompt").run_once()
+    admission = controller(redis)
+
+    await admission.refresh()
+
+    assert admission.backlog == 650
+    with pytest.raises(RateLimitError):
+        admission.check("normal")
+    admission.check("high")
+
+
+async def test_reports_expire_and_empty_lag_clears_the_report(redis):
+    consumer = FakeConsumer({"low": 50})
+    reporter = ConsumerLagReporter(redis, consumer, "validation", interval_seconds=5)
+
+    await reporter.run_once()
+    (key,) = await redis.keys(f"{LAG_KEY_PREFIX}*")
+    assert key.decode().startswith(f"{LAG_KEY_PREFIX}validation:")
+    assert 0 < await redis.ttl(key) <= 15
+
+    consumer.lag_by_lane = {}
+    await reporter.run_once()
+    assert await redis.keys(f"{LAG_KEY_PREFIX}*") == []
+
+
+async def test_gauge_reads_empty_without_reports(redis):
+    admission = controller(redis, backlog=10_000)
+
+    await admission.refresh()
+
+    assert admission.backlog == 0
+    admission.check("low")
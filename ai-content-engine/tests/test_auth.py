@@ -0,0 +1,189 @@
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from shared.middleware.auth import JWKSKeyStore, JWTAuthMiddleware
+from shared.utils import cache
+
+SECRET = "test-secret"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def rsa_private_pem() -> bytes:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+@pytest.fixture(scope="module")
+def signing_keys() -> dict[str, bytes]:
+    return {"old": rsa_private_pem(), "new": rsa_private_pem()}
+
+
+def public_jwk(pem: bytes, kid: str) -> dict:
+    return {**jwk.construct(pem, "RS256").public_key().to_dict(), "kid": kid, "alg": "RS256"}
+
+
+def write_jwks(path, keys: list[dict]) -> str:
+    path.write_text(json.dumps({"keys": keys}))
+    return str(path)
+
+
+def bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def count_verifications(auth: JWTAuthMiddleware) -> list[str]:
+    calls: list[str] = []
+    verify = auth._verify
+
+    def counting(token: str) -> dict:
+        calls.append(token)
+        return verify(token)
+
+    auth._verify = counting
+    return calls
+
+
+async def test_verified_claims_are_cached():
+    auth = JWTAuthMiddleware(SECRET)
+    calls = count_verifications(auth)
+    token = jwt.encode({"sub": "user-1"}, SECRET)
+
+    assert (await auth(bearer(token)))["sub"] == "user-1"
+    assert (await auth(bearer(token)))["sub"] == "user-1"
+    assert len(calls) == 1
+
+
+async def test_cache_entry_lives_at_most_cache_ttl(clock):
+    auth = JWTAuthMiddleware(SECRET, cache_ttl_seconds=60)
+    calls = count_verifications(auth)
+    token = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 3600}, SECRET)
+
+    await auth(bearer(token))
+    clock.now += 59
+    await auth(bearer(token))
+    assert len(calls) == 1
+
+    clock.now += 2
+    await auth(bearer(token))
+    assert len(calls) == 2
+
+
+async def test_cache_entry_never_outlives_token_expiry(clock):
+    auth = JWTAuthMiddleware(SECRET, cache_ttl_seconds=300)
+    calls = count_verifications(auth)
+    token = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 30}, SECRET)
+
+    await auth(bearer(token))
+    clock.now += 31
+    await auth(bearer(token))
+    assert len(calls) == 2
+
+
+async def test_rejections_are_not_cached():
+    auth = JWTAuthMiddleware(SECRET)
+    calls = count_verifications(auth)
+    forged = jwt.encode({"sub": "user-1"}, "another-secret")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as e:
+            await auth(bearer(forged))
+        assert e.value.status_code == 401
+    assert len(calls) == 2
+
+
+async def test_expired_tokens_are_rejected():
+    auth = JWTAuthMiddleware(SECRET)
+    token = jwt.encode({"sub": "user-1", "exp": int(time.time()) - 10}, SECRET)
+    with pytest.raises(HTTPException):
+        await auth(bearer(token))
+
+
+async def test_missing_token_is_rejected():
+    with pytest.raises(HTTPException) as e:
+        await JWTAuthMiddleware(SECRET)(None)
+    assert e.value.status_code == 401
+
+
+async def test_jwks_rotation_accepts_old_and_new_keys_during_overlap(tmp_path, signing_keys):
+    path = write_jwks(
+        tmp_path / "jwks.json",
+        [public_jwk(signing_keys["old"], "old"), public_jwk(signing_keys["new"], "new")],
+    )
+    auth = JWTAuthMiddleware(SECRET, jwks=JWKSKeyStore(path))
+
+    for kid in ("old", "new"):
+        token = jwt.encode(
+            {"sub": kid}, signing_keys[kid], algorithm="RS256", headers={"kid": kid}
+        )
+        assert (await auth(bearer(token)))["sub"] == kid
+
+
+async def test_jwks_rotation_rejects_retired_keys(tmp_path, signing_keys):
+    path = write_jwks(tmp_path / "jwks.json", [public_jwk(signing_keys["new"], "new")])
+    auth = JWTAuthMiddleware(SECRET, jwks=JWKSKeyStore(path))
+    token = jwt.encode({"sub": "u"}, signing_keys["old"], algorithm="RS256", headers={"kid": "old"})
+
+    with pytest.raises(HTTPException):
+        await auth(bearer(token))
+
+
+async def test_jwks_token_must_match_its_key(tmp_path, signing_keys):
+    path = write_jwks(tmp_path / "jwks.json", [public_jwk(signing_keys["new"], "new")])
+    auth = JWTAuthMiddleware(SECRET, jwks=JWKSKeyStore(path))
+    wrong_key = jwt.encode(
+        {"sub": "u"}, signing_keys["old"], algorithm="RS256", headers={"kid": "new"}
+    )
+    # An HMAC token naming an RSA key must not be checked against the shared secret
+    wrong_algorithm = jwt.encode({"sub": "u"}, SECRET, algorithm="HS256", headers={"kid": "new"})
+
+    for token in (wrong_key, wrong_algorithm):
+        with pytest.raises(HTTPException):
+            await auth(bearer(token))
+
+
+async def test_kid_tokens_are_rejected_without_a_key_store():
+    auth = JWTAuthMiddleware(SECRET)
+    token = jwt.encode({"sub": "u"}, SECRET, headers={"kid": "k1"})
+    with pytest.raises(HTTPException):
+        await auth(bearer(token))
+
+
+def test_jwks_entries_without_kid_or_alg_are_skipped(tmp_path, signing_keys):
+    entry = public_jwk(signing_keys["new"], "new")
+    path = write_jwks(
+        tmp_path / "jwks.json",
+        [
+            entry,
+            {**entry, "kid": None},
+            {k: v for k, v in entry.items() if k != "alg"} | {"kid": "no-alg"},
+        ],
+    )
+    store = JWKSKeyStore(path)
+
+    assert store.get("new") is not None
+    assert store.get("no-alg") is None
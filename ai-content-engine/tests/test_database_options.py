@@ -0,0 +1,83 @@
+import pytest
+
+from shared import database
+from shared.config import BaseServiceSettings
+
+ASYNCPG_URL = "postgresql+asyncpg://app@localhost/app"
+
+
+def settings(**values) -> BaseServiceSettings:
+    return BaseServiceSettings(_env_file=None, database_url=ASYNCPG_URL, **values)
+
+
+@pytest.fixture
+def engine_kwargs(monkeypatch) -> list[dict]:
+    """Arguments of every ``create_async_engine`` call made by shared.database."""
+    calls: list[dict] = []
+    create_async_engine = database.create_async_engine
+
+    def capture(url, **kwargs):
+        calls.append(kwargs)
+        return create_async_engine(url, **kwargs)
+
+    monkeypatch.setattr(database, "create_async_engine", capture)
+    return calls
+
+
+def test_default_options_use_the_regular_pool():
+    options = settings(database_pool_size=15, database_max_overflow=4).database_engine_options()
+
+    assert options == {
+        "pool_size": 15,
+        "max_overflow": 4,
+        "pool_timeout": 30.0,
+        "pool_recycle": 300,
+        "pool_pre_ping": False,
+        "statement_cache_size": 100,
+        "pgbouncer": False,
+    }
+
+
+def test_pgbouncer_options_use_the_small_pool():
+    options = settings(
+        database_pgbouncer=True, database_pool_size=15, database_pgbouncer_pool_size=3
+    ).database_engine_options()
+
+    assert (options["pool_size"], options["max_overflow"]) == (3, 0)
+    assert options["pgbouncer"] is True
+
+
+def test_pgbouncer_mode_is_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DATABASE_PGBOUNCER", "true")
+    monkeypatch.setenv("DATABASE_PGBOUNCER_MAX_OVERFLOW", "2")
+
+    options = settings().database_engine_options()
+
+    assert (options["pool_size"], options["max_overflow"], options["pgbouncer"]) == (5, 2, True)
+
+
+async def test_pgbouncer_engine_disables_statement_caching(engine_kwargs):
+    options = settings(database_pgbouncer=True).database_engine_options()
+
+    engine = database.create_engine(ASYNCPG_URL, **options, name="test-pgbouncer")
+    await engine.dispose()
+
+    (kwargs,) = engine_kwargs
+    assert (kwargs["pool_size"], kwargs["max_overflow"]) == (5, 0)
+    connect_args = kwargs["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name = connect_args["prepared_statement_name_func"]
+    assert name() != name()
+    assert engine.pool.size() == 5
+
+
+async def test_direct_engine_sizes_the_statement_cache(engine_kwargs):
+    options = settings(database_statement_cache_size=250).database_engine_options()
+
+    engine = database.create_engine(ASYNCPG_URL, **options, name="test-direct")
+    await engine.dispose()
+
+    (kwargs,) = engine_kwargs
+    assert kwargs["connect_args"] == {"prepared_statement_cache_size": 250}
+    assert engine.pool.size() == 20
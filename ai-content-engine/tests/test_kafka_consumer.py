@@ -0,0 +1,227 @@
+from typing import NamedTuple
+
+from aiokafka import TopicPartition
+
+from shared.kafka.consumer import AsyncKafkaConsumer, _OffsetTracker
+
+TOPIC = "results"
+TP = TopicPartition(TOPIC, 0)
+
+
+class Record(NamedTuple):
+    topic: str
+    partition: int
+    offset: int
+    value: dict
+    headers: tuple = ()
+
+
+class FakeKafka:
+    """Serves one partition's records from a position that ``seek`` can rewind.
+
+    Stops ``owner`` once the log is drained or after ``max_fetches`` fetches.
+    """
+
+    def __init__(self, owner: AsyncKafkaConsumer, values: list[dict], max_fetches: int = 20):
+        self._owner = owner
+        self._log = [Record(TOPIC, 0, offset, value) for offset, value in enumerate(values)]
+        self._position = 0
+        self._fetches = 0
+        self._max_fetches = max_fetches
+        self.commits: list[dict[TopicPartition, int]] = []
+        self.seeks: list[int] = []
+
+    async def getmany(self, timeout_ms: int = 0, max_records: int | None = None):
+        self._fetches += 1
+        if self._position >= len(self._log) or self._fetches > self._max_fetches:
+            self._owner._running = False
+            return {}
+        records = self._log[self._position : self._position + (max_records or len(self._log))]
+        self._position += len(records)
+        return {TP: records}
+
+    def seek(self, tp: TopicPartition, offset: int) -> None:
+        self.seeks.append(offset)
+        self._position = offset
+
+    async def commit(self, offsets: dict[TopicPartition, int] | None = None) -> None:
+        self.commits.append(offsets or {TP: self._position})
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Record:
+        self._fetches += 1
+        if self._position >= len(self._log) or self._fetches > self._max_fetches:
+            self._owner._running = False
+            raise StopAsyncIteration
+        record = self._log[self._position]
+        self._position += 1
+        return record
+
+
+def fake_consumer(values, **kwargs) -> tuple[AsyncKafkaConsumer, FakeKafka]:
+    consumer = AsyncKafkaConsumer(
+        TOPIC, "kafka:9092", "test", max_batch_wait_ms=0, retry_backoff_ms=0, **kwargs
+    )
+    fake = FakeKafka(consumer, values)
+    consumer._consumer = fake
+    consumer._running = True
+    return consumer, fake
+
+
+def batch_consumer(handler, values, **kwargs) -> tuple[AsyncKafkaConsumer, FakeKafka]:
+    return fake_consumer(values, batch_handler=handler, **kwargs)
+
+
+async def test_batches_commit_past_their_last_record():
+    handled = []
+
+    async def handler(values):
+        handled.append([v["id"] for v in values])
+
+    consumer, fake = batch_consumer(handler, [{"id": i} for i in range(5)], max_batch_size=3)
+    await consumer._run_batches()
+
+    assert handled == [[0, 1, 2], [3, 4]]
+    assert fake.commits == [{TP: 3}, {TP: 5}]
+    assert fake.seeks == []
+
+
+async def test_poison_message_is_skipped_after_batch_retries():
+    handled = []
+
+    async def handler(values):
+        if any(v.get("poison") for v in values):
+            raise ValueError("bad event")
+        handled.extend(v["id"] for v in values)
+
+    values = [{"id": 0}, {"id": 1, "poison": True}, {"id": 2}]
+    consumer, fake = batch_consumer(handler, values, max_batch_retries=3)
+    await consumer._run_batches()
+
+    # Two rewinds for the whole batch, then one message at a time
+    assert fake.seeks == [0, 0]
+    assert handled == [0, 2]
+    assert fake.commits == [{TP: 3}]
+
+
+async def test_systemic_failure_never_skips_the_batch():
+    async def handler(values):
+        raise ConnectionError("database is down")
+
+    consumer, fake = batch_consumer(handler, [{"id": 0}, {"id": 1}], max_batch_retries=2)
+    await consumer._run_batches()
+
+    assert fake.commits == []
+    assert fake.seeks and set(fake.seeks) == {0}
+
+
+async def test_transient_failure_retries_the_whole_batch():
+    calls = []
+
+    async def handler(values):
+        calls.append(len(values))
+        if len(calls) == 1:
+            raise ConnectionError("blip")
+
+    consumer, fake = batch_consumer(handler, [{"id": 0}, {"id": 1}], max_batch_retries=3)
+    await consumer._run_batches()
+
+    assert calls == [2, 2]
+    assert fake.commits == [{TP: 2}]
+
+
+
+async def test_failed_message_is_redelivered_before_anything_is_committed_past_it():
+    handled = []
+
+    async def handler(value):
+        if value["id"] == 1 and "fail" not in handled:
+            handled.append("fail")
+            raise ConnectionError("blip")
+        handled.append(value["id"])
+
+    consumer, fake = fake_consumer([{"id": i} for i in range(3)], handler=handler)
+    await consumer._run_messages()
+
+    assert handled == [0, "fail", 1, 2]
+    assert fake.seeks == [1]
+    assert fake.commits == [{TP: 1}, {TP: 2}, {TP: 3}]
+
+
+async def test_message_failing_every_retry_is_skipped():
+    handled = []
+
+    async def handler(value):
+        if value.get("poison"):
+            raise ValueError("bad event")
+        handled.append(value["id"])
+
+    values = [{"id": 0, "poison": True}, {"id": 1}]
+    consumer, fake = fake_consumer(values, handler=handler, max_batch_retries=3)
+    await consumer._run_messages()
+
+    assert fake.seeks == [0, 0]
+    assert handled == [1]
+    assert fake.commits == [{TP: 2}]
+
+def tracker_with(tp: TopicPartition, offsets) -> _OffsetTracker:
+    tracker = _OffsetTracker()
+    for offset in offsets:
+        tracker.start(tp, offset)
+    return tracker
+
+
+def test_offset_tracker_commits_in_order_completions():
+    tracker = tracker_with(TP, [10, 11])
+
+    tracker.finish(TP, 10)
+    assert tracker.take_commit(TP) == 11
+    assert tracker.take_commit(TP) is None
+    tracker.finish(TP, 11)
+    assert tracker.take_commit(TP) == 12
+
+
+def test_offset_tracker_holds_back_past_unfinished_messages():
+    tracker = tracker_with(TP, [10, 11, 12, 13])
+
+    tracker.finish(TP, 12)
+    tracker.finish(TP, 11)
+    assert tracker.take_commit(TP) is None
+
+    tracker.finish(TP, 10)
+    assert tracker.take_commit(TP) == 13
+
+    tracker.finish(TP, 13)
+    assert tracker.take_commit(TP) == 14
+
+
+def test_offset_tracker_partitions_are_independent():
+    other = TopicPartition(TOPIC, 1)
+    tracker = tracker_with(TP, [0, 1])
+    tracker.start(other, 5)
+
+    tracker.finish(other, 5)
+    tracker.finish(TP, 1)
+
+    assert tracker.take_commit(other) == 6
+    assert tracker.take_commit(TP) is None
+
+
+def test_offset_tracker_never_moves_backwards():
+    tracker = tracker_with(TP, [0, 1])
+    tracker.finish(TP, 0)
+    tracker.finish(TP, 1)
+    assert tracker.take_commit(TP) == 2
+
+    # Redelivered after a rebalance: already committed past it
+    tracker.start(TP, 1)
+    tracker.finish(TP, 1)
+    assert tracker.take_commit(TP) is None
+
+
+def test_offset_tracker_ignores_unknown_partitions():
+    tracker = _OffsetTracker()
+    tracker.finish(TP, 3)
+    assert tracker.take_commit(TP) is None
@@ -0,0 +1,79 @@
+from collections import Counter
+
+import pytest
+
+from shared.kafka.lanes import WeightedLaneScheduler, lane_topic, lane_topics
+
+NOW = 1000.0
+
+
+def picks(scheduler, heads, n):
+    return [scheduler.pick(heads, now=NOW) for _ in range(n)]
+
+
+def test_lane_topics():
+    assert lane_topics("prompts") == {
+        "high": "prompts.high",
+        "normal": "prompts",
+        "low": "prompts.low",
+    }
+    assert lane_topic("prompts", None) == "prompts"
+    assert lane_topic("prompts", "urgent") == "prompts"
+
+
+def test_serves_lanes_in_proportion_to_weight():
+    scheduler = WeightedLaneScheduler({"high": 8, "normal": 3, "low": 1})
+    heads = {"high": NOW, "normal": NOW, "low": NOW}
+
+    served = picks(scheduler, heads, 120)
+
+    assert Counter(served) == {"high": 80, "normal": 30, "low": 10}
+
+
+def test_interleaves_instead_of_bursting():
+    scheduler = WeightedLaneScheduler({"high": 2, "low": 1})
+    served = picks(scheduler, {"high": NOW, "low": NOW}, 6)
+
+    assert served == ["high", "low", "high", "high", "low", "high"]
+
+
+def test_starved_lane_is_served_first():
+    scheduler = WeightedLaneScheduler({"high": 100, "low": 1}, starvation_ms=5000)
+    heads = {"high": NOW, "low": NOW - 5.0}
+
+    assert scheduler.pick(heads, now=NOW) == "low"
+    assert scheduler.pick({"high": NOW, "low": NOW - 4.9}, now=NOW) == "high"
+
+
+def test_low_lane_progresses_under_sustained_high_load():
+    scheduler = WeightedLaneScheduler({"high": 1000, "low": 1}, starvation_ms=100)
+    low_enqueued = NOW
+    served_low_at = None
+    for step in range(1000):
+        now = NOW + step * 0.001
+        if scheduler.pick({"high": now, "low": low_enqueued}, now=now) == "low":
+            served_low_at = now
+            break
+
+    assert served_low_at is not None
+    assert served_low_at - low_enqueued == pytest.approx(0.1, abs=0.002)
+
+
+def test_idle_lanes_do_not_bank_credit():
+    scheduler = WeightedLaneScheduler({"high": 1, "low": 1})
+    assert picks(scheduler, {"high": NOW}, 10) == ["high"] * 10
+
+    served = picks(scheduler, {"high": NOW, "low": NOW}, 4)
+
+    assert Counter(served) == {"high": 2, "low": 2}
+
+
+def test_no_work_and_unknown_lanes():
+    scheduler = WeightedLaneScheduler({"high": 3})
+    assert scheduler.pick({}, now=NOW) is None
+    assert Counter(picks(scheduler, {"high": NOW, "extra": NOW}, 8)) == {"high": 6, "extra": 2}
+
+
+def test_weights_must_be_positive():
+    with pytest.raises(ValueError):
+        WeightedLaneScheduler({"high": 1, "low": 0})
@@ -0,0 +1,187 @@
+import asyncio
+import fnmatch
+import json
+import uuid
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from shared.notifications import (
+    COMPLETION_CHANNEL_PREFIX,
+    CompletionNotifier,
+    CompletionWaiter,
+    completion_channel,
+)
+
+
+class PubSub:
+    def __init__(self, broker: "Broker") -> None:
+        self.broker = broker
+        self.patterns: list[str] = []
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    async def psubscribe(self, pattern: str) -> None:
+        self.patterns.append(pattern)
+        self.broker.subscribed.set()
+
+    async def listen(self):
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self) -> None:
+        self.closed = True
+        self.broker.subscribers.remove(self)
+
+
+class Pipeline:
+    def __init__(self, broker: "Broker") -> None:
+        self.broker = broker
+        self.commands: list[tuple[str, str]] = []
+
+    def publish(self, channel: str, data: str) -> None:
+        self.commands.append((channel, data))
+
+    async def execute(self) -> None:
+        if self.broker.down:
+            raise RedisConnectionError("connection refused")
+        self.broker.executed += 1
+        for channel, data in self.commands:
+            self.broker.publish(channel, data)
+
+
+class Broker:
+    """The slice of the Redis pub/sub API the notifier and waiter use."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[PubSub] = []
+        self.subscribed = asyncio.Event()
+        self.down = False
+        self.executed = 0
+
+    def pubsub(self) -> PubSub:
+        pubsub = PubSub(self)
+        self.subscribers.append(pubsub)
+        return pubsub
+
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        return Pipeline(self)
+
+    def publish(self, channel: str, data: str) -> None:
+        for pubsub in self.subscribers:
+            for pattern in pubsub.patterns:
+                if fnmatch.fnmatchcase(channel, pattern):
+                    message = {"type": "pmessage", "pattern": pattern, "channel": channel}
+                    pubsub.queue.put_nowait({**message, "data": data.encode()})
+
+    async def drop_connections(self) -> None:
+        self.subscribed.clear()
+        for pubsub in list(self.subscribers):
+            pubsub.queue.put_nowait(RedisConnectionError("connection reset"))
+        await asyncio.wait_for(self.subscribed.wait(), timeout=1)
+
+
+@pytest.fixture
+def broker() -> Broker:
+    return Broker()
+
+
+@pytest.fixture
+async def waiter(broker):
+    waiter = CompletionWaiter(broker, reconnect_backoff_ms=1)
+    await waiter.start()
+    await asyncio.wait_for(broker.subscribed.wait(), timeout=1)
+    yield waiter
+    await waiter.stop()
+
+
+async def test_notification_resolves_every_waiter_of_the_request(broker, waiter):
+    request_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    with waiter.expect(request_id) as first, waiter.expect(request_id) as second:
+        with waiter.expect(other_id) as other:
+            await CompletionNotifier(broker).publish([(request_id, "completed")])
+
+            assert await CompletionWaiter.wait(first, timeout=1) == "completed"
+            assert await CompletionWaiter.wait(second, timeout=1) == "completed"
+            assert not other.done()
+
+
+async def test_wait_times_out_without_cancelling_the_future(broker, waiter):
+    request_id = uuid.uuid4()
+
+    with waiter.expect(request_id) as future:
+        assert await CompletionWaiter.wait(future, timeout=0.01) is None
+        assert not future.cancelled()
+
+        await CompletionNotifier(broker).publish([(request_id, "failed")])
+        assert await CompletionWaiter.wait(future, timeout=1) == "failed"
+
+
+async def test_completions_after_expect_exits_are_ignored(broker, waiter):
+    request_id = uuid.uuid4()
+    with waiter.expect(request_id) as future:
+        pass
+
+    await CompletionNotifier(broker).publish([(request_id, "completed")])
+    await asyncio.sleep(0.01)
+
+    assert not future.done()
+
+
+async def test_invalid_messages_are_skipped(broker, waiter):
+    request_id = uuid.uuid4()
+
+    with waiter.expect(request_id) as future:
+        broker.publish(completion_channel(request_id), "not json")
+        broker.publish(completion_channel(request_id), json.dumps({"request_id": "nope"}))
+        broker.publish(completion_channel(request_id), json.dumps({"status": "completed"}))
+        await CompletionNotifier(broker).publish([(request_id, "completed")])
+
+        assert await CompletionWaiter.wait(future, timeout=1) == "completed"
+
+
+async def test_waiter_resubscribes_after_the_connection_drops(broker, waiter):
+    request_id = uuid.uuid4()
+
+    await broker.drop_connections()
+
+    assert len(broker.subscribers) == 1
+    assert broker.subscribers[0].patterns == [f"{COMPLETION_CHANNEL_PREFIX}*"]
+    with waiter.expect(request_id) as future:
+        await CompletionNotifier(broker).publish([(request_id, "completed")])
+        assert await CompletionWaiter.wait(future, timeout=1) == "completed"
+
+
+async def test_stop_cancels_pending_waiters(broker):
+    waiter = CompletionWaiter(broker)
+    await waiter.start()
+
+    with waiter.expect(uuid.uuid4()) as future:
+        await waiter.stop()
+        assert future.cancelled()
+    assert broker.subscribers == []
+
+
+async def test_publish_pipelines_every_completion_in_one_round_trip(broker):
+    subscriber = broker.pubsub()
+    await subscriber.psubscribe(f"{COMPLETION_CHANNEL_PREFIX}*")
+    ids = [uuid.uuid4() for _ in range(3)]
+
+    await CompletionNotifier(broker).publish([(request_id, "completed") for request_id in ids])
+
+    assert broker.executed == 1
+    received = [json.loads(subscriber.queue.get_nowait()["data"]) for _ in ids]
+    assert received == [{"request_id": str(i), "status": "completed"} for i in ids]
+
+
+async def test_publish_is_best_effort(broker):
+    broker.down = True
+
+    await CompletionNotifier(broker).publish([(uuid.uuid4(), "completed")])
+    await CompletionNotifier(broker).publish([])
+
+    assert broker.executed == 0
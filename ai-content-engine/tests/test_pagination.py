@@ -0,0 +1,74 @@
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from shared.exceptions import ValidationError
+from shared.utils.pagination import decode_cursor, encode_cursor, next_page
+
+CREATED = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def rows(count: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(created_at=CREATED - timedelta(seconds=i), id=uuid.uuid4())
+        for i in range(count)
+    ]
+
+
+def test_cursor_round_trips_the_sort_key():
+    row_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(CREATED, row_id)) == (CREATED, row_id)
+
+
+def test_cursor_keeps_the_timezone_offset():
+    local = CREATED.astimezone(timezone(timedelta(hours=-5)))
+
+    created_at, _ = decode_cursor(encode_cursor(local, uuid.uuid4()))
+
+    assert created_at.utcoffset() == timedelta(hours=-5)
+    assert created_at == CREATED
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor(CREATED, uuid.uuid4())
+
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(b'["2026-03-01T00:00:00"]').decode(),
+        base64.urlsafe_b64encode(b'["yesterday", "7b0c"]').decode(),
+        base64.urlsafe_b64encode(b'["2026-03-01T00:00:00", "not-a-uuid"]').decode(),
+        base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    ],
+)
+def test_malformed_cursor_is_a_validation_error(cursor):
+    with pytest.raises(ValidationError) as excinfo:
+        decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 422
+    assert excinfo.value.details[0]["field"] == "cursor"
+
+
+def test_next_page_without_an_extra_row_has_no_cursor():
+    page = rows(3)
+
+    assert next_page(page, 3) == (page, None)
+
+
+def test_next_page_trims_the_extra_row_and_points_at_the_last_kept_row():
+    fetched = rows(4)
+
+    page, cursor = next_page(fetched, 3)
+
+    assert page == fetched[:3]
+    assert decode_cursor(cursor) == (fetched[2].created_at, fetched[2].id)
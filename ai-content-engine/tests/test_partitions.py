@@ -0,0 +1,56 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from shared.partitions import (
+    add_months,
+    create_partition_sql,
+    default_partition_name,
+    month_start,
+    months_between,
+    partition_name,
+)
+
+
+def test_month_start_truncates_dates_and_datetimes():
+    assert month_start(date(2026, 2, 28)) == date(2026, 2, 1)
+    assert month_start(datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc)) == date(2026, 12, 1)
+
+
+@pytest.mark.parametrize(
+    ("month", "count", "expected"),
+    [
+        (date(2026, 1, 1), 1, date(2026, 2, 1)),
+        (date(2026, 11, 1), 2, date(2027, 1, 1)),
+        (date(2026, 1, 1), -1, date(2025, 12, 1)),
+        (date(2026, 3, 1), -27, date(2023, 12, 1)),
+        (date(2026, 3, 1), 0, date(2026, 3, 1)),
+    ],
+)
+def test_add_months_wraps_years(month, count, expected):
+    assert add_months(month, count) == expected
+
+
+def test_months_between_is_inclusive():
+    assert months_between(date(2026, 11, 20), date(2027, 2, 1)) == [
+        date(2026, 11, 1),
+        date(2026, 12, 1),
+        date(2027, 1, 1),
+        date(2027, 2, 1),
+    ]
+    assert months_between(date(2026, 5, 1), date(2026, 4, 1)) == []
+
+
+def test_partition_names():
+    assert partition_name("generation_requests", date(2026, 3, 1)) == "generation_requests_p2026_03"
+    assert default_partition_name("generation_results") == "generation_results_default"
+
+
+def test_create_partition_sql_covers_one_utc_month():
+    sql = create_partition_sql("generation_results", date(2026, 12, 15))
+
+    assert sql == (
+        'CREATE TABLE IF NOT EXISTS "generation_results_p2026_12" '
+        'PARTITION OF "generation_results" '
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
@@ -0,0 +1,152 @@
+import uuid
+
+import fakeredis
+import pytest
+
+from shared import quotas
+from shared.exceptions import RateLimitError
+from shared.quotas import QuotaEnforcer, QuotaLimit, UsageMeter, quota_key
+
+ORG = uuid.uuid4()
+# Minute windows are 12 buckets of 5 seconds; t=1000 is the start of bucket 200
+START = 1000.0
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = START
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(quotas, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis(server):
+    return fakeredis.FakeAsyncRedis(server=server)
+
+
+async def window_total(redis, quota_type: str, period: str, org=ORG) -> int:
+    buckets = await redis.hgetall(quota_key(org, quota_type, period))
+    return sum(int(count) for count in buckets.values())
+
+
+async def test_requests_are_admitted_up_to_the_limit(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "minute", 3)]
+
+    for _ in range(3):
+        await enforcer.admit(ORG, limits)
+    with pytest.raises(RateLimitError) as excinfo:
+        await enforcer.admit(ORG, limits)
+
+    assert excinfo.value.retry_after == 60
+    assert await window_total(redis, "requests", "minute") == 3
+
+
+async def test_window_slides_one_bucket_at_a_time(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "minute", 2)]
+    await enforcer.admit(ORG, limits)
+    clock.now += 20
+    await enforcer.admit(ORG, limits)
+
+    clock.now += 30
+    with pytest.raises(RateLimitError) as excinfo:
+        await enforcer.admit(ORG, limits)
+    # The oldest bucket leaves the window 60s after it started
+    assert excinfo.value.retry_after == 10
+
+    clock.now += 10
+    await enforcer.admit(ORG, limits)
+    with pytest.raises(RateLimitError):
+        await enforcer.admit(ORG, limits)
+
+
+async def test_rejection_consumes_nothing_from_any_window(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "minute", 10), QuotaLimit("requests", "hourly", 2)]
+
+    await enforcer.admit(ORG, limits)
+    await enforcer.admit(ORG, limits)
+    with pytest.raises(RateLimitError, match="hourly requests quota of 2"):
+        await enforcer.admit(ORG, limits)
+
+    assert await window_total(redis, "requests", "minute") == 2
+    assert await window_total(redis, "requests", "hourly") == 2
+
+
+async def test_batch_over_the_limit_is_rejected_whole(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "minute", 5)]
+
+    await enforcer.admit(ORG, limits, requests=3)
+    with pytest.raises(RateLimitError):
+        await enforcer.admit(ORG, limits, requests=3)
+    await enforcer.admit(ORG, limits, requests=2)
+
+    assert await window_total(redis, "requests", "minute") == 5
+
+
+async def test_token_quotas_are_checked_but_only_metered_usage_consumes_them(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("tokens", "daily", 100)]
+    meter = UsageMeter(redis)
+
+    await enforcer.admit(ORG, limits)
+    await meter.record(ORG, uuid.uuid4(), tokens_used=60, cost_usd=0.01)
+    await enforcer.admit(ORG, limits)
+    assert await window_total(redis, "tokens", "daily") == 60
+
+    await meter.record(ORG, uuid.uuid4(), tokens_used=40, cost_usd=0.01)
+    with pytest.raises(RateLimitError, match="daily tokens quota"):
+        await enforcer.admit(ORG, limits)
+
+
+async def test_usage_is_queued_for_rollup(redis, clock):
+    request_id = uuid.uuid4()
+
+    await UsageMeter(redis).record(ORG, request_id, tokens_used=42, cost_usd=0.5)
+
+    assert await redis.lrange(quotas.USAGE_QUEUE_KEY, 0, -1) == [
+        f'{{"request_id": "{request_id}", "tokens_used": 42, "cost_usd": 0.5}}'.encode()
+    ]
+    for period in quotas.PERIODS:
+        assert await window_total(redis, "tokens", period) == 42
+
+
+async def test_organizations_have_separate_windows(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "minute", 1)]
+
+    await enforcer.admit(ORG, limits)
+    await enforcer.admit(uuid.uuid4(), limits)
+    with pytest.raises(RateLimitError):
+        await enforcer.admit(ORG, limits)
+
+
+async def test_unknown_periods_and_quota_types_are_ignored(redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    limits = [QuotaLimit("requests", "fortnightly", 0), QuotaLimit("seats", "minute", 0)]
+
+    await enforcer.admit(ORG, limits)
+
+    assert await redis.keys("*") == []
+
+
+async def test_redis_failure_admits_the_request(server, redis, clock):
+    enforcer = QuotaEnforcer(redis)
+    server.connected = False
+
+    await enforcer.admit(ORG, [QuotaLimit("requests", "minute", 0)])
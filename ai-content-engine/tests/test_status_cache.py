@@ -0,0 +1,152 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from shared.status_cache import StatusCache, status_key
+from shared.utils import cache
+
+UPDATED = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+ORG = uuid.uuid4()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class Pipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple] = []
+
+    def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> None:
+        self.commands.append((key, value, ex, nx))
+
+    async def execute(self) -> None:
+        if self.redis.down:
+            raise RedisConnectionError("connection refused")
+        for key, value, ex, nx in self.commands:
+            if nx and key in self.redis.values:
+                continue
+            self.redis.values[key] = value
+            self.redis.expiries[key] = ex
+
+
+class FakeRedis:
+    """The slice of the Redis API StatusCache uses, backed by a dict."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.expiries: dict[str, int | None] = {}
+        self.down = False
+        self.reads = 0
+
+    async def get(self, key: str) -> str | None:
+        if self.down:
+            raise RedisConnectionError("connection refused")
+        self.reads += 1
+        return self.values.get(key)
+
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        return Pipeline(self)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+def status_cache(redis: FakeRedis, **kwargs) -> StatusCache:
+    return StatusCache(redis, ttl_seconds=3600, pending_ttl_seconds=5, **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("status", "ttl"),
+    [("completed", 3600), ("failed", 3600), ("cancelled", 3600), ("pending", 5), ("processing", 5)],
+)
+async def test_final_statuses_live_long_and_in_flight_ones_briefly(redis, status, ttl):
+    request_id = uuid.uuid4()
+
+    await status_cache(redis).set_many([(request_id, status, ORG)], updated_at=UPDATED)
+    await status_cache(redis).fill(uuid.uuid4(), status, UPDATED, ORG)
+
+    assert sorted(redis.expiries.values()) == [ttl, ttl]
+    assert json.loads(redis.values[status_key(request_id)]) == {
+        "status": status,
+        "updated_at": UPDATED.isoformat(),
+        "organization_id": str(ORG),
+    }
+
+
+async def test_fill_never_overwrites_a_cached_transition(redis):
+    request_id = uuid.uuid4()
+    statuses = status_cache(redis, local_ttl_seconds=0)
+
+    await statuses.set_many([(request_id, "completed", ORG)], updated_at=UPDATED)
+    await statuses.fill(request_id, "processing", UPDATED, ORG)
+
+    assert (await statuses.get(request_id))["status"] == "completed"
+    assert redis.expiries[status_key(request_id)] == 3600
+
+
+async def test_set_many_overwrites_and_records_missing_organizations(redis):
+    request_id = uuid.uuid4()
+    statuses = status_cache(redis, local_ttl_seconds=0)
+
+    await statuses.fill(request_id, "processing", UPDATED, ORG)
+    await statuses.set_many([(request_id, "failed", None)], updated_at=UPDATED)
+
+    assert await statuses.get(request_id) == {
+        "status": "failed",
+        "updated_at": UPDATED.isoformat(),
+        "organization_id": None,
+    }
+
+
+async def test_local_layer_serves_reads_until_its_ttl(redis, clock):
+    request_id = uuid.uuid4()
+    writer = status_cache(redis, local_ttl_seconds=0)
+    reader = status_cache(redis, local_ttl_seconds=1.0)
+    await writer.set_many([(request_id, "processing", ORG)], updated_at=UPDATED)
+
+    assert (await reader.get(request_id))["status"] == "processing"
+    await writer.set_many([(request_id, "completed", ORG)], updated_at=UPDATED)
+    assert (await reader.get(request_id))["status"] == "processing"
+    assert redis.reads == 1
+
+    clock.now += 1.0
+    assert (await reader.get(request_id))["status"] == "completed"
+
+
+async def test_writes_update_the_local_layer_and_fills_invalidate_it(redis, clock):
+    request_id = uuid.uuid4()
+    statuses = status_cache(redis, local_ttl_seconds=60)
+
+    await statuses.set_many([(request_id, "processing", ORG)], updated_at=UPDATED)
+    assert (await statuses.get(request_id))["status"] == "processing"
+    assert redis.reads == 0
+
+    await statuses.fill(request_id, "processing", UPDATED, ORG)
+    await statuses.get(request_id)
+    assert redis.reads == 1
+
+
+async def test_redis_failures_are_misses(redis):
+    statuses = status_cache(redis, local_ttl_seconds=0)
+    redis.down = True
+
+    await statuses.set_many([(uuid.uuid4(), "completed", ORG)])
+    assert await statuses.get(uuid.uuid4()) is None
@@ -0,0 +1,131 @@
+import pytest
+
+from shared.events import timing
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """Epoch milliseconds returned by successive ``now_ms`` calls."""
+    times: list[float] = []
+    monkeypatch.setattr(timing, "now_ms", lambda: times.pop(0))
+    return times
+
+
+def pipeline_marks() -> dict[str, float]:
+    """Marks of one pass through every stage, 10ms apart."""
+    marks = [
+        timing.ACCEPTED,
+        timing.PROMPT_RECEIVED,
+        timing.PROMPT_PUBLISHED,
+        timing.MODEL_RECEIVED,
+        timing.INFERENCE_STARTED,
+        timing.INFERENCE_FINISHED,
+        timing.MODEL_PUBLISHED,
+        timing.VALIDATION_RECEIVED,
+        timing.VALIDATION_PUBLISHED,
+        timing.PERSISTENCE_RECEIVED,
+        timing.PERSISTENCE_STORED,
+    ]
+    return {mark: 1_000.0 + 10 * i for i, mark in enumerate(marks)}
+
+
+def test_stage_latencies_of_a_single_pass():
+    latencies = timing.stage_latencies(pipeline_marks())
+
+    assert "repair" not in latencies
+    assert latencies.pop("total") == 100.0
+    assert latencies == {
+        stage: 10.0
+        for stage in (
+            "queue_prompt",
+            "prompt_render",
+            "queue_model",
+            "scheduling",
+            "inference",
+            "queue_validation",
+            "validation",
+            "queue_persistence",
+            "persistence",
+        )
+    }
+
+
+def test_stages_with_a_missing_mark_are_omitted():
+    marks = pipeline_marks()
+    del marks[timing.INFERENCE_STARTED]
+
+    latencies = timing.stage_latencies(marks)
+
+    assert "scheduling" not in latencies
+    assert "inference" not in latencies
+    assert latencies["total"] == 100.0
+
+
+def test_clock_skew_never_yields_negative_durations():
+    marks = {timing.ACCEPTED: 1_000.0, timing.PROMPT_RECEIVED: 990.5}
+
+    assert timing.stage_latencies(marks) == {"queue_prompt": 0.0}
+
+
+def test_repair_requested_clears_the_repeated_stages(clock):
+    marks = pipeline_marks()
+    del marks[timing.PERSISTENCE_RECEIVED], marks[timing.PERSISTENCE_STORED]
+    clock.append(1_200.0)
+
+    repaired = timing.repair_requested({"timings": marks})
+
+    assert repaired == {
+        timing.ACCEPTED: 1_000.0,
+        timing.PROMPT_RECEIVED: 1_010.0,
+        timing.PROMPT_PUBLISHED: 1_020.0,
+        timing.REPAIR_REQUESTED: 1_200.0,
+    }
+    assert timing.MODEL_RECEIVED in marks
+
+
+def test_latencies_after_a_repair_describe_the_last_pass(clock):
+    # First pass: published at 1020 and rejected for repair at 1200
+    clock.append(1_200.0)
+    marks = timing.repair_requested({"timings": pipeline_marks()})
+    # Second pass through the model and validation
+    for mark, at in [
+        (timing.MODEL_RECEIVED, 1_250.0),
+        (timing.INFERENCE_STARTED, 1_260.0),
+        (timing.INFERENCE_FINISHED, 1_400.0),
+        (timing.MODEL_PUBLISHED, 1_410.0),
+        (timing.VALIDATION_RECEIVED, 1_420.0),
+        (timing.VALIDATION_PUBLISHED, 1_430.0),
+        (timing.PERSISTENCE_RECEIVED, 1_440.0),
+        (timing.PERSISTENCE_STORED, 1_450.0),
+    ]:
+        marks[mark] = at
+
+    latencies = timing.stage_latencies(marks)
+
+    assert latencies["repair"] == 180.0
+    # Measured from the repair request rather than the original publish
+    assert latencies["queue_model"] == 50.0
+    assert latencies["inference"] == 140.0
+    assert latencies["total"] == 450.0
+
+
+def test_received_copies_marks_without_mutating_the_message(clock):
+    msg = {"timings": {timing.ACCEPTED: 1_000.0}}
+    clock.append(1_010.5)
+
+    marks = timing.received(msg, timing.PROMPT_RECEIVED)
+
+    assert marks == {timing.ACCEPTED: 1_000.0, timing.PROMPT_RECEIVED: 1_010.5}
+    assert msg == {"timings": {timing.ACCEPTED: 1_000.0}}
+    clock.append(2_000.0)
+    assert timing.received({"timings": None}, timing.MODEL_RECEIVED) == {
+        timing.MODEL_RECEIVED: 2_000.0
+    }
+
+
+def test_stamp_sets_every_mark_to_the_same_time(clock):
+    clock.append(3_000.0)
+
+    marks = timing.stamp({}, timing.MODEL_PUBLISHED, timing.INFERENCE_FINISHED)
+
+    assert marks == {timing.MODEL_PUBLISHED: 3_000.0, timing.INFERENCE_FINISHED: 3_000.0}
@@ -0,0 +1,84 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from shared.database import STICKY_KEY_PREFIX, WriteStickiness
+from shared.utils import cache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class SharedRedis:
+    """The slice of the Redis API WriteStickiness uses, backed by a dict."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def set(self, key: str, value: object, ex: int | None = None) -> None:
+        self.values[key] = value
+        self.expiries[key] = ex
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+
+class DownRedis:
+    async def set(self, *args, **kwargs) -> None:
+        raise RedisConnectionError("connection refused")
+
+    async def exists(self, *args) -> int:
+        raise RedisConnectionError("connection refused")
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+async def test_writer_is_sticky_for_the_window(clock):
+    stickiness = WriteStickiness(window_seconds=5)
+
+    assert not await stickiness.is_sticky("user-1")
+    await stickiness.mark("user-1")
+    assert await stickiness.is_sticky("user-1")
+    assert not await stickiness.is_sticky("user-2")
+
+    clock.now += 5
+    assert not await stickiness.is_sticky("user-1")
+
+
+async def test_stickiness_is_shared_between_instances():
+    redis = SharedRedis()
+    writer = WriteStickiness(window_seconds=0.5, redis=redis)
+    reader = WriteStickiness(window_seconds=0.5, redis=redis)
+
+    await writer.mark("user-1")
+
+    assert await reader.is_sticky("user-1")
+    assert not await reader.is_sticky("user-2")
+    # Redis expiries are whole seconds and never zero
+    assert redis.expiries == {f"{STICKY_KEY_PREFIX}user-1": 1}
+
+
+async def test_redis_failure_fails_closed():
+    stickiness = WriteStickiness(window_seconds=5, redis=DownRedis())
+
+    # Unknown writers read from the primary rather than a possibly stale replica
+    assert await stickiness.is_sticky("user-1")
+
+
+async def test_mark_survives_redis_failure_and_stays_sticky_locally(clock):
+    stickiness = WriteStickiness(window_seconds=5, redis=DownRedis())
+
+    await stickiness.mark("user-1")
+
+    assert stickiness._local.get("user-1")
+    assert await stickiness.is_sticky("user-1")